@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark the audio front end without a microphone.
+
+Feeds synthetic speech-like fixtures at 8k/16k/44.1k/48k (plus any recorded
+WAV files given with --wav) through each preprocessing stage and through
+the full AudioCapture pipeline, and reports per-stage latency, real-time
+factor and peak memory.
+
+    python -m benchmarks.audio_frontend
+    python -m benchmarks.audio_frontend --wav recordings/forward.wav --save-baseline benchmarks/audio_frontend.json
+    python -m benchmarks.audio_frontend --baseline benchmarks/audio_frontend.json
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks.common import measure, load_baseline, save_baseline, compare, print_table
+from lib.audio_capture import AudioCapture, SAMPLE_RATE, BLOCK_MS
+from lib.resampler import StreamingResampler
+from lib.vad import VoiceActivityDetector
+
+SYNTHETIC_RATES = [8000, 16000, 44100, 48000]
+SYNTHETIC_SECONDS = 10.0
+
+
+def synthetic_speech(sample_rate: int, seconds: float = SYNTHETIC_SECONDS) -> np.ndarray:
+    """Harmonic bursts with syllable-like amplitude modulation over low background noise."""
+    rng = np.random.default_rng(sample_rate)
+    n = int(sample_rate * seconds)
+    t = np.arange(n) / sample_rate
+    voice = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    syllables = np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+    # Speech between 1-3s and 4-7s, silence elsewhere
+    active = ((t >= 1) & (t < 3)) | ((t >= 4) & (t < 7))
+    audio = 0.05 * voice * syllables * active + 0.001 * rng.standard_normal(n)
+    return audio.astype(np.float32)
+
+
+def load_fixtures(wav_paths: list[str]) -> dict[str, tuple[np.ndarray, int]]:
+    fixtures = {f"synthetic@{rate}": (synthetic_speech(rate), rate) for rate in SYNTHETIC_RATES}
+    for path in wav_paths:
+        audio, rate = sf.read(path, dtype="float32", always_2d=True)
+        fixtures[f"{Path(path).stem}@{rate}"] = (audio[:, 0], rate)
+    return fixtures
+
+
+def blocks(audio: np.ndarray, sample_rate: int) -> list[np.ndarray]:
+    """Split audio into the (frames, 1) blocks PortAudio would deliver."""
+    size = int(sample_rate * BLOCK_MS / 1000)
+    return [audio[i:i + size, np.newaxis] for i in range(0, len(audio), size)]
+
+
+def stages(capture: AudioCapture, audio: np.ndarray, sample_rate: int) -> dict:
+    """Benchmarked callables for one fixture, keyed by stage name."""
+    device_blocks = blocks(audio, sample_rate)
+    audio_16k = capture._resample_to_16k(audio, sample_rate).astype(np.float32)
+    blocks_16k = [b[:, 0] for b in blocks(audio_16k, SAMPLE_RATE)]
+
+    def ensure_mono():
+        for block in device_blocks:
+            capture._ensure_mono(block)
+
+    def resample_stream():
+        resampler = StreamingResampler(sample_rate, SAMPLE_RATE)
+        for block in device_blocks:
+            resampler.process(block[:, 0])
+
+    def vad():
+        detector = VoiceActivityDetector(SAMPLE_RATE, capture.vad_scorer, keep_audio=False)
+        for block in blocks_16k:
+            detector.process(block)
+
+    def pipeline():
+        capture.capture_from(device_blocks, sample_rate, lambda audio, sr: None)
+
+    result = {"ensure_mono": ensure_mono}
+    if sample_rate != SAMPLE_RATE:
+        result["resample_whole"] = lambda: capture._resample_to_16k(audio, sample_rate)
+        result["resample_stream"] = resample_stream
+    result["vad"] = vad
+    result["normalize"] = lambda: capture._normalize_audio(audio_16k)
+    result["pipeline"] = pipeline
+    return result
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the audio front end (no microphone needed)")
+    parser.add_argument("--wav", action="append", default=[], help="Recorded WAV fixture (repeatable)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per stage (default: 5)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write results as a baseline JSON file")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (default: 0.25 = 25%%)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    capture = AudioCapture()
+
+    results = {}
+    rows = []
+    for fixture, (audio, sample_rate) in load_fixtures(args.wav).items():
+        duration = len(audio) / sample_rate
+        for stage, fn in stages(capture, audio, sample_rate).items():
+            result = measure(fn, args.repeats)
+            results[f"{fixture}/{stage}"] = result
+            rtf = result["median_s"] / duration
+            rows.append([
+                fixture,
+                stage,
+                f"{result['median_s'] * 1000:.2f}",
+                f"{rtf:.4f}",
+                f"{1 / rtf:.0f}x" if rtf > 0 else "-",
+                f"{result['peak_kib']:.0f}",
+            ])
+
+    print_table(["fixture", "stage", "median ms", "RTF", "speed", "peak KiB"], rows)
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+    if args.baseline:
+        regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
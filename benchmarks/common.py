@@ -0,0 +1,74 @@
+"""
+Shared helpers for the benchmark runners: timing, peak memory and baselines.
+"""
+import contextlib
+import io
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+
+def measure(fn: Callable[[], object], repeats: int = 5, quiet: bool = True) -> dict:
+    """
+    Time fn over `repeats` runs and record its peak traced memory.
+
+    The first run is traced with tracemalloc (which slows it down) and is not
+    included in the timings. stdout is swallowed when quiet, so the pipeline's
+    logging doesn't end up in the measurements.
+    """
+    out = io.StringIO() if quiet else None
+    with contextlib.redirect_stdout(out) if quiet else contextlib.nullcontext():
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "peak_kib": peak / 1024,
+    }
+
+
+def load_baseline(path: str) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def save_baseline(path: str, results: dict) -> None:
+    Path(path).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"Saved baseline to {path}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_s: float = 0.001) -> list[str]:
+    """
+    Return a description of every result slower than its baseline by more than
+    tolerance. Slowdowns smaller than min_delta_s are timer noise and ignored.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] > 0 else 1.0
+        if ratio > 1 + tolerance and result["median_s"] - base["median_s"] > min_delta_s:
+            regressions.append(f"{name}: {result['median_s'] * 1000:.2f}ms vs {base['median_s'] * 1000:.2f}ms baseline ({ratio:.2f}x)")
+    return regressions
+
+
+def print_table(headers: list[str], rows: list[list]) -> None:
+    widths = [max([len(str(h))] + [len(str(r[i])) for r in rows]) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
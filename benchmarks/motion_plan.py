@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark motion plan compilation against per-command execution.
+
+Runs canned command sequences through the firmware (lgpio mock, which
+counts the calls, and a virtual clock, so no motors move and no time
+passes) both ways: one forward()/left_turn()/... per command, as the robot
+used to, and one compiled plan. Reports GPIO calls, stop/starts between
+moves, the simulated motion time and the wall time to compile and dispatch.
+
+    python -m benchmarks.motion_plan
+"""
+import argparse
+import atexit
+import contextlib
+import io
+
+from benchmarks.common import measure, print_table
+from lib.clock import VirtualClock
+from lib.firmware import Firmware, lgpio_mock
+from lib.models import MovementCommand
+from lib.motion_plan import compile_plan
+
+SEQUENCES = {
+    "forward x2": [("forward", 1000), ("forward", 1000)],
+    "zigzag": [("forward", 500), ("left", 300), ("forward", 500), ("right", 300), ("forward", 500)],
+    "with no-ops": [("forward", 1000), ("left", 0), ("forward", 1000), ("right", 0), ("backward", 500)],
+    "square": [("forward", 1000), ("right", 400)] * 4,
+}
+
+
+def run_per_command(firmware: Firmware, commands: list[MovementCommand]) -> None:
+    methods = {"forward": firmware.forward, "backward": firmware.reverse, "left": firmware.left_turn, "right": firmware.right_turn}
+    for command in commands:
+        methods[command.command](command.ms / 1000.0)
+    firmware._queue.wait()
+
+
+def run_plan(firmware: Firmware, commands: list[MovementCommand]) -> None:
+    firmware.run_plan(compile_plan(commands))
+    firmware._queue.wait()
+
+
+def simulate(run, commands: list[MovementCommand], repeats: int) -> dict:
+    clock = VirtualClock()
+    with contextlib.redirect_stdout(io.StringIO()):
+        firmware = Firmware(gpio=lgpio_mock, clock=clock)
+        lgpio_mock.reset_calls()
+        run(firmware, commands)
+    calls = lgpio_mock.calls
+    duty_changes = calls["tx_pwm"] // 2  # Per motor
+    result = {
+        "gpio_calls": calls["gpio_write"] + calls["group_write"] + calls["tx_pwm"],
+        "motion_s": clock.now(),
+        "stops": (duty_changes - 2) // 2,  # Stop + restart pairs besides the first start and the final stop
+        "dispatch_s": measure(lambda: run(firmware, commands), repeats)["median_s"],
+    }
+    atexit.unregister(firmware._cleanup)
+    return result
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark motion plan compilation")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed runs per sequence (default: 20)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    rows = []
+    for name, sequence in SEQUENCES.items():
+        commands = [MovementCommand(command=command, ms=ms) for command, ms in sequence]
+        for label, run in (("per command", run_per_command), ("plan", run_plan)):
+            result = simulate(run, commands, args.repeats)
+            rows.append([
+                name,
+                label,
+                result["gpio_calls"],
+                result["stops"],
+                f"{result['motion_s']:.1f}",
+                f"{result['dispatch_s'] * 1e6:.0f}",
+            ])
+
+    print_table(["sequence", "execution", "GPIO calls", "stop/starts", "motion s", "dispatch µs"], rows)
+
+
+if __name__ == "__main__":
+    main()
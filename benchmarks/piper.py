@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark Piper TTS: a cold `piper` subprocess per utterance vs the resident engine.
+
+The subprocess path starts Python, loads the ONNX voice and synthesizes for
+every utterance (what TextToSpeech used to do); the resident path loads the
+voice once and only runs inference. Reports time to the first audio buffer
+and to the complete utterance.
+
+    python -m benchmarks.piper
+    python -m benchmarks.piper --model ~/piper-voices/en_US-lessac-medium.onnx --repeats 10
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import print_table
+from lib.piper_engine import PiperEngine
+from lib.tts import PIPER_MODEL_PATH
+
+PHRASES = [
+    "Okay.",
+    "Moving forward for two seconds.",
+    "I turned left, but there is something in the way. Should I go around it or stop here?",
+]
+READ_CHUNK_BYTES = 4096
+
+
+def cold_subprocess(model: str, text: str) -> tuple[float, float]:
+    """Seconds to the first raw PCM bytes and to the end of output from a fresh piper process."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "piper", "--model", model, "--output_raw"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    process.stdin.write(text.encode("utf-8"))
+    process.stdin.close()
+    first = None
+    while process.stdout.read1(READ_CHUNK_BYTES):
+        if first is None:
+            first = time.perf_counter() - start
+    process.wait()
+    if process.returncode != 0:
+        raise RuntimeError(f"piper exited with code {process.returncode}")
+    return first or 0.0, time.perf_counter() - start
+
+
+def resident(engine: PiperEngine, text: str) -> tuple[float, float]:
+    """Seconds to the first PCM buffer and to the end of synthesis from the loaded engine."""
+    start = time.perf_counter()
+    first = None
+    for _ in engine.stream(text):
+        if first is None:
+            first = time.perf_counter() - start
+    return first or 0.0, time.perf_counter() - start
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark cold subprocess vs resident Piper synthesis")
+    parser.add_argument("--model", default=PIPER_MODEL_PATH, help=f"Piper voice (default: {PIPER_MODEL_PATH})")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per phrase and mode (default: 5)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    load_start = time.perf_counter()
+    engine = PiperEngine(args.model)
+    print(f"Resident engine load (paid once at startup): {(time.perf_counter() - load_start) * 1000:.0f} ms\n")
+
+    rows = []
+    for text in PHRASES:
+        for mode, run in (("cold subprocess", lambda: cold_subprocess(args.model, text)), ("resident", lambda: resident(engine, text))):
+            run()  # Warm the OS file cache so neither mode pays for the first disk read
+            timings = [run() for _ in range(args.repeats)]
+            rows.append([
+                text if len(text) <= 32 else text[:29] + "...",
+                mode,
+                f"{statistics.median(t[0] for t in timings) * 1000:.0f}",
+                f"{statistics.median(t[1] for t in timings) * 1000:.0f}",
+            ])
+    engine.close()
+
+    print_table(["phrase", "mode", "first audio ms", "total ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
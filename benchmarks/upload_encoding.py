@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark the GPT-4o audio upload encodings.
+
+Encodes synthetic utterances (and any recorded WAV files given with --wav)
+in every upload format, with and without silence trimming, and reports the
+base64 payload per second of captured audio and the encode time.
+
+    python -m benchmarks.upload_encoding
+    python -m benchmarks.upload_encoding --wav recordings/forward.wav
+"""
+import argparse
+import base64
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks.common import measure, print_table
+from benchmarks.audio_frontend import synthetic_speech
+from lib.audio_capture import AudioCapture, SAMPLE_RATE
+from lib.audio_encoding import UPLOAD_FORMATS, API_UPLOAD_FORMATS, prepare_upload
+
+
+def load_fixtures(wav_paths: list[str]) -> dict[str, np.ndarray]:
+    """16 kHz normalized utterances, as the capture pipeline delivers them."""
+    capture = AudioCapture()
+    # One utterance as the segmenter cuts it: 300ms pre-roll, speech, 800ms hangover
+    fixtures = {"synthetic": synthetic_speech(SAMPLE_RATE, 3.8)[int(0.7 * SAMPLE_RATE):]}
+    for path in wav_paths:
+        audio, rate = sf.read(path, dtype="float32", always_2d=True)
+        fixtures[Path(path).stem] = capture._resample_to_16k(audio.mean(axis=1), rate).astype(np.float32)
+    return {name: capture._normalize_audio(audio) for name, audio in fixtures.items()}
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark audio upload encodings")
+    parser.add_argument("--wav", action="append", default=[], help="Recorded WAV fixture (repeatable)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per format (default: 5)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    rows = []
+    for fixture, audio in load_fixtures(args.wav).items():
+        duration = len(audio) / SAMPLE_RATE
+        raw = len(base64.b64encode(audio.astype(np.float32).tobytes())) / duration
+        rows.append([fixture, "float32 (raw)", "-", f"{raw / 1024:.1f}", "1.0x", "-"])
+        for upload_format in UPLOAD_FORMATS:
+            for trim in (False, True):
+                result = measure(lambda: prepare_upload(audio, SAMPLE_RATE, upload_format, trim), args.repeats)
+                payload = len(base64.b64encode(prepare_upload(audio, SAMPLE_RATE, upload_format, trim))) / duration
+                rows.append([
+                    fixture,
+                    upload_format if upload_format in API_UPLOAD_FORMATS else f"{upload_format} (not accepted by API)",
+                    "yes" if trim else "no",
+                    f"{payload / 1024:.1f}",
+                    f"{raw / payload:.1f}x",
+                    f"{result['median_s'] * 1000:.2f}",
+                ])
+
+    print_table(["fixture", "format", "trim", "base64 KiB/s", "smaller", "encode ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
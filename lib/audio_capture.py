@@ -1,47 +1,113 @@
-import queue
 import sys
-import time
+import threading
 from datetime import datetime
 from fractions import Fraction
-from typing import Optional, Callable
+from typing import Callable, Iterable, Optional
 
 import numpy as np
 import sounddevice as sd
 from scipy import signal
 
+from .device_cache import DeviceCache
+from .resampler import StreamingResampler
+from .ring_buffer import RingBuffer
+from .vad import VoiceActivityDetector, EnergyScorer, VAD_THRESHOLD
 
 SAMPLE_RATE = 16000
 FALLBACK_SAMPLE_RATES = [16000, 44100, 48000, 8000]  # Try these in order
 CHANNELS = 1  # Asking for mono
 AUDIO_DTYPE = "float32"  # Audio data type for sounddevice input stream
-VAD_THRESHOLD = 0.0035  # Energy threshold for voice activity detection (higher = more selective)
+BLOCK_MS = 20  # PortAudio block size; bounds how late end of speech can be noticed
 SILENCE_THRESHOLD_MS = 800  # Silence threshold in milliseconds
 MIN_AUDIO_DURATION_SECONDS = 0.5  # Minimum audio length to process
+PARTIAL_INTERVAL_MS = 1000  # How often to deliver partial audio while the user is still speaking
+MAX_UTTERANCE_SECONDS = 30  # Longer utterances are cut and delivered at this length
+RING_SLACK_SECONDS = 2  # Extra capture buffer so an utterance view isn't overwritten while it's processed
 
 
 class AudioStream:
-    def __init__(self, sample_rate: int):
+    """
+    Microphone samples as a 16kHz RingBuffer.
+
+    The PortAudio callback writes straight into a preallocated ring at the
+    device rate and signals the capture loop, which sleeps until then. When the
+    device doesn't run at 16kHz, read_all() resamples each new block into a
+    second 16kHz ring as it arrives, so the capture loop always slices 16kHz
+    views and no resampling is left to do at the end of an utterance.
+    """
+
+    def __init__(self, sample_rate: int, capacity_seconds: float = MAX_UTTERANCE_SECONDS + RING_SLACK_SECONDS):
         self.sample_rate = sample_rate
-        self.audio_queue: queue.Queue[np.ndarray] = queue.Queue()
+        self.buffer = RingBuffer(int(sample_rate * capacity_seconds))  # Device-rate samples from the callback
+        self._resampler: Optional[StreamingResampler] = None
+        self.output = self.buffer  # 16kHz samples read by the capture loop
+        if sample_rate != SAMPLE_RATE:
+            self._resampler = StreamingResampler(sample_rate, SAMPLE_RATE)
+            self.output = RingBuffer(int(SAMPLE_RATE * capacity_seconds))
+        self._device_position = 0  # Absolute position in buffer of the first sample not yet resampled
+        self.read_position = 0  # Absolute position in output of the first unread sample
+        self._data_ready = threading.Event()
 
     def callback(self, indata, frames, time_info, status):
         if status:
             print(status, file=sys.stderr)
-        self.audio_queue.put(indata.copy())
-
-    def read_all(self) -> Optional[np.ndarray]:
-        chunks = []
-        try:
-            while True:
-                # get_nowait sends a queue.Empty exception when is empty
-                # so we stop the loop
-                chunks.append(self.audio_queue.get_nowait())
-        except queue.Empty:
-            pass
-
-        if not chunks:
+        self.write(indata[:, 0])
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append device-rate mono samples and wake the capture loop."""
+        self.buffer.write(samples)
+        self._data_ready.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the callback delivers new samples. Returns False on timeout."""
+        ready = self._data_ready.wait(timeout)
+        # Clearing before reading is safe: samples written after this point set the event again
+        self._data_ready.clear()
+        return ready
+
+    def skip(self) -> None:
+        """Mark everything written so far as read."""
+        self._device_position = self.buffer.written
+        if self._resampler is not None:
+            self._resampler.reset()
+        self.read_position = self.output.written
+
+    def read_all(self, max_samples: Optional[int] = None) -> Optional[np.ndarray]:
+        """Return a 16kHz view of everything written since the last call (at most max_samples), or None."""
+        if self._resampler is not None:
+            self._resample_new()
+        start = self.read_position
+        end = self.output.written
+        if end == start:
             return None
-        return np.concatenate(chunks)
+        if start < self.output.oldest():
+            print(f"⚠️  Capture fell behind, dropped {self.output.oldest() - start} samples", file=sys.stderr)
+            start = self.output.oldest()
+        if max_samples is not None:
+            end = min(end, start + max_samples)
+        self.read_position = end
+        return self.output.view(start, end)
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        return self.output.view(start, end)
+
+    def flush(self) -> None:
+        """Push out the samples the resampler still holds back (end of input)."""
+        if self._resampler is not None:
+            self._resample_new()
+            self.output.write(self._resampler.flush())
+
+    def _resample_new(self) -> None:
+        start = self._device_position
+        end = self.buffer.written
+        if end == start:
+            return
+        if start < self.buffer.oldest():
+            print(f"⚠️  Capture fell behind, dropped {self.buffer.oldest() - start} samples", file=sys.stderr)
+            start = self.buffer.oldest()
+            self._resampler.reset()
+        self._device_position = end
+        self.output.write(self._resampler.process(self.buffer.view(start, end)))
 
 
 class AudioCapture:
@@ -52,27 +118,29 @@ class AudioCapture:
     and delivers preprocessed audio chunks via callback.
     """
 
-    def __init__(self, vad_threshold: float = VAD_THRESHOLD):
+    def __init__(self, vad_threshold: float = VAD_THRESHOLD, vad_scorer=None, device_cache: Optional[DeviceCache] = None):
         self.vad_threshold = vad_threshold
+        self.device_cache = device_cache
+        self.vad_scorer = vad_scorer if vad_scorer is not None else EnergyScorer(vad_threshold)
         self.sample_rate = SAMPLE_RATE
-        self.paused = False  # Flag to pause audio processing (e.g., during TTS playback)
+        self._resumed = threading.Event()  # Cleared to pause audio processing (e.g., during TTS playback)
+        self._resumed.set()
         print(f"Initialized AudioCapture with vad_threshold: {vad_threshold}")
 
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
     def pause(self):
         """Pause audio processing (stops capturing new audio segments)"""
-        self.paused = True
+        self._resumed.clear()
         print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] 🔇 Audio capture paused")
 
     def resume(self):
         """Resume audio processing"""
-        self.paused = False
+        self._resumed.set()
         print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] 🎤 Audio capture resumed")
 
-    def _is_voice(self, audio: np.ndarray) -> bool:
-        """Check if audio chunk contains voice based on energy threshold"""
-        energy = float(np.mean(np.abs(audio)))
-        return energy > self.vad_threshold
-
     def _is_min_duration(self, audio: np.ndarray, sample_rate: int) -> bool:
         """Check if audio meets minimum duration requirement"""
         return audio.shape[0] > int(sample_rate * MIN_AUDIO_DURATION_SECONDS)
@@ -85,14 +153,16 @@ class AudioCapture:
 
     def _normalize_audio(self, audio: np.ndarray) -> np.ndarray:
         """Normalize and boost audio volume"""
+        # Copies once: the result no longer aliases the capture ring buffer,
+        # every later step works in place on it
         audio = np.nan_to_num(audio)
 
         # Auto-gain: normalize to use full dynamic range
         max_val = np.abs(audio).max()
         if max_val > 0:
-            audio = audio / max_val * 0.9  # Scale to 90% to avoid clipping
+            audio *= 0.9 / max_val  # Scale to 90% to avoid clipping
 
-        return np.clip(audio, -1.0, 1.0)
+        return np.clip(audio, -1.0, 1.0, out=audio)
 
     def _resample_to_16k(self, audio: np.ndarray, orig_sample_rate: int) -> np.ndarray:
         """Resample audio to 16kHz if needed"""
@@ -115,17 +185,35 @@ class AudioCapture:
 
     def _get_working_sample_rate(self, device: int = 0) -> int:
         """Find a working sample rate for the device"""
+        cache = self.device_cache
+        if cache is not None and cache.get("input_device") == device:
+            cached_rate = cache.get("input_sample_rate")
+            # One check of the cached rate instead of probing every fallback
+            if cached_rate is not None and self._supports_rate(device, cached_rate):
+                return cached_rate
+
         for rate in FALLBACK_SAMPLE_RATES:
-            try:
-                sd.check_input_settings(device=device, channels=CHANNELS, samplerate=rate, dtype=AUDIO_DTYPE)
+            if self._supports_rate(device, rate):
                 if rate != SAMPLE_RATE:
                     print(f"Using sample rate {rate}Hz (device doesn't support {SAMPLE_RATE}Hz)")
+                if cache is not None:
+                    cache.update(input_device=device, input_sample_rate=rate)
                 return rate
-            except sd.PortAudioError:
-                continue
         raise RuntimeError(f"No supported sample rate found for device {device}")
 
-    def capture(self, audio_callback: Callable[[np.ndarray, int], None], device: int = 0):
+    def _supports_rate(self, device: int, rate: int) -> bool:
+        try:
+            sd.check_input_settings(device=device, channels=CHANNELS, samplerate=rate, dtype=AUDIO_DTYPE)
+            return True
+        except sd.PortAudioError:
+            return False
+
+    def capture(
+        self,
+        audio_callback: Callable[[np.ndarray, int], None],
+        device: int = 0,
+        partial_callback: Optional[Callable[[np.ndarray, int], None]] = None,
+    ):
         """
         Capture audio from microphone with VAD.
 
@@ -138,63 +226,195 @@ class AudioCapture:
                           when a complete audio segment is captured.
                           Audio is always 16kHz mono after preprocessing.
             device: Audio input device index (default: 0)
+            partial_callback: Optional function called every PARTIAL_INTERVAL_MS
+                          while voice is active, with the utterance captured so far
+                          (same format as audio_callback). Lets a consumer start
+                          transcribing before end of speech is confirmed.
         """
         print("Listening... Press Ctrl+C to stop.")
 
         # Find working sample rate for device
         working_sample_rate = self._get_working_sample_rate(device=device)
         audio_stream = AudioStream(working_sample_rate)
-        buffer: list[np.ndarray] = []
-        last_voice_time: Optional[float] = None
-        frame_count = 0  # Counter for energy logging
+        segmenter = SpeechSegmenter(self, audio_callback, partial_callback)
 
         with sd.InputStream(
             device=device,
             channels=CHANNELS,
             samplerate=working_sample_rate,
             dtype=AUDIO_DTYPE,
+            blocksize=int(working_sample_rate * BLOCK_MS / 1000),
             callback=audio_stream.callback,
         ):
             while True:
-                data = audio_stream.read_all()
-                if data is None:
-                    time.sleep(0.01)
-                    continue
-
-                # Skip processing if paused (e.g., during TTS playback)
+                # Skip processing if paused (e.g., during TTS playback): sleep
+                # until resume() and drop whatever was recorded meanwhile
                 if self.paused:
-                    time.sleep(0.01)
+                    segmenter.reset()
+                    self._resumed.wait()
+                    audio_stream.skip()
                     continue
 
-                energy = float(np.mean(np.abs(data)))
-                frame_count += 1
-
-                # Log energy periodically (even when not recording)
-                if frame_count % 10 == 0:
-                    print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Energy: {energy:.6f}, Threshold: {self.vad_threshold:.6f}")
-
-                if self._is_voice(data):
-                    if last_voice_time is None:
-                        print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Voice detected! (energy: {energy:.6f})")
-                    last_voice_time = time.monotonic()
-
-                # Only append to buffer after voice has been detected
-                if last_voice_time is not None:
-                    buffer.append(data)
-                    now = time.monotonic()
-                    silence_after_voice_ms = (now - last_voice_time) * 1000
-
-                    if silence_after_voice_ms >= SILENCE_THRESHOLD_MS:
-                        audio = np.concatenate(buffer)
-                        buffer.clear()  # Always clear buffer after silence
-                        last_voice_time = None  # Reset voice detection
-
-                        # Only process if we have enough audio duration
-                        if self._is_min_duration(audio, working_sample_rate):
-                            print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Captured {len(audio)/working_sample_rate:.2f}s of audio")
-
-                            # Preprocess and deliver audio
-                            processed_audio = self._preprocess_audio(audio, working_sample_rate)
-                            audio_callback(processed_audio, 16000)  # Always 16kHz after preprocessing
-                        else:
-                            print(f"Audio too short ({len(audio)/working_sample_rate:.2f}s), discarded")
+                if not segmenter.process(audio_stream):
+                    audio_stream.wait(timeout=1.0)
+
+    def capture_from(
+        self,
+        blocks: Iterable[np.ndarray],
+        sample_rate: int,
+        audio_callback: Callable[[np.ndarray, int], None],
+        partial_callback: Optional[Callable[[np.ndarray, int], None]] = None,
+    ):
+        """
+        Run the capture pipeline over pre-recorded audio instead of the microphone.
+
+        Each block goes through the same ring buffer, resampler, VAD and
+        preprocessing as live input, synchronously and as fast as possible.
+        Speech still in progress when the blocks run out is delivered too.
+
+        Args:
+            blocks: Audio blocks (mono or (frames, channels)) at sample_rate
+            sample_rate: Sample rate of the blocks
+            audio_callback, partial_callback: As for capture()
+        """
+        audio_stream = AudioStream(sample_rate)
+        segmenter = SpeechSegmenter(self, audio_callback, partial_callback)
+        for block in blocks:
+            audio_stream.write(self._ensure_mono(block))
+            while segmenter.process(audio_stream):
+                pass
+        segmenter.finish(audio_stream)
+
+
+class SpeechSegmenter:
+    """
+    Cuts a 16kHz AudioStream into utterances.
+
+    Runs the VAD over each new view of the stream and delivers the utterance
+    (pre-roll included) once the hangover confirms end of speech, plus the
+    utterance so far every PARTIAL_INTERVAL_MS while speech continues.
+
+    Delivered audio is preprocessed incrementally into a per-utterance
+    buffer: each partial only copies the samples captured since the last one,
+    and partials are views of that buffer. The auto-gain is fixed when the
+    utterance is first delivered (the first partial, or the final utterance
+    if there were no partials), so partials and the final utterance share it;
+    louder speech after that point is clipped.
+    """
+
+    def __init__(
+        self,
+        capture: AudioCapture,
+        audio_callback: Callable[[np.ndarray, int], None],
+        partial_callback: Optional[Callable[[np.ndarray, int], None]] = None,
+    ):
+        self._capture = capture
+        self._audio_callback = audio_callback
+        self._partial_callback = partial_callback
+        # Hangover doubles as the end-of-utterance silence window. The ring
+        # already holds the audio, so the detector only needs to score it.
+        self.vad = VoiceActivityDetector(SAMPLE_RATE, capture.vad_scorer, hangover_ms=SILENCE_THRESHOLD_MS, keep_audio=False)
+        self._utterance_start: Optional[int] = None  # Absolute ring position of the current utterance
+        self._last_partial_end = 0
+        self._buffer = np.empty(0, dtype=np.float32)  # Preprocessed utterance so far
+        self._buffered_end = 0  # Absolute ring position up to which _buffer is filled
+        self._peak = 0.0
+        self._gain: Optional[float] = None
+        self._frame_count = 0  # Counter for score logging
+        self._partial_interval_samples = int(SAMPLE_RATE * PARTIAL_INTERVAL_MS / 1000)
+        self._max_utterance_samples = int(SAMPLE_RATE * MAX_UTTERANCE_SECONDS)
+        self._block_samples = int(SAMPLE_RATE * BLOCK_MS / 1000)
+
+    def reset(self) -> None:
+        """Drop any utterance in progress (e.g. when capture is paused)."""
+        self._utterance_start = None
+        self.vad.reset()
+
+    def process(self, audio_stream: AudioStream) -> bool:
+        """Segment up to one block of new audio. Returns False if there was nothing to read."""
+        # One block at a time: when the loop falls behind, a single read could
+        # otherwise span a whole utterance and its onset would be missed
+        data = audio_stream.read_all(self._block_samples)
+        if data is None:
+            return False
+
+        vad = self.vad
+        decisions = vad.process(data)
+        end = audio_stream.read_position
+        self._frame_count += 1
+
+        # Log VAD score periodically (even when not recording)
+        if self._frame_count % 10 == 0:
+            print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] VAD score: {vad.last_score:.6f}, Threshold: {vad.scorer.threshold:.6f}")
+
+        if self._utterance_start is None and decisions.any():
+            # Start the utterance with the pre-roll so the word onset isn't clipped
+            print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Voice detected! (score: {vad.last_score:.6f})")
+            self._utterance_start = max(end - vad.onset_offset(), audio_stream.output.oldest())
+            self._last_partial_end = self._utterance_start
+            # Fresh buffer: views of the previous utterance may still be in use by the consumer.
+            # Sized for the longest utterance, so it only grows by the last read's overshoot.
+            self._buffer = np.empty(self._max_utterance_samples, dtype=np.float32)
+            self._buffered_end = self._utterance_start
+            self._peak = 0.0
+            self._gain = None
+
+        if self._utterance_start is None:
+            return True
+
+        if not vad.triggered or end - self._utterance_start >= self._max_utterance_samples:
+            self._deliver(audio_stream, end)
+        elif self._partial_callback is not None and end - self._last_partial_end >= self._partial_interval_samples:
+            # Still speaking: hand over what we have so far
+            self._last_partial_end = end
+            self._partial_callback(self._preprocessed(audio_stream, end), SAMPLE_RATE)
+        return True
+
+    def finish(self, audio_stream: AudioStream) -> None:
+        """Deliver the utterance in progress, if any (e.g. at the end of a file)."""
+        audio_stream.flush()
+        while self.process(audio_stream):
+            pass
+        if self._utterance_start is not None:
+            self._deliver(audio_stream, audio_stream.read_position)
+        self.vad.reset()
+
+    def _preprocessed(self, audio_stream: AudioStream, end: int) -> np.ndarray:
+        """
+        The utterance up to `end`, preprocessed. Only samples added since the
+        last call are copied and scaled; earlier ones are never rewritten, so
+        returned views stay valid.
+        """
+        length = end - self._utterance_start
+        start = self._buffered_end - self._utterance_start
+        if length > len(self._buffer):
+            grown = np.empty(max(length, 2 * len(self._buffer)), dtype=np.float32)
+            grown[:start] = self._buffer[:start]
+            self._buffer = grown
+        tail = self._buffer[start:length]
+        np.copyto(tail, audio_stream.view(self._buffered_end, end))
+        np.nan_to_num(tail, copy=False)
+        self._buffered_end = end
+        if len(tail):
+            self._peak = max(self._peak, float(np.abs(tail).max()))
+
+        if self._gain is None:
+            # First delivery: fix the auto-gain and apply it to everything so far
+            self._gain = 0.9 / self._peak if self._peak > 0 else 1.0  # Scale to 90% to avoid clipping
+            tail = self._buffer[:length]
+        tail *= self._gain
+        np.clip(tail, -1.0, 1.0, out=tail)
+        return self._buffer[:length]
+
+    def _deliver(self, audio_stream: AudioStream, end: int) -> None:
+        audio = audio_stream.view(self._utterance_start, end)
+
+        # Only process if we have enough audio duration
+        if self._capture._is_min_duration(audio, SAMPLE_RATE):
+            print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Captured {len(audio)/SAMPLE_RATE:.2f}s of audio")
+            processed_audio = self._preprocessed(audio_stream, end)
+            self._utterance_start = None
+            self._audio_callback(processed_audio, SAMPLE_RATE)  # Always 16kHz
+        else:
+            self._utterance_start = None
+            print(f"Audio too short ({len(audio)/SAMPLE_RATE:.2f}s), discarded")
@@ -5,6 +5,8 @@ import subprocess
 import re
 from typing import Optional
 
+from .device_cache import DeviceCache
+
 
 def detect_usb_audio_device() -> Optional[int]:
     """
@@ -47,19 +49,28 @@ def detect_usb_audio_device() -> Optional[int]:
         return None
 
 
-def get_audio_device() -> int:
+def get_audio_device(cache: Optional[DeviceCache] = None) -> int:
     """
     Get the audio output device card number.
 
     Strategy:
-    1. Auto-detect USB audio device
-    2. Fallback to card 1
+    1. Card from the device cache, if the sound hardware hasn't changed
+    2. Auto-detect USB audio device (and cache it)
+    3. Fallback to card 1
 
     Returns:
         ALSA card number for audio output
     """
+    if cache is not None:
+        cached = cache.get("output_card")
+        if cached is not None:
+            print(f"🔊 Cached USB audio device: card {cached}")
+            return cached
+
     device = detect_usb_audio_device()
     if device is not None:
+        if cache is not None:
+            cache.update(output_card=device)
         return device
 
     # Final fallback
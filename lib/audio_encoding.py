@@ -0,0 +1,72 @@
+"""
+In-memory audio encoding for uploads.
+
+Utterances are downmixed to mono, trimmed of leading/trailing silence and
+encoded straight into a bytes buffer in the chosen format.
+"""
+import io
+
+import numpy as np
+import soundfile as sf
+
+from .vad import EnergyScorer, FRAME_MS
+
+# Upload format -> (soundfile container, subtype)
+UPLOAD_FORMATS = {
+    "wav": ("WAV", "PCM_16"),
+    "mp3": ("MP3", "MPEG_LAYER_III"),
+    "flac": ("FLAC", "PCM_16"),
+    "opus": ("OGG", "OPUS"),
+}
+API_UPLOAD_FORMATS = ("wav", "mp3")  # Formats GPT-4o audio input accepts
+TRIM_RELATIVE_THRESHOLD = 0.05  # Frames quieter than this fraction of the loudest frame count as silence
+TRIM_MARGIN_MS = 200  # Audio kept around the speech so word edges aren't clipped
+
+
+def encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
+    """Encode audio as a 16-bit PCM WAV file in memory."""
+    return encode_audio(audio, sample_rate, "wav")
+
+
+def encode_audio(audio: np.ndarray, sample_rate: int, upload_format: str = "wav") -> bytes:
+    """Encode audio in memory as wav, mp3, flac or opus."""
+    if upload_format not in UPLOAD_FORMATS:
+        raise ValueError(f"Unknown upload format: {upload_format}. Choose one of {', '.join(UPLOAD_FORMATS)}")
+    container, subtype = UPLOAD_FORMATS[upload_format]
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format=container, subtype=subtype)
+    return buffer.getvalue()
+
+
+def downmix(audio: np.ndarray) -> np.ndarray:
+    """Average (frames, channels) audio down to mono."""
+    return audio.mean(axis=1) if audio.ndim > 1 else audio
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int, margin_ms: int = TRIM_MARGIN_MS) -> np.ndarray:
+    """
+    Drop leading and trailing silence, keeping margin_ms on each side.
+
+    The threshold is relative to the loudest frame, so it works on audio that
+    has already been normalized. Returns a view; all-silent audio is returned as is.
+    """
+    frame_length = sample_rate * FRAME_MS // 1000
+    count = len(audio) // frame_length
+    if count == 0:
+        return audio
+    scores = EnergyScorer().score(audio[:count * frame_length].reshape(count, frame_length))
+    voiced = np.flatnonzero(scores > TRIM_RELATIVE_THRESHOLD * scores.max())
+    if len(voiced) == 0:
+        return audio
+    margin = sample_rate * margin_ms // 1000
+    start = max(0, voiced[0] * frame_length - margin)
+    end = min(len(audio), (voiced[-1] + 1) * frame_length + margin)
+    return audio[start:end]
+
+
+def prepare_upload(audio: np.ndarray, sample_rate: int, upload_format: str = "wav", trim: bool = True) -> bytes:
+    """Downmix, optionally trim silence, and encode an utterance for upload."""
+    audio = downmix(audio)
+    if trim:
+        audio = trim_silence(audio, sample_rate)
+    return encode_audio(audio, sample_rate, upload_format)
@@ -0,0 +1,267 @@
+"""
+Long-lived audio output stream for speech playback.
+
+The output device is opened and started once; PortAudio pulls audio from a
+queue of clips in its callback and plays silence when the queue is empty,
+so clips start without a device open/close (and its click). Clips can be
+queued whole or streamed block by block as the TTS backend produces them.
+"""
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import sounddevice as sd
+
+from .resampler import StreamingResampler
+
+
+OUTPUT_CHANNELS = 1
+OUTPUT_DTYPE = "float32"
+OUTPUT_BLOCK_MS = 20  # Audio handed to PortAudio per callback
+FALLBACK_OUTPUT_SAMPLE_RATE = 48000
+PLAYBACK_TIMEOUT_MARGIN_S = 2.0  # Slack over the queued audio's length before a stalled playback is given up
+
+
+def decode_pcm16(chunks: Iterable[bytes]) -> Iterator[np.ndarray]:
+    """
+    Turn a stream of raw 16-bit little-endian PCM bytes into float32 blocks.
+    A byte split across chunk boundaries is carried over to the next chunk.
+    """
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk
+        usable = len(data) - len(data) % 2
+        carry = data[usable:]
+        if usable:
+            yield np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+
+
+def find_output_device(card: Optional[int]) -> Optional[int]:
+    """PortAudio index of the output device on an ALSA card (None = default device)."""
+    if card is None:
+        return None
+    for index, device in enumerate(sd.query_devices()):
+        if f"(hw:{card}," in device["name"] and device["max_output_channels"] > 0:
+            return index
+    print(f"⚠️  No PortAudio output device for ALSA card {card}, using the default output")
+    return None
+
+
+class Clip:
+    """
+    One queued piece of audio.
+
+    The producer write()s blocks (resampled to the output rate) and close()s
+    the clip; the output callback reads them. Timestamps are time.monotonic().
+    """
+
+    def __init__(self, sample_rate: int, output_sample_rate: int):
+        self._resampler = StreamingResampler(sample_rate, output_sample_rate) if sample_rate != output_sample_rate else None
+        self._output_sample_rate = output_sample_rate
+        self._blocks: deque[np.ndarray] = deque()
+        self._offset = 0  # Samples of _blocks[0] already played
+        self._closed = False
+        self._done = threading.Event()
+        self.cancelled = False
+        self.queued_at: Optional[float] = None  # First block written
+        self.started_at: Optional[float] = None  # First sample handed to the device
+        self.finished_at: Optional[float] = None  # Last sample expected to leave the speaker
+        self.samples_played = 0
+        self.samples_written = 0  # At the output rate
+
+    def write(self, block: np.ndarray) -> None:
+        """Append audio (producer side)."""
+        if self.cancelled or self._closed:
+            return
+        if self._resampler is not None:
+            block = self._resampler.process(block)
+        if len(block):
+            if self.queued_at is None:
+                self.queued_at = time.monotonic()
+            self._blocks.append(np.asarray(block, dtype=np.float32))
+            self.samples_written += len(block)
+
+    def close(self) -> None:
+        """Mark the end of the clip; it finishes once everything written has been played."""
+        if self._resampler is not None and not self._closed:
+            self.write(self._resampler.flush())
+        self._closed = True  # Set after the last append, so the callback never sees it early
+
+    def cancel(self) -> None:
+        """Stop the clip at the next callback and drop whatever hasn't been played."""
+        self.cancelled = True
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def remaining_seconds(self) -> float:
+        """Length of the audio written but not played yet."""
+        return (self.samples_written - self.samples_played) / self._output_sample_rate
+
+    @property
+    def start_latency(self) -> Optional[float]:
+        """Seconds from the first block being queued until it reached the device."""
+        if self.queued_at is None or self.started_at is None:
+            return None
+        return self.started_at - self.queued_at
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the clip has been played out of the speaker (or cancelled)."""
+        if not self._done.wait(timeout):
+            return False
+        if not self.cancelled and self.finished_at is not None:
+            time.sleep(max(0.0, self.finished_at - time.monotonic()))
+        return True
+
+    def _read(self, out: np.ndarray, now: float) -> int:
+        """Copy queued audio into out (callback side) and return the samples written."""
+        filled = 0
+        while filled < len(out) and self._blocks:
+            block = self._blocks[0]
+            take = min(len(out) - filled, len(block) - self._offset)
+            out[filled:filled + take] = block[self._offset:self._offset + take]
+            filled += take
+            self._offset += take
+            if self._offset == len(block):
+                self._blocks.popleft()
+                self._offset = 0
+        if filled and self.started_at is None:
+            self.started_at = now
+        self.samples_played += filled
+        return filled
+
+    def _finish(self, finished_at: float) -> None:
+        self.finished_at = finished_at
+        self._done.set()
+
+
+class AudioOutput:
+    """
+    Plays float32 mono audio through one persistent, always-running output stream.
+
+    The stream runs at the device's native rate; clips at other rates
+    (24 kHz OpenAI PCM, 22.05 kHz Piper) are resampled as they are written.
+    Clips play back to back in the order they were queued.
+    """
+
+    def __init__(self, card: Optional[int] = None):
+        self.device = find_output_device(card)
+        self.sample_rate = self._get_output_sample_rate()
+        self.start_latencies: list[float] = []
+        self._clips: deque[Clip] = deque()
+        self._stream = sd.OutputStream(
+            device=self.device,
+            channels=OUTPUT_CHANNELS,
+            samplerate=self.sample_rate,
+            dtype=OUTPUT_DTYPE,
+            blocksize=self.sample_rate * OUTPUT_BLOCK_MS // 1000,
+            callback=self._callback,
+        )
+        self.output_latency = float(self._stream.latency)
+        self._stream.start()
+        print(f"🔈 Audio output: device {self.device if self.device is not None else 'default'} at {self.sample_rate} Hz ({self.output_latency * 1000:.0f}ms latency)")
+
+    def _get_output_sample_rate(self) -> int:
+        try:
+            return int(sd.query_devices(self.device, "output")["default_samplerate"])
+        except (sd.PortAudioError, ValueError, TypeError, KeyError) as e:
+            print(f"⚠️  Could not query output sample rate ({e}), using {FALLBACK_OUTPUT_SAMPLE_RATE} Hz")
+            return FALLBACK_OUTPUT_SAMPLE_RATE
+
+    def _callback(self, outdata, frames, time_info, status) -> None:
+        """PortAudio callback: fill outdata from the clip queue, silence for the rest."""
+        out = outdata[:, 0]
+        now = time.monotonic()
+        filled = 0
+        while self._clips:
+            clip = self._clips[0]
+            if not clip.cancelled:
+                filled += clip._read(out[filled:], now + filled / self.sample_rate + self.output_latency)
+                if filled == frames:
+                    break
+                # Check closed before emptiness: close() only happens after the last write
+                if not (clip._closed and not clip._blocks):
+                    break  # Producer is behind: play silence until more arrives
+            self._clips.popleft()
+            if clip.started_at is not None and not clip.cancelled:
+                self.start_latencies.append(clip.start_latency)
+            clip._finish(now + filled / self.sample_rate + self.output_latency)
+        out[filled:] = 0
+
+    def open_clip(self, sample_rate: int) -> Clip:
+        """Queue an empty clip to be written block by block."""
+        clip = Clip(sample_rate, self.sample_rate)
+        self._clips.append(clip)
+        return clip
+
+    def enqueue(self, buffer: np.ndarray, sample_rate: int) -> Clip:
+        """Queue a complete buffer for playback and return immediately."""
+        clip = self.open_clip(sample_rate)
+        clip.write(buffer)
+        clip.close()
+        return clip
+
+    def play(self, blocks: Iterable[np.ndarray], sample_rate: int) -> int:
+        """
+        Write blocks to the speaker as they arrive and return once playback has finished.
+        Returns the number of samples played (at the output rate).
+        """
+        clip = self.open_clip(sample_rate)
+        try:
+            for block in blocks:
+                if clip.cancelled:
+                    break
+                clip.write(block)
+        except BaseException:
+            clip.cancel()
+            raise
+        finally:
+            clip.close()
+        self._wait_bounded([clip])
+        if clip.start_latency is not None:
+            print(f"🔈 Playback started {clip.start_latency * 1000:.0f}ms after the first audio was queued")
+        return clip.samples_played
+
+    def cancel(self) -> None:
+        """Flush the queue: stop the playing clip and drop every queued one."""
+        for clip in list(self._clips):
+            clip.cancel()
+
+    def wait(self) -> None:
+        """Block until every queued clip has been played."""
+        self._wait_bounded(list(self._clips))
+
+    def _wait_bounded(self, clips: list[Clip]) -> None:
+        """
+        Wait for clips to finish, but no longer than it takes to play everything
+        queued plus a margin. If the device stops pulling audio (a stalled or
+        unplugged stream), the queue is cancelled instead of blocking forever.
+        """
+        timeout = sum(clip.remaining_seconds for clip in list(self._clips)) + self.output_latency + PLAYBACK_TIMEOUT_MARGIN_S
+        deadline = time.monotonic() + timeout
+        for clip in clips:
+            if not clip.wait(max(0.0, deadline - time.monotonic())):
+                print(f"⚠️  Playback didn't finish within {timeout:.1f}s, cancelling queued audio")
+                self.cancel()
+                return
+
+    def latency_stats(self) -> dict:
+        """Playback start latency over all clips so far, in seconds."""
+        if not self.start_latencies:
+            return {"clips": 0}
+        return {
+            "clips": len(self.start_latencies),
+            "mean_s": statistics.mean(self.start_latencies),
+            "median_s": statistics.median(self.start_latencies),
+            "max_s": max(self.start_latencies),
+        }
+
+    def close(self) -> None:
+        self.cancel()
+        self._stream.stop()
+        self._stream.close()
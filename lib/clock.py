@@ -0,0 +1,94 @@
+"""
+Clocks for everything that waits on time (command deadlines, paced replay).
+
+MonotonicClock is real time and is what production uses. VirtualClock is a
+simulated time.monotonic(): with auto_advance (the default) every sleep or
+deadline wait jumps straight to its end, so a 5s "forward" command is
+simulated in microseconds; with auto_advance=False time only moves when a
+test calls advance(). Anything that takes a clock accepts either (Clock).
+"""
+import threading
+import time
+from typing import Protocol
+
+
+class Clock(Protocol):
+    """What schedulers need from a clock."""
+
+    def now(self) -> float:
+        ...
+
+    def sleep(self, seconds: float) -> None:
+        ...
+
+    def wait_until(self, condition: threading.Condition, deadline: float) -> None:
+        ...
+
+
+class MonotonicClock:
+    """Real time: time.monotonic(), real sleeps and condition waits."""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait_until(self, condition: threading.Condition, deadline: float) -> None:
+        """Wait on a held condition until notified or the deadline has passed."""
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            condition.wait(remaining)
+
+
+class VirtualClock:
+    """Simulated monotonic time that only moves by sleeps/waits (auto_advance) or advance()."""
+
+    def __init__(self, start: float = 0.0, auto_advance: bool = True):
+        self.auto_advance = auto_advance
+        self._now = start
+        self._changed = threading.Condition()
+        self._waiting: set[threading.Condition] = set()  # Conditions blocked in wait_until() until time moves
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward and wake everything waiting on it."""
+        with self._changed:
+            self._now += max(0.0, seconds)
+            waiting = list(self._waiting)
+            self._changed.notify_all()
+        for condition in waiting:
+            with condition:
+                condition.notify_all()
+
+    def sleep(self, seconds: float) -> None:
+        if self.auto_advance:
+            self.advance(seconds)
+            return
+        with self._changed:
+            until = self._now + seconds
+            self._changed.wait_for(lambda: self._now >= until)
+
+    def wait_until(self, condition: threading.Condition, deadline: float) -> None:
+        """
+        Wait on a held condition until notified or the simulated deadline has
+        passed. Callers re-check the time afterwards, as with a real wait.
+        """
+        if self.auto_advance:
+            with self._changed:
+                self._now = max(self._now, deadline)
+            return
+        with self._changed:
+            self._waiting.add(condition)
+            # Checked after registering: an advance() from here on notifies this condition
+            if self._now >= deadline:
+                self._waiting.discard(condition)
+                return
+        try:
+            condition.wait()
+        finally:
+            with self._changed:
+                self._waiting.discard(condition)
@@ -1,39 +1,82 @@
+"""
+Deadline scheduler for timed commands (e.g. "stop the motors in 0.5s").
+
+Each command runs at an absolute monotonic deadline instead of after
+a relative sleep. A command's delay counts from the previous command's
+deadline (or from when it was enqueued, if the queue was idle), so the time
+spent executing commands doesn't accumulate as drift. The worker waits on a
+condition variable, so clear() wakes it immediately and discards a command
+whose deadline hasn't arrived yet. Time comes from an injectable clock
+(lib.clock), so simulations can run on a VirtualClock in zero wall time.
+"""
+import statistics
 import threading
-import queue
-import time
+from collections import deque
+from typing import Optional
+
+from lib.clock import Clock, MonotonicClock
 
 
 class CommandQueue:
-    def __init__(self, name: str = "CommandQueue"):
+    def __init__(self, name: str = "CommandQueue", clock: Optional[Clock] = None):
         self.name = name
-        self._queue = queue.Queue()
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.jitter: list[float] = []  # Seconds each command ran after its deadline
+        self._pending = deque()
+        self._busy = False  # Worker holds a command taken from _pending
+        self._generation = 0  # Bumped by clear() to drop the command being waited on
+        self._last_deadline = 0.0
+        self._condition = threading.Condition(threading.RLock())
         self._thread = threading.Thread(target=self._worker, daemon=True)
         self._thread.start()
 
     def enqueue(self, func, *args, delay: float = 0.0, **kwargs):
-        """Add a command. delay = seconds to wait before executing."""
-        self._queue.put((delay, func, args, kwargs))
+        """Add a command. delay = seconds after the previous command's deadline."""
+        with self._condition:
+            self._pending.append((self.clock.now(), delay, func, args, kwargs))
+            self._condition.notify_all()
 
     def wait(self):
-        """Block until all enqueued commands have been executed."""
-        self._queue.join()
+        """Block until all enqueued commands have been executed (or cleared)."""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending and not self._busy)
 
     def clear(self):
-        """Flush all pending commands (e.g. on new voice interrupt)."""
-        while not self._queue.empty():
-            try:
-                self._queue.get_nowait()
-                self._queue.task_done()
-            except queue.Empty:
-                break
+        """Flush all pending commands, including one waiting for its deadline (e.g. on new voice interrupt)."""
+        with self._condition:
+            self._pending.clear()
+            self._generation += 1
+            self._condition.notify_all()
+
+    def jitter_stats(self) -> dict:
+        """How late commands ran relative to their deadlines, in seconds."""
+        if not self.jitter:
+            return {"commands": 0}
+        return {
+            "commands": len(self.jitter),
+            "mean_s": statistics.mean(self.jitter),
+            "median_s": statistics.median(self.jitter),
+            "max_s": max(self.jitter),
+        }
 
     def _worker(self):
-        while True:
-            delay, func, args, kwargs = self._queue.get()
-            if delay > 0:
-                time.sleep(delay)
-            try:
-                func(*args, **kwargs)
-            except Exception as e:
-                print(f"[{self.name}] Error: {e}")
-            self._queue.task_done()
+        with self._condition:
+            while True:
+                self._condition.wait_for(lambda: self._pending)
+                enqueued_at, delay, func, args, kwargs = self._pending.popleft()
+                self._busy = True
+                generation = self._generation
+                deadline = max(enqueued_at, self._last_deadline) + delay
+                while self._generation == generation and self.clock.now() < deadline:
+                    self.clock.wait_until(self._condition, deadline)
+
+                # Runs under the lock, so once clear() returns no stale command can fire
+                if self._generation == generation:
+                    self._last_deadline = deadline
+                    self.jitter.append(self.clock.now() - deadline)
+                    try:
+                        func(*args, **kwargs)
+                    except Exception as e:
+                        print(f"[{self.name}] Error: {e}")
+                self._busy = False
+                self._condition.notify_all()
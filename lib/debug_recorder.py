@@ -0,0 +1,79 @@
+"""
+Opt-in recorder of captured utterances for debugging.
+
+record() only hands the audio to a bounded queue; a background thread
+writes it as 16-bit WAV into a directory that keeps the newest max_files
+recordings. When the queue is full the utterance is dropped rather than
+delaying the pipeline. `sampling` keeps only a fraction of utterances.
+"""
+import queue
+import random
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+
+DEFAULT_DEBUG_DIR = Path("/tmp/junior-debug")
+DEFAULT_MAX_FILES = 50
+QUEUE_SIZE = 8  # Utterances waiting to be written before new ones are dropped
+
+
+class DebugRecorder:
+    """Writes utterances to a bounded, rotating directory on a background thread."""
+
+    def __init__(self, directory: Path = DEFAULT_DEBUG_DIR, max_files: int = DEFAULT_MAX_FILES, sampling: float = 1.0, seed: Optional[int] = None):
+        if not 0.0 <= sampling <= 1.0:
+            raise ValueError(f"Debug audio sampling must be between 0 and 1, got {sampling}")
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self.sampling = sampling
+        self.recorded = 0
+        self.dropped = 0
+        self._random = random.Random(seed)
+        self._count = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files = deque(sorted(self.directory.glob("*.wav")))  # Oldest first (names start with a timestamp)
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+        print(f"🐞 Recording debug audio to {self.directory} (sampling {sampling:.0%}, keeping {max_files} files)")
+
+    def record(self, audio: np.ndarray, sample_rate: int, label: str = "utterance") -> bool:
+        """Queue an utterance for writing; returns False if it was skipped or dropped."""
+        self._count += 1
+        if self.sampling < 1.0 and self._random.random() >= self.sampling:
+            return False
+        try:
+            self._queue.put_nowait((audio, sample_rate, label, self._count, datetime.now()))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def flush(self) -> None:
+        """Block until every queued utterance has been written."""
+        self._queue.join()
+
+    def _worker(self) -> None:
+        while True:
+            audio, sample_rate, label, count, timestamp = self._queue.get()
+            try:
+                self._write(audio, sample_rate, label, count, timestamp)
+            except (OSError, RuntimeError) as e:
+                print(f"⚠️  Could not write debug audio: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, audio: np.ndarray, sample_rate: int, label: str, count: int, timestamp: datetime) -> None:
+        path = self.directory / f"{timestamp.strftime('%Y%m%d-%H%M%S-%f')}-{count:05d}-{label}.wav"
+        sf.write(path, audio, sample_rate, subtype="PCM_16")
+        self.recorded += 1
+        self._files.append(path)
+        while len(self._files) > self.max_files:
+            self._files.popleft().unlink(missing_ok=True)
@@ -0,0 +1,74 @@
+"""
+Cache of audio device discovery results across runs.
+
+Finding the USB speaker means running `aplay -l`, and finding a working
+microphone sample rate means probing PortAudio rate by rate. Both results
+only change when the sound hardware changes, so they are stored in a JSON
+profile keyed on the sound card identity (the contents of
+/proc/asound/cards: card numbers, names and USB ports). When the identity
+differs from the cached one, the profile is ignored and everything is
+probed again.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_CACHE_PATH = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "junior" / "devices.json"
+ASOUND_CARDS_PATH = Path("/proc/asound/cards")
+
+
+def sound_card_identity(cards_path: Path = ASOUND_CARDS_PATH) -> Optional[str]:
+    """Hash of the attached sound cards, or None where /proc/asound isn't available."""
+    try:
+        return hashlib.sha256(cards_path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class DeviceCache:
+    """
+    Device profile (output card, input device, input sample rate) for the
+    current sound hardware. Reads return None whenever the hardware changed.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, identity: Optional[str] = None):
+        self.path = Path(path)
+        self.identity = identity if identity is not None else sound_card_identity()
+        self._profile = self._load()
+
+    def _load(self) -> dict:
+        if self.identity is None:
+            return {}
+        try:
+            profile = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(profile, dict) or profile.get("identity") != self.identity:
+            print("🔄 Sound hardware changed, re-probing audio devices")
+            return {}
+        return profile
+
+    def get(self, field: str):
+        """Cached value for the current hardware, or None."""
+        return self._profile.get(field)
+
+    def update(self, **fields) -> None:
+        """Record probe results and write the profile (no-op without a hardware identity)."""
+        if self.identity is None:
+            return
+        self._profile.update(fields, identity=self.identity)
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(self._profile, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Could not write device cache: {e}")
+
+    def clear(self) -> None:
+        """Forget the profile so everything is probed again."""
+        self._profile = {}
+        self.path.unlink(missing_ok=True)
@@ -1,7 +1,12 @@
 import atexit
+from collections import deque
 from datetime import datetime
+from typing import Optional
 
+from lib.clock import Clock, MonotonicClock
 from lib.command_queue import CommandQueue
+from lib.motion_plan import Move, MotionPlan, TimelineEvent, DIRECTION_LEVELS, STOPPED_LEVELS, plan_moves
+from .wave import ENABLE_BITS, build_wave
 
 try:
     import lgpio
@@ -10,63 +15,173 @@ except ImportError:
 
 MOTOR_DIR_PINS = [17, 22, 23, 24]
 MOTOR_PWM_PINS = [12, 13]
+TIMING_MODES = ("software", "wave")
+WAVE_REFILL_S = 0.05  # How often a wave that found lgpio's wave queue full is retried
 
 
 class Firmware:
-    def __init__(self):
-        self._h = lgpio.gpiochip_open(4)  # RPi 5 uses gpiochip4
-        self._queue = CommandQueue("FirmwareQueue")
-
-        for pin in MOTOR_DIR_PINS:
-            lgpio.gpio_claim_output(self._h, pin)
-        for pin in MOTOR_PWM_PINS:
-            lgpio.gpio_claim_output(self._h, pin)
+    def __init__(self, gpio=None, clock: Optional[Clock] = None, timing: str = "software", ramp_ms: int = 0):
+        # gpio: lgpio-compatible module, e.g. lgpio_mock to simulate without moving motors
+        # clock: e.g. lib.clock.VirtualClock to simulate command timing without waiting
+        # timing: "software" times moves on the command queue thread, "wave" hands
+        #         them to lgpio as hardware-timed waves (see lib.firmware.wave)
+        # ramp_ms: wave mode only, accelerate from standstill over this many ms
+        if timing not in TIMING_MODES:
+            raise ValueError(f"Unknown motion timing: {timing}. Choose from {', '.join(TIMING_MODES)}")
+        self._gpio = gpio if gpio is not None else lgpio
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.timing = timing
+        self.ramp_ms = ramp_ms
+        self._h = self._gpio.gpiochip_open(4)  # RPi 5 uses gpiochip4
+        self._queue = CommandQueue("FirmwareQueue", self.clock)
+
+        # The direction pins are one group (led by MOTOR_DIR_PINS[0]), so they switch in a
+        # single atomic write and the H-bridges never see a half-updated direction.
+        # In wave mode the PWM pins join the group, since the wave drives them too.
+        self._group = MOTOR_DIR_PINS + MOTOR_PWM_PINS if timing == "wave" else MOTOR_DIR_PINS
+        self._claim_group()
+        if timing == "software":
+            for pin in MOTOR_PWM_PINS:
+                self._gpio.gpio_claim_output(self._h, pin)
+        self._wave_backlog = deque()  # Pulses waiting for a free entry in lgpio's wave queue
+        self._refill_pending = False
 
         atexit.register(self._cleanup)
 
     def forward(self, sec: float, pw: int = 100) -> None:
         print(f"[FIRMWARE - {datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Moving forward for {sec} seconds at {pw}% power")
-        self._queue.enqueue(self._set_motors, 0, 1, 0, 1, pw)
-        self._queue.enqueue(self._stop_motors, delay=sec)
+        self._move("forward", sec, pw)
 
     def reverse(self, sec: float, pw: int = 100) -> None:
         print(f"[FIRMWARE - {datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Moving backward for {sec} seconds at {pw}% power")
-        self._queue.enqueue(self._set_motors, 1, 0, 1, 0, pw)
-        self._queue.enqueue(self._stop_motors, delay=sec)
+        self._move("backward", sec, pw)
 
     def left_turn(self, sec: float, pw: int = 100) -> None:
         print(f"[FIRMWARE - {datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Turning left for {sec} seconds at {pw}% power")
-        self._queue.enqueue(self._set_motors, 0, 1, 1, 0, pw)
-        self._queue.enqueue(self._stop_motors, delay=sec)
+        self._move("left", sec, pw)
 
     def right_turn(self, sec: float, pw: int = 100) -> None:
         print(f"[FIRMWARE - {datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Turning right for {sec} seconds at {pw}% power")
-        self._queue.enqueue(self._set_motors, 1, 0, 0, 1, pw)
-        self._queue.enqueue(self._stop_motors, delay=sec)
+        self._move("right", sec, pw)
+
+    def run_plan(self, plan: MotionPlan) -> None:
+        """Queue a compiled motion timeline (see lib.motion_plan); it starts and ends stopped."""
+        print(f"[FIRMWARE - {datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Running motion plan: {len(plan.moves)} move(s), {plan.duration_ms}ms, {plan.gpio_calls} GPIO call(s)")
+        if self.timing == "wave":
+            self._queue.enqueue(self._submit_wave, plan)
+            return
+        previous_ms = 0
+        for event in plan.events:
+            self._queue.enqueue(self._apply_event, event, delay=(event.at_ms - previous_ms) / 1000.0)
+            previous_ms = event.at_ms
 
     def stop(self) -> None:
         self._queue.clear()
+        self._cancel_wave()
         self._stop_motors()
 
     def clear(self) -> None:
         self._queue.clear()
+        self._cancel_wave()
         self._stop_motors()
 
-    def _set_motors(self, pin17: int, pin22: int, pin23: int, pin24: int, pw: int = 100) -> None:
-        lgpio.gpio_write(self._h, 17, pin17)
-        lgpio.gpio_write(self._h, 22, pin22)
-        lgpio.gpio_write(self._h, 23, pin23)
-        lgpio.gpio_write(self._h, 24, pin24)
-        lgpio.tx_pwm(self._h, 12, 1000, pw)
-        lgpio.tx_pwm(self._h, 13, 1000, pw)
+    def _move(self, direction: str, sec: float, pw: int) -> None:
+        if self.timing == "wave":
+            self._queue.enqueue(self._submit_wave, plan_moves([Move(direction, round(sec * 1000), pw)]))
+            return
+        self._queue.enqueue(self._set_motors, DIRECTION_LEVELS[direction], pw)
+        self._queue.enqueue(self._stop_motors, delay=sec)
+
+    def _claim_group(self) -> None:
+        self._gpio.group_claim_output(self._h, self._group, [0] * len(self._group))
+        # Last levels written, so unchanged pins and duty cycles aren't written again
+        self._dir_levels = STOPPED_LEVELS
+        self._duty = 0
+
+    def _submit_wave(self, plan: MotionPlan) -> None:
+        # lgpio appends to the group's wave queue, so consecutive plans play back to back.
+        # Plans end stopped, so once a wave has played out the pins match the
+        # STOPPED levels and duty that _claim_group() cached.
+        self._wave_backlog.extend(build_wave(plan, self.ramp_ms))
+        self._send_pulses()
+
+    def _refill_wave(self) -> None:
+        self._refill_pending = False
+        self._send_pulses()
+
+    def _send_pulses(self) -> None:
+        """
+        Send the whole backlog as one wave if lgpio's wave queue has a free
+        entry (tx_room() counts tx_wave() calls, not pulses), else retry later.
+        """
+        if not self._wave_backlog:
+            return
+        if self._gpio.tx_room(self._h, self._group[0], self._gpio.TX_WAVE) > 0:
+            self._gpio.tx_wave(self._h, self._group[0], [self._gpio.pulse(*p) for p in self._wave_backlog])
+            self._wave_backlog.clear()
+        elif not self._refill_pending:
+            self._refill_pending = True
+            self._queue.enqueue(self._refill_wave, delay=WAVE_REFILL_S)
+
+    def _cancel_wave(self) -> None:
+        """
+        Drop a wave that is still playing: free the group, then claim it again stopped.
+
+        lgpio doesn't document that group_free() stops a wave in flight, and
+        that hasn't been confirmed on hardware yet, so tx_busy() is checked
+        again afterwards. A wave that keeps playing is reported; it still ends
+        with the motors stopped, since every wave is a whole plan.
+        """
+        if self.timing != "wave":
+            return
+        self._wave_backlog.clear()
+        self._refill_pending = False
+        if self._gpio.tx_busy(self._h, self._group[0], self._gpio.TX_WAVE):
+            self._gpio.group_free(self._h, self._group[0])
+            self._claim_group()
+            if self._gpio.tx_busy(self._h, self._group[0], self._gpio.TX_WAVE):
+                print(f"[FIRMWARE - {datetime.now().strftime('%H:%M:%S.%f')[:-3]}] ⚠️  Wave still playing after freeing its group, motors stop when it ends")
+
+    def _set_motors(self, levels: tuple[int, ...], pw: int = 100) -> None:
+        self._write_direction(levels)
+        self._set_duty(pw)
+
+    def _apply_event(self, event: TimelineEvent) -> None:
+        levels = list(self._dir_levels)
+        for index, level in event.dir_writes:
+            levels[index] = level
+        # Like _stop_motors, cut the power before touching the direction pins when stopping
+        if event.duty == 0:
+            self._set_duty(0)
+        self._write_direction(tuple(levels))
+        if event.duty:
+            self._set_duty(event.duty)
+
+    def _write_direction(self, levels: tuple[int, ...]) -> None:
+        """Write the direction pins whose level changed, all in one group write."""
+        mask = sum(1 << i for i, (level, old) in enumerate(zip(levels, self._dir_levels)) if level != old)
+        if not mask:
+            return
+        bits = sum(level << i for i, level in enumerate(levels))
+        self._gpio.group_write(self._h, MOTOR_DIR_PINS[0], bits, mask)
+        self._dir_levels = tuple(levels)
+
+    def _set_duty(self, pw: int) -> None:
+        if pw == self._duty:
+            return
+        if self.timing == "wave":
+            # The enable pins belong to the wave group: outside waves they are only on or off
+            self._gpio.group_write(self._h, self._group[0], ENABLE_BITS if pw else 0, ENABLE_BITS)
+        else:
+            for pin in MOTOR_PWM_PINS:
+                self._gpio.tx_pwm(self._h, pin, 1000, pw)
+        self._duty = pw
 
     def _stop_motors(self) -> None:
         print(f"[FIRMWARE - {datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Stopping motors")
-        lgpio.tx_pwm(self._h, 12, 1000, 0)
-        lgpio.tx_pwm(self._h, 13, 1000, 0)
-        for pin in MOTOR_DIR_PINS:
-            lgpio.gpio_write(self._h, pin, 0)
+        self._set_duty(0)
+        self._write_direction(STOPPED_LEVELS)
 
     def _cleanup(self) -> None:
         self.stop()
-        lgpio.gpiochip_close(self._h)
+        self._gpio.gpiochip_close(self._h)
@@ -1,25 +1,107 @@
 """
 Mock lgpio module for local development.
 On Raspberry Pi, install with: sudo apt-get install python3-lgpio
+
+Every call is counted in `calls` (by function name), so tests and
+benchmarks can measure how many GPIO operations the firmware issues, and
+every tx_wave() is recorded in `waves` as (group leader, pulses). Each
+tx_wave() takes one entry of the group's wave queue, however many pulses
+it carries. Queued waves only finish when finish_waves() is called (or the
+group is freed), so tests decide when the hardware is done.
 """
+from collections import Counter
+from dataclasses import dataclass
+
+TX_PWM = 0
+TX_WAVE = 1
+
+calls = Counter()
+waves = []
+wave_entries = 4096  # Size of each group's wave queue, in tx_wave() calls
+free_stops_waves = True  # Whether group_free() stops a wave in flight (lgpio doesn't document it)
+_queued_waves = Counter()  # Unfinished tx_wave() calls per group leader
+
+
+@dataclass(frozen=True)
+class pulse:
+    """Mock: Wave step: set group_bits (where group_mask is 1), then wait pulse_delay µs"""
+    group_bits: int
+    group_mask: int
+    pulse_delay: int
+
+
+def reset_calls():
+    """Mock: Zero the call counters and forget recorded waves"""
+    calls.clear()
+    waves.clear()
+    _queued_waves.clear()
+
+def finish_waves(leader=None):
+    """Mock: Play out every queued wave (of one group, or all groups)"""
+    if leader is None:
+        _queued_waves.clear()
+    else:
+        _queued_waves.pop(leader, None)
 
 def gpiochip_open(chip):
     """Mock: Open GPIO chip"""
+    calls["gpiochip_open"] += 1
     print(f"[MOCK] Opening gpiochip{chip}")
     return chip
 
 def gpiochip_close(handle):
     """Mock: Close GPIO chip"""
+    calls["gpiochip_close"] += 1
     print(f"[MOCK] Closing gpiochip (handle={handle})")
 
 def gpio_claim_output(handle, pin, level=0):
     """Mock: Claim GPIO pin as output"""
+    calls["gpio_claim_output"] += 1
     print(f"[MOCK] Claiming GPIO {pin} as output (handle={handle})")
 
+def group_claim_output(handle, pins, levels=(0,)):
+    """Mock: Claim GPIO pins as an output group led by pins[0]"""
+    calls["group_claim_output"] += 1
+    print(f"[MOCK] Claiming GPIO {pins} as output group (handle={handle})")
+
 def gpio_write(handle, pin, level):
     """Mock: Write to GPIO pin"""
+    calls["gpio_write"] += 1
     print(f"[MOCK] GPIO {pin} = {level}")
 
+def group_write(handle, leader, bits, mask=0xFFFFFFFF):
+    """Mock: Write the group pins selected by mask (bit i = i-th pin of the group)"""
+    calls["group_write"] += 1
+    print(f"[MOCK] GPIO group {leader}: bits={bits:04b} mask={mask:04b}")
+
 def tx_pwm(handle, pin, freq, duty_cycle):
     """Mock: Set PWM output"""
+    calls["tx_pwm"] += 1
     print(f"[MOCK] PWM GPIO {pin}: {freq}Hz, duty={duty_cycle}/255 ({duty_cycle/255*100:.1f}%)")
+
+def group_free(handle, leader):
+    """Mock: Release a GPIO group (and stop its wave, if free_stops_waves)"""
+    calls["group_free"] += 1
+    if free_stops_waves:
+        _queued_waves.pop(leader, None)
+    print(f"[MOCK] Freeing GPIO group {leader}")
+
+def tx_wave(handle, leader, pulses):
+    """Mock: Queue a hardware-timed wave on a GPIO group"""
+    calls["tx_wave"] += 1
+    if _queued_waves[leader] >= wave_entries:
+        raise RuntimeError(f"[MOCK] Wave queue of GPIO group {leader} is full")
+    waves.append((leader, list(pulses)))
+    _queued_waves[leader] += 1
+    print(f"[MOCK] Wave on GPIO group {leader}: {len(pulses)} pulse(s), {sum(p.pulse_delay for p in pulses) / 1000:.0f}ms")
+    return wave_entries - _queued_waves[leader]
+
+def tx_busy(handle, gpio, kind):
+    """Mock: Whether a wave (or PWM) is still being transmitted"""
+    calls["tx_busy"] += 1
+    return int(kind == TX_WAVE and _queued_waves[gpio] > 0)
+
+def tx_room(handle, gpio, kind):
+    """Mock: Free entries in the transmit queue"""
+    calls["tx_room"] += 1
+    return wave_entries - _queued_waves[gpio] if kind == TX_WAVE else wave_entries
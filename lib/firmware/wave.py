@@ -0,0 +1,61 @@
+"""
+Hardware-timed motion: a MotionPlan as an lgpio wave.
+
+In wave mode the four direction pins and the two PWM (enable) pins form one
+GPIO group, and the whole timeline is handed to lgpio as pulses: each pulse
+sets the group's levels and holds them for a number of microseconds. lgpio
+plays the pulses on its own thread, so move durations don't depend on when
+the Python worker gets scheduled while Whisper keeps the CPU busy.
+
+Partial duty cycles and acceleration ramps are generated as software PWM
+inside the wave (on/off pulses at WAVE_PWM_HZ), since the enable pins can't
+run hardware PWM while they belong to the wave group.
+"""
+from lib.motion_plan import MotionPlan
+
+WAVE_PWM_HZ = 100  # Software PWM frequency inside waves (duty < 100% and ramps)
+ENABLE_BITS = 0b110000  # Group bits of MOTOR_PWM_PINS, after the four direction pins
+ALL_BITS = 0b111111
+
+
+def build_wave(plan: MotionPlan, ramp_ms: int = 0, pwm_hz: int = WAVE_PWM_HZ) -> list[tuple[int, int, int]]:
+    """
+    (group bits, group mask, delay µs) per pulse for a motion plan. Bit i is
+    MOTOR_DIR_PINS[i] for i < 4, then the two enable pins. With ramp_ms, the
+    duty rises linearly from 0 over ramp_ms whenever the motors start.
+    """
+    pulses = []
+    period_us = 1_000_000 // pwm_hz
+    direction, duty, ramp_start_ms = 0, 0, None
+    for i, event in enumerate(plan.events):
+        for index, level in event.dir_writes:
+            direction = direction | (1 << index) if level else direction & ~(1 << index)
+        if event.duty is not None:
+            if event.duty and not duty and ramp_ms:
+                ramp_start_ms = event.at_ms
+            duty = event.duty
+
+        now_us = event.at_ms * 1000
+        end_us = plan.events[i + 1].at_ms * 1000 if i + 1 < len(plan.events) else now_us
+        if now_us == end_us:
+            pulses.append((direction | (ENABLE_BITS if duty else 0), ALL_BITS, 0))
+        while now_us < end_us:
+            target = duty
+            if ramp_start_ms is not None:
+                progress = (now_us / 1000 - ramp_start_ms) / ramp_ms
+                if progress < 1:
+                    target = duty * progress
+                else:
+                    ramp_start_ms = None
+            if ramp_start_ms is None and duty in (0, 100):
+                # Steady full power (or off): one pulse for the rest of the segment
+                pulses.append((direction | (ENABLE_BITS if duty else 0), ALL_BITS, end_us - now_us))
+                break
+            length = min(period_us, end_us - now_us)
+            on_us = round(length * target / 100)
+            if on_us:
+                pulses.append((direction | ENABLE_BITS, ALL_BITS, on_us))
+            if length - on_us:
+                pulses.append((direction, ALL_BITS, length - on_us))
+            now_us += length
+    return pulses
@@ -1,40 +1,68 @@
 import base64
-from pathlib import Path
+from typing import Iterator, Optional
 
+import numpy as np
 from openai import OpenAI
 
+from .audio_encoding import prepare_upload, API_UPLOAD_FORMATS
+
 
 class GPT:
-    def __init__(self, api_key: str):
-        self._client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, upload_format: str = "wav", trim_silence: bool = True, client: Optional[OpenAI] = None):
+        if upload_format not in API_UPLOAD_FORMATS:
+            raise ValueError(f"Unsupported audio upload format: {upload_format}. Choose one of {', '.join(API_UPLOAD_FORMATS)}")
+        self._client = client if client is not None else OpenAI(api_key=api_key)
+        self.upload_format = upload_format
+        self.trim_silence = trim_silence
 
     def chat(self, system_prompt: str, user_message: str, model: str = "gpt-4o-mini") -> str:
         response = self._client.chat.completions.create(
             model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message},
-            ],
+            messages=self._messages(system_prompt, user_message),
             temperature=0.7,
         )
         return response.choices[0].message.content  # type: ignore[return-value]
 
-    def chat_with_audio(self, system_prompt: str, audio_file_path: str, model: str = "gpt-4o-audio-preview") -> str:
-        audio_data = base64.b64encode(Path(audio_file_path).read_bytes()).decode("utf-8")
+    def chat_stream(self, system_prompt: str, user_message: str, model: str = "gpt-4o-mini") -> Iterator[str]:
+        """Like chat(), but yields the response text as it is generated."""
+        return self._stream(model, self._messages(system_prompt, user_message))
+
+    def chat_with_audio(self, system_prompt: str, audio: np.ndarray, sample_rate: int, model: str = "gpt-4o-audio-preview") -> str:
         response = self._client.chat.completions.create(
             model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "input_audio",
-                            "input_audio": {"data": audio_data, "format": "wav"},
-                        }
-                    ],
-                },
-            ],
+            messages=self._messages(system_prompt, self._audio_content(audio, sample_rate)),
             temperature=0.7,
         )
         return response.choices[0].message.content  # type: ignore[return-value]
+
+    def chat_with_audio_stream(self, system_prompt: str, audio: np.ndarray, sample_rate: int, model: str = "gpt-4o-audio-preview") -> Iterator[str]:
+        """Like chat_with_audio(), but yields the response text as it is generated."""
+        return self._stream(model, self._messages(system_prompt, self._audio_content(audio, sample_rate)))
+
+    def _messages(self, system_prompt: str, user_content) -> list:
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content},
+        ]
+
+    def _audio_content(self, audio: np.ndarray, sample_rate: int) -> list:
+        # Encoded in memory: no temp file round-trip, and overlapping turns can't clobber each other
+        encoded = prepare_upload(audio, sample_rate, self.upload_format, self.trim_silence)
+        audio_data = base64.b64encode(encoded).decode("utf-8")
+        return [
+            {
+                "type": "input_audio",
+                "input_audio": {"data": audio_data, "format": self.upload_format},
+            }
+        ]
+
+    def _stream(self, model: str, messages: list) -> Iterator[str]:
+        stream = self._client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.7,
+            stream=True,
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,77 @@
+"""
+Incremental parser for a streamed JSON array.
+"""
+import json
+
+
+class JsonArrayParser:
+    """
+    Parse a JSON array as it arrives in arbitrary chunks.
+
+    feed() returns every top-level element completed by the chunk, as soon as
+    its closing brace is seen, without waiting for the rest of the array.
+    Anything before the opening '[' or after the closing ']' (e.g. a code
+    fence the model added anyway) is ignored.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.done = False
+        self._depth = 0  # Nesting depth inside the current element
+        self._in_string = False
+        self._escape = False
+        self._element: list[str] = []
+        self._received: list[str] = []
+
+    def feed(self, chunk: str) -> list:
+        """Consume the next chunk and return the elements it completed."""
+        self._received.append(chunk)
+        elements = []
+        for ch in chunk:
+            if self.done:
+                break
+            if not self.started:
+                self.started = ch == "["
+                continue
+
+            if self._in_string:
+                self._element.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0:  # Closing bracket of the array itself
+                    self._emit(elements)
+                    self.done = True
+                    continue
+                self._depth -= 1
+                if self._depth == 0:
+                    self._element.append(ch)
+                    self._emit(elements)
+                    continue
+            elif ch == "," and self._depth == 0:
+                self._emit(elements)
+                continue
+            self._element.append(ch)
+        return elements
+
+    def finish(self) -> None:
+        """Check the array was closed; raises json.JSONDecodeError otherwise."""
+        if not self.done:
+            text = "".join(self._received)
+            raise json.JSONDecodeError("Unterminated JSON array" if self.started else "Expecting JSON array", text, len(text))
+
+    def _emit(self, elements: list) -> None:
+        text = "".join(self._element).strip()
+        self._element.clear()
+        if text:
+            elements.append(json.loads(text))
@@ -1,7 +1,7 @@
 """
 Data models for robot commands using Pydantic for validation.
 """
-from pydantic import BaseModel, Field, RootModel
+from pydantic import BaseModel, Field, RootModel, TypeAdapter
 from typing import Literal, Union, List, Annotated
 
 
@@ -23,3 +23,7 @@ Command = Annotated[Union[MovementCommand, SpeakCommand], Field(discriminator='c
 # Helper for parsing list of commands
 class CommandList(RootModel):
     root: List[Command]
+
+
+# Helper for parsing a single command (e.g. one element of a streamed response)
+CommandAdapter = TypeAdapter(Command)
@@ -0,0 +1,97 @@
+"""
+Compiles a run of movement commands into a motion timeline.
+
+Executed one at a time, every command sets the motors and then stops them,
+so "forward 1000, forward 1000" stops and restarts halfway. The compiler
+merges consecutive moves in the same direction, drops 0ms moves, goes
+straight from one move to the next without a stop in between, and only
+emits the pins whose level actually changes. The plan starts and ends with
+the motors stopped.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from lib.models import MovementCommand
+
+
+# Levels of the direction pins (Firmware's MOTOR_DIR_PINS, in order) per command
+DIRECTION_LEVELS = {
+    "forward": (0, 1, 0, 1),
+    "backward": (1, 0, 1, 0),
+    "left": (0, 1, 1, 0),
+    "right": (1, 0, 0, 1),
+}
+STOPPED_LEVELS = (0, 0, 0, 0)
+DEFAULT_DUTY = 100  # % PWM power, as Firmware.forward() & co. use by default
+
+
+@dataclass(frozen=True)
+class Move:
+    """One (possibly merged) movement: `direction` for `ms` milliseconds."""
+    direction: str
+    ms: int
+    duty: int = DEFAULT_DUTY
+
+
+@dataclass(frozen=True)
+class TimelineEvent:
+    """
+    Pin changes at `at_ms` from the start of the plan. `dir_writes` are
+    (index into MOTOR_DIR_PINS, level) pairs; `duty` is the new PWM duty of
+    both motors, or None when it doesn't change.
+    """
+    at_ms: int
+    dir_writes: tuple[tuple[int, int], ...]
+    duty: Optional[int]
+
+    @property
+    def gpio_calls(self) -> int:
+        # One group write for the direction pins, one tx_pwm per motor
+        return (1 if self.dir_writes else 0) + (2 if self.duty is not None else 0)
+
+
+@dataclass(frozen=True)
+class MotionPlan:
+    moves: tuple[Move, ...]
+    events: tuple[TimelineEvent, ...]
+
+    @property
+    def duration_ms(self) -> int:
+        return self.events[-1].at_ms if self.events else 0
+
+    @property
+    def gpio_calls(self) -> int:
+        return sum(event.gpio_calls for event in self.events)
+
+
+def merge_moves(commands: Iterable[MovementCommand]) -> list[Move]:
+    """Drop 0ms moves and merge consecutive moves in the same direction."""
+    moves: list[Move] = []
+    for command in commands:
+        if command.ms == 0:
+            continue
+        if moves and moves[-1].direction == command.command:
+            moves[-1] = Move(command.command, moves[-1].ms + command.ms)
+        else:
+            moves.append(Move(command.command, command.ms))
+    return moves
+
+
+def compile_plan(commands: Iterable[MovementCommand]) -> MotionPlan:
+    """Timeline of pin changes for a run of movement commands, starting and ending stopped."""
+    return plan_moves(merge_moves(commands))
+
+
+def plan_moves(moves: list[Move]) -> MotionPlan:
+    """Timeline of pin changes for moves played back to back, starting and ending stopped."""
+    events = []
+    levels, duty, at_ms = STOPPED_LEVELS, 0, 0
+    for move in moves + [Move("stop", 0, 0)]:
+        new_levels = DIRECTION_LEVELS.get(move.direction, STOPPED_LEVELS)
+        dir_writes = tuple((i, level) for i, (level, old) in enumerate(zip(new_levels, levels)) if level != old)
+        new_duty = move.duty if move.duty != duty else None
+        if dir_writes or new_duty is not None:
+            events.append(TimelineEvent(at_ms, dir_writes, new_duty))
+        levels, duty = new_levels, move.duty
+        at_ms += move.ms
+    return MotionPlan(tuple(moves), tuple(events))
@@ -0,0 +1,90 @@
+"""
+Shared OpenAI client with a pooled, kept-alive HTTPS connection.
+
+GPT and TextToSpeech share one client so they reuse the same connection
+pool. warm_up() opens a connection at startup, so DNS and the TLS handshake
+happen before the first command instead of during it. While the robot is
+idle listening, a background thread pings the API host often enough that
+the pooled connection isn't dropped.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import httpx
+from openai import OpenAI
+
+
+KEEPALIVE_INTERVAL_SECONDS = 20.0  # Idle time before a ping (servers and NATs drop idle connections after ~60s)
+KEEPALIVE_EXPIRY_SECONDS = 90.0  # How long the pool keeps an idle connection open on our side
+PING_TIMEOUT_SECONDS = 5.0
+MAX_CONNECTIONS = 4
+
+
+class SharedOpenAIClient:
+    """Owns the pooled HTTP client and the OpenAI client built on it."""
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, keepalive_interval: float = KEEPALIVE_INTERVAL_SECONDS):
+        self.keepalive_interval = keepalive_interval
+        self._http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            event_hooks={"request": [self._touch]},
+        )
+        self.client = OpenAI(api_key=api_key, base_url=base_url, http_client=self._http)
+        self._last_request = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.pings = 0
+
+    def _touch(self, request: httpx.Request) -> None:
+        self._last_request = time.monotonic()
+
+    def ping(self) -> bool:
+        """
+        Send a HEAD request to the API host to open or refresh a pooled connection.
+        Any HTTP response counts: only the connection matters. Returns False on network errors.
+        """
+        try:
+            self._http.head(str(self.client.base_url), timeout=PING_TIMEOUT_SECONDS)
+            self.pings += 1
+            return True
+        except httpx.HTTPError as e:
+            print(f"⚠️  OpenAI connection ping failed: {e}")
+            return False
+
+    def warm_up(self) -> None:
+        """Open the connection now so the first command doesn't pay for DNS and TLS."""
+        start = datetime.now()
+        if self.ping():
+            print(f"🔌 OpenAI connection warmed up in {(datetime.now() - start).total_seconds():.3f}s")
+
+    def start_keepalive(self) -> None:
+        """Ping in the background whenever the connection has been idle for keepalive_interval."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._keepalive, daemon=True)
+        self._thread.start()
+
+    def _keepalive(self) -> None:
+        while True:
+            idle = time.monotonic() - self._last_request
+            if self._stop.wait(max(0.0, self.keepalive_interval - idle)):
+                return
+            # A real request may have refreshed the connection while we waited
+            if time.monotonic() - self._last_request >= self.keepalive_interval:
+                self.ping()
+
+    def close(self) -> None:
+        """Stop the keep-alive thread and close pooled connections."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._http.close()
@@ -0,0 +1,78 @@
+"""
+Resident Piper TTS engine.
+
+The ONNX voice is loaded once and kept in memory; text is synthesized on a
+worker thread fed through a queue, so each utterance only pays for
+inference instead of a process start and model load.
+"""
+import queue
+import threading
+from datetime import datetime
+from typing import Iterator, Optional
+
+import numpy as np
+from piper import PiperVoice
+
+
+_DONE = object()  # End-of-utterance marker on a job's chunk queue
+
+
+class PiperEngine:
+    """
+    Keeps a Piper voice loaded and synthesizes text to float32 PCM.
+
+    stream() yields one buffer per sentence as soon as it is synthesized,
+    so playback of the first sentence can overlap synthesis of the rest.
+    """
+
+    def __init__(self, model_path: str, voice: Optional[PiperVoice] = None):
+        load_start = datetime.now()
+        self.model_path = model_path
+        self.voice = voice if voice is not None else PiperVoice.load(model_path)
+        self.sample_rate = self.voice.config.sample_rate
+        print(f"🗣️  Piper voice loaded in {(datetime.now() - load_start).total_seconds():.3f}s ({self.sample_rate} Hz)")
+
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> queue.Queue:
+        """Queue text for synthesis and return the queue its PCM buffers will arrive on."""
+        chunks = queue.Queue()
+        self._jobs.put((text, chunks))
+        return chunks
+
+    def stream(self, text: str) -> Iterator[np.ndarray]:
+        """Synthesize text, yielding float32 PCM buffers as they become ready."""
+        chunks = self.submit(text)
+        while True:
+            chunk = chunks.get()
+            if chunk is _DONE:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+    def synthesize(self, text: str) -> np.ndarray:
+        """Synthesize text into one float32 PCM buffer."""
+        buffers = list(self.stream(text))
+        return np.concatenate(buffers) if buffers else np.zeros(0, dtype=np.float32)
+
+    def close(self) -> None:
+        """Stop the worker thread once queued jobs are done."""
+        self._jobs.put(None)
+        self._thread.join()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            text, chunks = job
+            try:
+                for audio_chunk in self.voice.synthesize(text):
+                    chunks.put(audio_chunk.audio_float_array.astype(np.float32, copy=False))
+            except Exception as e:
+                chunks.put(e)
+                continue
+            chunks.put(_DONE)
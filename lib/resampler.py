@@ -0,0 +1,79 @@
+"""
+Streaming polyphase resampler.
+"""
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+from scipy import signal
+
+
+@lru_cache(maxsize=None)
+def _polyphase_filter(up: int, down: int) -> tuple[np.ndarray, int]:
+    """
+    Anti-aliasing filter for an up/down rate pair, split into its `up` phases.
+
+    Uses the same design as scipy.signal.resample_poly. Returns a (up, taps)
+    matrix where row p holds the coefficients applied for output phase p,
+    and the filter's group delay in upsampled samples.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    h = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+    taps = -(-len(h) // up)
+    h = np.concatenate([h, np.zeros(taps * up - len(h))])
+    return h.reshape(taps, up).T.astype(np.float32), half_len
+
+
+class StreamingResampler:
+    """
+    Resample a stream block by block, keeping filter state between blocks.
+
+    Each process() call returns every output sample that the input seen so far
+    fully determines, so the concatenated output matches resampling the whole
+    signal at once (apart from flush() at the very end). Filter coefficients
+    are cached per rate pair.
+    """
+
+    def __init__(self, orig_sample_rate: int, target_sample_rate: int):
+        ratio = Fraction(target_sample_rate, orig_sample_rate)
+        self.orig_sample_rate = orig_sample_rate
+        self.target_sample_rate = target_sample_rate
+        self.up = ratio.numerator
+        self.down = ratio.denominator
+        self._phases, self._delay = _polyphase_filter(self.up, self.down)
+        self._taps = self._phases.shape[1]
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the stream so far (e.g. after a gap in the input)."""
+        self._history = np.zeros(self._taps - 1, dtype=np.float32)  # Last input samples, for the filter tail
+        self._consumed = 0  # Input samples seen
+        self._produced = 0  # Output samples emitted
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Feed the next input block and return the output samples it completes."""
+        buf = np.concatenate([self._history, np.asarray(block, dtype=np.float32)])
+        consumed = self._consumed + len(block)
+
+        # Output m sits at upsampled position m * down + delay and needs input up to that position
+        end = (consumed * self.up - 1 - self._delay) // self.down + 1
+        outputs = np.arange(self._produced, max(end, self._produced))
+        positions = outputs * self.down + self._delay
+        phases = positions % self.up
+        # Index of the newest input sample each output uses, relative to buf
+        newest = positions // self.up - (self._consumed - (self._taps - 1))
+        windows = buf[newest[:, np.newaxis] - np.arange(self._taps)]
+        result = np.einsum("mk,mk->m", self._phases[phases], windows)
+
+        self._history = buf[len(buf) - (self._taps - 1):]
+        self._consumed = consumed
+        self._produced += len(outputs)
+        return result
+
+    def flush(self) -> np.ndarray:
+        """Emit the samples still held back by the filter delay, as if the input ended here."""
+        remaining = -(-self._consumed * self.up // self.down) - self._produced
+        tail = self.process(np.zeros(self._delay // self.up + 1, dtype=np.float32))[:max(0, remaining)]
+        self.reset()
+        return tail
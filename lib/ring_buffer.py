@@ -0,0 +1,57 @@
+"""
+Single-producer/single-consumer audio ring buffer with zero-copy reads.
+"""
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Preallocated float32 ring buffer addressed by absolute sample positions.
+
+    Every sample is stored twice, at i and i + capacity, so any window of up to
+    `capacity` recent samples is one contiguous slice and can be handed out as
+    a view instead of being copied or concatenated.
+
+    One thread writes (e.g. the PortAudio callback) and one thread reads.
+    No lock is needed: the producer fills the storage first and only then
+    publishes the new `written` count, so the consumer never sees samples that
+    aren't in place yet. A view stays valid until the producer has written
+    another `capacity` samples past its start.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError(f"Ring buffer capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=np.float32)
+        self.written = 0  # Total samples ever written (absolute position of the next sample)
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples (producer side). Only the last `capacity` samples of a block are kept."""
+        count = len(samples)
+        skipped = max(0, count - self.capacity)
+        samples = samples[skipped:]
+        start = (self.written + skipped) % self.capacity
+        first = min(len(samples), self.capacity - start)
+        rest = len(samples) - first
+
+        self._data[start:start + first] = samples[:first]
+        self._data[start + self.capacity:start + self.capacity + first] = samples[:first]
+        if rest:
+            self._data[:rest] = samples[first:]
+            self._data[self.capacity:self.capacity + rest] = samples[first:]
+
+        self.written += count  # Publish only once the samples are in place
+
+    def oldest(self) -> int:
+        """Absolute position of the oldest sample still available."""
+        return max(0, self.written - self.capacity)
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """Return samples [start, end) as a read-only view (consumer side)."""
+        if start < self.oldest() or end > self.written or start > end:
+            raise ValueError(f"Samples [{start}, {end}) not available (buffer holds [{self.oldest()}, {self.written}))")
+        offset = start % self.capacity
+        view = self._data[offset:offset + end - start]
+        view.flags.writeable = False
+        return view
@@ -3,19 +3,21 @@ import sys
 from datetime import datetime
 
 import numpy as np
-import soundfile
 
+from lib.debug_recorder import DebugRecorder
 from lib.firmware import Firmware
 from lib.gpt import GPT
 from lib.sources import MicrophoneSource
 from lib.tts import TextToSpeech
 from lib.sttt import SpeechToTextTranscriber
-from lib.models import MovementCommand, SpeakCommand, CommandList
+from lib.json_stream import JsonArrayParser
+from lib.models import MovementCommand, SpeakCommand, CommandList, CommandAdapter
+from lib.motion_plan import compile_plan
 from pydantic import ValidationError
 
 
 class Robot:
-    def __init__(self, tts: TextToSpeech, system_prompt: str, source: MicrophoneSource, gpt: GPT, firmware: Firmware, transcriber: SpeechToTextTranscriber | None = None, stt: str = "openai"):
+    def __init__(self, tts: TextToSpeech, system_prompt: str, source: MicrophoneSource, gpt: GPT, firmware: Firmware, transcriber: SpeechToTextTranscriber | None = None, stt: str = "openai", streaming: bool = False, stream_llm: bool = False, debug_recorder: DebugRecorder | None = None):
         self.tts = tts
         self.system_prompt = system_prompt
         self.source = source
@@ -23,21 +25,71 @@ class Robot:
         self.gpt = gpt
         self.firmware = firmware
         self.transcriber = transcriber
+        self.streaming = streaming
+        self.stream_llm = stream_llm
+        self.debug_recorder = debug_recorder
 
     def run(self) -> None:
-        match self.stt:
-            case "openai":
-                print("☁️  Cloud transcription mode (GPT-4o Audio)")
-                for audio, sample_rate in self.source:
-                    audio_path = '/tmp/robot_command.wav'
-                    soundfile.write(audio_path, audio, sample_rate)
-                    self._call_gpt("🎤 Sending audio to GPT...", lambda: self.gpt.chat_with_audio(self.system_prompt, audio_path))
-            case "whisper":
-                print("🖥️  Local transcription mode (Whisper)")
-                for audio, sr in self.source:
-                    text = self.transcriber.transcribe(audio, sr)
-                    if text:
-                        self._call_gpt(f"🎤 Transcribed: {text}", lambda: self.gpt.chat(self.system_prompt, text))
+        try:
+            match self.stt:
+                case "openai":
+                    print("☁️  Cloud transcription mode (GPT-4o Audio)")
+                    for audio, sample_rate in self.source:
+                        self._record(audio, sample_rate)
+                        self._chat_with_audio(audio, sample_rate)
+                case "whisper":
+                    print("🖥️  Local transcription mode (Whisper)")
+                    if self.streaming:
+                        self._run_streaming_whisper()
+                        return
+                    for audio, sr in self.source:
+                        self._record(audio, sr)
+                        text = self.transcriber.transcribe(audio, sr)
+                        if text:
+                            self._chat(text)
+        finally:
+            # Don't leave a sentence playing on the way out (e.g. Ctrl+C mid-speech)
+            self.tts.stop()
+
+    def _run_streaming_whisper(self) -> None:
+        """Transcribe while the user is still speaking, so only the tail is left at end of speech."""
+        stream, fed = None, None
+        for audio, sr, final in self.source.stream():
+            # Each partial extends the previous one. Anything else belongs to another
+            # utterance (the previous one was dropped when a speak command paused the
+            # source), so the text committed so far must not carry over.
+            if stream is not None and not np.array_equal(audio[:len(fed)], fed):
+                print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] ⚠️  Partial utterance dropped, restarting transcription")
+                stream = None
+            if stream is None:
+                stream = self.transcriber.start_stream(sr)
+            if not final:
+                stream.feed(audio)
+                fed = audio
+                continue
+            self._record(audio, sr)
+            text = stream.finish(audio)
+            stream = None
+            if text:
+                self._chat(text)
+
+    def _record(self, audio: np.ndarray, sample_rate: int) -> None:
+        if self.debug_recorder is not None:
+            self.debug_recorder.record(audio, sample_rate)
+
+    def _chat(self, text: str) -> None:
+        label = f"🎤 Transcribed: {text}"
+        if self.stream_llm:
+            self._call_gpt_stream(label, lambda: self.gpt.chat_stream(self.system_prompt, text))
+        else:
+            self._call_gpt(label, lambda: self.gpt.chat(self.system_prompt, text))
+
+    def _chat_with_audio(self, audio: np.ndarray, sample_rate: int) -> None:
+        label = "🎤 Sending audio to GPT..."
+        if self.stream_llm:
+            self._call_gpt_stream(label, lambda: self.gpt.chat_with_audio_stream(self.system_prompt, audio, sample_rate))
+        else:
+            self._call_gpt(label, lambda: self.gpt.chat_with_audio(self.system_prompt, audio, sample_rate))
 
     def _call_gpt(self, label: str, gpt_fn) -> None:
         try:
@@ -50,17 +102,52 @@ class Robot:
         except Exception as e:
             print(f"❌ Chat error: {e}", file=sys.stderr)
 
+    def _call_gpt_stream(self, label: str, stream_fn) -> None:
+        """
+        Execute each command as soon as its JSON object is complete in the
+        streamed response, instead of waiting for the whole array.
+        """
+        try:
+            print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] {label}")
+            start = datetime.now()
+            parser = JsonArrayParser()
+            count = 0
+            for i, delta in enumerate(stream_fn()):
+                if i == 0:
+                    self.firmware.clear()  # The new response replaces whatever is still queued
+                for item in parser.feed(delta):
+                    cmd = CommandAdapter.validate_python(item)
+                    if count == 0:
+                        now = datetime.now()
+                        print(f"[{now.strftime('%H:%M:%S.%f')[:-3]}] 🤖 First command after {(now - start).total_seconds():.2f}s")
+                    count += 1
+                    self._log_and_execute(cmd)
+            parser.finish()
+            end = datetime.now()
+            print(f"[{end.strftime('%H:%M:%S.%f')[:-3]}] 🤖 GPT response done: {count} action(s) (took {(end - start).total_seconds():.2f}s)")
+        except json.JSONDecodeError as e:
+            print(f"❌ Invalid JSON response: {e}", file=sys.stderr)
+        except ValidationError as e:
+            print(f"❌ Invalid command format: {e}", file=sys.stderr)
+        except Exception as e:
+            print(f"❌ Chat error: {e}", file=sys.stderr)
+
     def _handle_response(self, response: str) -> None:
         self.firmware.clear()
         try:
             commands = CommandList(root=json.loads(response)).root
             print(f"🤖 Robot commands: {len(commands)} action(s)")
+            # Runs of moves between speak commands are compiled into one motion plan
+            moves = []
             for cmd in commands:
+                self._log(cmd)
                 if isinstance(cmd, MovementCommand):
-                    print(f"  → {cmd.command}: {cmd.ms}ms")
-                elif isinstance(cmd, SpeakCommand):
-                    print(f"  → speak: {cmd.body}")
+                    moves.append(cmd)
+                    continue
+                self._run_moves(moves)
+                moves = []
                 self._execute(cmd)
+            self._run_moves(moves)
         except json.JSONDecodeError as e:
             print(f"❌ Invalid JSON response: {e}", file=sys.stderr)
         except ValidationError as e:
@@ -68,6 +155,21 @@ class Robot:
         except Exception as e:
             print(f"❌ Command execution error: {e}", file=sys.stderr)
 
+    def _log(self, cmd) -> None:
+        if isinstance(cmd, MovementCommand):
+            print(f"  → {cmd.command}: {cmd.ms}ms")
+        elif isinstance(cmd, SpeakCommand):
+            print(f"  → speak: {cmd.body}")
+
+    def _log_and_execute(self, cmd) -> None:
+        self._log(cmd)
+        self._execute(cmd)
+
+    def _run_moves(self, moves: list[MovementCommand]) -> None:
+        plan = compile_plan(moves)
+        if plan.events:
+            self.firmware.run_plan(plan)
+
     def _execute(self, cmd) -> None:
         if isinstance(cmd, MovementCommand):
             sec = cmd.ms / 1000.0
@@ -1,10 +1,17 @@
+import asyncio
+import json
 import queue
 import threading
-from typing import Iterator
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator, Optional
 
 import numpy as np
+import soundfile as sf
 
-from .audio_capture import AudioCapture, VAD_THRESHOLD
+from .audio_capture import AudioCapture, AudioStream, SpeechSegmenter, VAD_THRESHOLD, BLOCK_MS, SAMPLE_RATE
+from .clock import Clock, MonotonicClock
+
+AUDIO_FILE_EXTENSIONS = (".wav", ".flac")
 
 
 class MicrophoneSource:
@@ -13,32 +20,210 @@ class MicrophoneSource:
     Yields (audio: np.ndarray, sample_rate: int) tuples — one per speech segment.
     Supports pause()/resume() for TTS feedback prevention.
 
-    A future FileSource can replace this as a drop-in.
+    stream() additionally yields partial audio while the user is still speaking.
+    `async for` and astream() are the asyncio equivalents.
+
+    FileSource and CorpusSource can replace this as a drop-in.
     """
 
-    def __init__(self, vad_threshold: float = VAD_THRESHOLD):
-        self._capture = AudioCapture(vad_threshold)
+    def __init__(self, vad_threshold: float = VAD_THRESHOLD, vad_scorer=None, device_cache=None):
+        self._capture = AudioCapture(vad_threshold, vad_scorer, device_cache)
         self._queue: queue.Queue = queue.Queue()
         self._thread: threading.Thread | None = None
+        self._partials = False  # Iteration mode the capture thread was started for
 
     def pause(self):
         self._capture.pause()
 
     def resume(self):
+        # Pausing dropped the utterance in progress, so its queued partials lead nowhere
+        self._drop_partials()
         self._capture.resume()
 
+    def _drop_partials(self) -> None:
+        """Remove queued partials, keeping complete utterances in order."""
+        with self._queue.mutex:
+            finals = [item for item in self._queue.queue if item[2]]
+            self._queue.queue.clear()
+            self._queue.queue.extend(finals)
+
     def __iter__(self) -> Iterator[tuple[np.ndarray, int]]:
-        if self._thread is None:
-            self._thread = threading.Thread(
-                target=self._capture.capture,
-                args=(lambda audio, sr: self._queue.put((audio, sr)),),
-                daemon=True,
-            )
-            self._thread.start()
+        self._start(partials=False)
+        while True:
+            audio, sr, _ = self._get()
+            yield audio, sr
+
+    def stream(self) -> Iterator[tuple[np.ndarray, int, bool]]:
+        """
+        Yield (audio, sample_rate, final) tuples.
+
+        While voice is active, partial tuples (final=False) carry the utterance
+        captured so far; the final tuple carries the complete segment.
+        Partials already superseded by a newer one are dropped, so a slow
+        consumer always works on the freshest audio.
+        """
+        self._start(partials=True)
+        while True:
+            item = self._get()
+            while not item[2]:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            yield item
+
+    async def __aiter__(self) -> AsyncIterator[tuple[np.ndarray, int]]:
+        async for audio, sr, _ in self._aiter(partials=False):
+            yield audio, sr
+
+    async def astream(self) -> AsyncIterator[tuple[np.ndarray, int, bool]]:
+        """asyncio version of stream()."""
+        async for item in self._aiter(partials=True):
+            yield item
+
+    async def _aiter(self, partials: bool) -> AsyncIterator[tuple[np.ndarray, int, bool]]:
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+        self._start(partials, put=lambda item: loop.call_soon_threadsafe(items.put_nowait, item))
+        while True:
+            try:
+                item = await asyncio.wait_for(items.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                if not self._thread.is_alive():
+                    raise RuntimeError("Audio capture thread died unexpectedly")
+                continue
+            while not item[2] and not items.empty():
+                item = items.get_nowait()
+            yield item
+
+    def _start(self, partials: bool, put: Callable[[tuple[np.ndarray, int, bool]], None] | None = None) -> None:
+        if self._thread is not None:
+            # Sync iterators of the same mode share self._queue; anything else would never see an item
+            if put is None and partials == self._partials and self._thread.is_alive():
+                return
+            raise RuntimeError("MicrophoneSource is already being iterated in another mode")
+        self._partials = partials
+        put = put or self._queue.put
+        self._thread = threading.Thread(
+            target=self._capture.capture,
+            args=(lambda audio, sr: put((audio, sr, True)),),
+            kwargs={"partial_callback": (lambda audio, sr: put((audio, sr, False))) if partials else None},
+            daemon=True,
+        )
+        self._thread.start()
 
+    def _get(self) -> tuple[np.ndarray, int, bool]:
         while True:
             try:
-                yield self._queue.get(timeout=1.0)
+                return self._queue.get(timeout=1.0)
             except queue.Empty:
                 if not self._thread.is_alive():
                     raise RuntimeError("Audio capture thread died unexpectedly")
+
+
+class FileSource:
+    """
+    Iterable audio source backed by audio files (WAV/FLAC).
+    Yields (audio: np.ndarray, sample_rate: int) tuples like MicrophoneSource.
+
+    By default each file is cut into speech segments by the same ring buffer,
+    resampler, VAD and preprocessing as live capture, so replays exercise the
+    whole front end; with segment=False every file is yielded whole (still
+    preprocessed to 16kHz mono). With realtime=True audio is paced like a live
+    microphone (on `clock`, real time by default), otherwise it is delivered
+    as fast as possible.
+
+    pause()/resume() are accepted for compatibility; a file can't hear the TTS.
+    """
+
+    def __init__(
+        self,
+        paths: str | Path | list[str | Path],
+        segment: bool = True,
+        realtime: bool = False,
+        vad_threshold: float = VAD_THRESHOLD,
+        vad_scorer=None,
+        clock: Optional[Clock] = None,
+    ):
+        self.paths = [Path(p) for p in ([paths] if isinstance(paths, (str, Path)) else paths)]
+        self.segment = segment
+        self.realtime = realtime
+        self.clock = clock if clock is not None else MonotonicClock()
+        self._capture = AudioCapture(vad_threshold, vad_scorer)
+
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def __iter__(self) -> Iterator[tuple[np.ndarray, int]]:
+        for audio, sr, _ in self._iterate(partials=False):
+            yield audio, sr
+
+    def stream(self) -> Iterator[tuple[np.ndarray, int, bool]]:
+        """Yield (audio, sample_rate, final) tuples like MicrophoneSource.stream()."""
+        yield from self._iterate(partials=True)
+
+    def _iterate(self, partials: bool) -> Iterator[tuple[np.ndarray, int, bool]]:
+        for path in self.paths:
+            audio, sample_rate = sf.read(path, dtype="float32", always_2d=True)
+            if self.segment:
+                yield from self._segments(audio, sample_rate, partials)
+            else:
+                if self.realtime:
+                    self.clock.sleep(len(audio) / sample_rate)
+                yield self._capture._preprocess_audio(audio, sample_rate), SAMPLE_RATE, True
+
+    def _segments(self, audio: np.ndarray, sample_rate: int, partials: bool) -> Iterator[tuple[np.ndarray, int, bool]]:
+        ready: list[tuple[np.ndarray, int, bool]] = []
+        audio_stream = AudioStream(sample_rate)
+        segmenter = SpeechSegmenter(
+            self._capture,
+            lambda a, sr: ready.append((a, sr, True)),
+            (lambda a, sr: ready.append((a, sr, False))) if partials else None,
+        )
+
+        block_size = int(sample_rate * BLOCK_MS / 1000)
+        start = self.clock.now()
+        for offset in range(0, len(audio), block_size):
+            if self.realtime:
+                # Hold each block back until a microphone would have delivered it
+                self.clock.sleep(start + (offset + block_size) / sample_rate - self.clock.now())
+            audio_stream.write(self._capture._ensure_mono(audio[offset:offset + block_size]))
+            while segmenter.process(audio_stream):
+                pass
+            yield from ready
+            ready.clear()
+
+        segmenter.finish(audio_stream)
+        yield from ready
+
+
+class CorpusSource(FileSource):
+    """
+    FileSource over a corpus of recorded commands.
+
+    `corpus` is either a directory (every .wav/.flac below it, sorted) or a
+    JSONL manifest with one {"path": ..., "text": ...} object per line, paths
+    relative to the manifest. Reference texts are kept in `transcripts`.
+    """
+
+    def __init__(self, corpus: str | Path, **kwargs):
+        corpus = Path(corpus)
+        self.transcripts: dict[Path, str] = {}
+        if corpus.is_dir():
+            paths = sorted(p for p in corpus.rglob("*") if p.suffix.lower() in AUDIO_FILE_EXTENSIONS)
+        else:
+            paths = []
+            for line in corpus.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                path = corpus.parent / entry["path"]
+                paths.append(path)
+                if "text" in entry:
+                    self.transcripts[path] = entry["text"]
+        if not paths:
+            raise ValueError(f"No audio files found in corpus: {corpus}")
+        super().__init__(paths, **kwargs)
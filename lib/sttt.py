@@ -1,53 +1,197 @@
+import dataclasses
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
 import numpy as np
-import soundfile as sf
 from faster_whisper import WhisperModel
 
-from .audio_capture import VAD_THRESHOLD
+
+STREAM_MIN_WINDOW_SECONDS = 1.0  # Don't decode partial windows shorter than this
+STREAM_COMMIT_MARGIN_SECONDS = 1.0  # Segments ending this close to the window edge may still change
+COMPUTE_TYPES = ("int8", "int8_float32")
+
+
+@dataclass(frozen=True)
+class WhisperProfile:
+    """Whisper model and CPU settings."""
+    model: str
+    compute_type: str = "int8"  # Faster on CPU, especially Raspberry Pi
+    cpu_threads: int = 4  # Use all 4 cores of Raspberry Pi 5
+    num_workers: int = 1
+
+
+WHISPER_PROFILES = {
+    "tiny": WhisperProfile("tiny"),
+    "base": WhisperProfile("base"),
+    "small": WhisperProfile("small"),  # Best balance of speed/accuracy for Raspberry Pi 5
+    "distil": WhisperProfile("distil-small.en"),  # English only
+}
+DEFAULT_WHISPER_PROFILE = "small"
+
+
+def get_whisper_profile(name: str = DEFAULT_WHISPER_PROFILE, compute_type: Optional[str] = None, cpu_threads: Optional[int] = None) -> WhisperProfile:
+    """Look up a profile by name, optionally overriding its compute type and thread count."""
+    if name not in WHISPER_PROFILES:
+        raise ValueError(f"Unknown Whisper profile: {name}. Choose one of {', '.join(WHISPER_PROFILES)}")
+    if compute_type is not None and compute_type not in COMPUTE_TYPES:
+        raise ValueError(f"Unsupported compute type: {compute_type}. Choose one of {', '.join(COMPUTE_TYPES)}")
+    overrides = {}
+    if compute_type is not None:
+        overrides["compute_type"] = compute_type
+    if cpu_threads is not None:
+        overrides["cpu_threads"] = cpu_threads
+    return dataclasses.replace(WHISPER_PROFILES[name], **overrides)
+
+
+WARMUP_SECONDS = 1.0  # Silent audio decoded once after loading, so the first utterance doesn't pay first-call costs
 
 
 class SpeechToTextTranscriber:
     """
     Transcription service using local Whisper.
     Receives audio data and returns transcribed text.
-    Uses "small" model (best balance of speed/accuracy for Raspberry Pi 5).
+    Uses the "small" profile unless another WhisperProfile is given.
+
+    The model loads (and warms up) on a background thread so capture can start
+    right away; the first transcription waits for it if it isn't ready yet.
     """
 
-    def __init__(self, language: str):
+    def __init__(self, language: str, warm_up: bool = True, profile: Optional[WhisperProfile] = None):
         self.language = language
-        self.model = self._create_whisper_model()
-        print(f"Initialized SpeechToTextTranscriber with model: small, language: {language}")
+        self.warm_up = warm_up
+        self.profile = profile if profile is not None else get_whisper_profile()
+        loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper-load")
+        self._model_future = loader.submit(self._load_model)
+        loader.shutdown(wait=False)
+        print(f"Initialized SpeechToTextTranscriber with model: {self.profile.model}, language: {language} (loading in background)")
+
+    @property
+    def ready(self) -> bool:
+        """True once the model has loaded (or failed to)."""
+        return self._model_future.done()
+
+    @property
+    def model(self) -> WhisperModel:
+        """The loaded model, waiting for the background load if needed."""
+        if not self._model_future.done():
+            wait_start = datetime.now()
+            print(f"[{wait_start.strftime('%H:%M:%S.%f')[:-3]}] ⏳ Waiting for Whisper model to finish loading...")
+            model = self._model_future.result()
+            print(f"Waited {(datetime.now() - wait_start).total_seconds():.2f}s for Whisper model")
+            return model
+        return self._model_future.result()
+
+    def _load_model(self) -> WhisperModel:
+        load_start = datetime.now()
+        model = self._create_whisper_model()
+        print(f"Whisper model loaded in {(datetime.now() - load_start).total_seconds():.2f}s")
+        if self.warm_up:
+            self._warm_up(model)
+        return model
+
+    def _warm_up(self, model: WhisperModel) -> None:
+        """Decode a short silent buffer so the first real utterance runs on a warm model."""
+        warm_start = datetime.now()
+        try:
+            segments, _ = model.transcribe(
+                np.zeros(int(WARMUP_SECONDS * 16000), dtype=np.float32),
+                beam_size=1,
+                vad_filter=False,
+                language=self.language
+            )
+            list(segments)
+        except Exception as e:
+            print(f"Whisper warm-up failed: {e}", file=sys.stderr)
+            return
+        print(f"Whisper warm-up took {(datetime.now() - warm_start).total_seconds():.2f}s")
 
     def _create_whisper_model(self) -> WhisperModel:
-        print("Loading Whisper model: small...")
+        profile = self.profile
+        print(f"Loading Whisper model: {profile.model} ({profile.compute_type}, {profile.cpu_threads} threads)...")
         return WhisperModel(
-            "small",
+            profile.model,
             device="cpu",
-            compute_type="int8",  # Faster on CPU, especially Raspberry Pi
-            cpu_threads=4,  # Use all 4 cores of Raspberry Pi 5
-            num_workers=1
+            compute_type=profile.compute_type,
+            cpu_threads=profile.cpu_threads,
+            num_workers=profile.num_workers
         )
 
+    def _decode(self, audio: np.ndarray) -> list:
+        """Run Whisper over audio and return its segments (timestamps relative to audio start)."""
+        segments, _ = self.model.transcribe(
+            audio,
+            beam_size=1,
+            vad_filter=False,
+            language=self.language
+        )
+        return list(segments)
+
     def transcribe(self, audio: np.ndarray, sample_rate: int) -> Optional[str]:
         """Transcribe audio and return text, or None if nothing detected."""
-        sf.write('/tmp/debug_audio.wav', audio, sample_rate)
-        print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Saved debug audio to /tmp/debug_audio.wav (shape: {audio.shape}, min: {audio.min():.4f}, max: {audio.max():.4f})")
-
         try:
             transcribe_start = datetime.now()
-            segments, _ = self.model.transcribe(
-                audio,
-                beam_size=1,
-                vad_filter=False,
-                language=self.language
-            )
-            text = "".join(s.text for s in segments).strip()
+            text = "".join(s.text for s in self._decode(audio)).strip()
             transcribe_end = datetime.now()
             print(f"[{transcribe_end.strftime('%H:%M:%S.%f')[:-3]}] Transcription took {(transcribe_end - transcribe_start).total_seconds():.2f}s")
             return text if text else None
         except Exception as e:
             print(f"Transcription error: {e}", file=sys.stderr)
             return None
+
+    def start_stream(self, sample_rate: int) -> "TranscriptionStream":
+        """Begin incremental transcription of a single utterance."""
+        return TranscriptionStream(self, sample_rate)
+
+
+class TranscriptionStream:
+    """
+    Incremental transcription of one utterance on a sliding window.
+
+    feed() is called with the utterance captured so far. The uncommitted tail
+    is decoded, and every segment that ends well before the window edge is
+    committed: its text is kept and its audio is dropped from the window.
+    finish() then only has to decode what is left since the last commit.
+    """
+
+    def __init__(self, transcriber: SpeechToTextTranscriber, sample_rate: int):
+        self._transcriber = transcriber
+        self.sample_rate = sample_rate
+        self._committed: list[str] = []
+        self._committed_samples = 0
+
+    def feed(self, audio: np.ndarray) -> None:
+        """Decode the uncommitted part of a partial utterance and commit stable segments."""
+        window = audio[self._committed_samples:]
+        window_seconds = len(window) / self.sample_rate
+        if window_seconds < STREAM_MIN_WINDOW_SECONDS:
+            return
+
+        try:
+            start = datetime.now()
+            segments = self._transcriber._decode(window)
+        except Exception as e:
+            print(f"Partial transcription error: {e}", file=sys.stderr)
+            return
+
+        # The last segment may still grow as more audio arrives, never commit it
+        committed_end = 0.0
+        for segment in segments[:-1]:
+            if segment.end > window_seconds - STREAM_COMMIT_MARGIN_SECONDS:
+                break
+            self._committed.append(segment.text)
+            committed_end = segment.end
+        self._committed_samples += int(committed_end * self.sample_rate)
+
+        end = datetime.now()
+        print(f"[{end.strftime('%H:%M:%S.%f')[:-3]}] Partial transcription of {window_seconds:.2f}s took {(end - start).total_seconds():.2f}s (committed: {''.join(self._committed).strip()!r})")
+
+    def finish(self, audio: np.ndarray) -> Optional[str]:
+        """Decode the remaining tail of the complete utterance and return the full text."""
+        tail = audio[self._committed_samples:]
+        print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] Finishing transcription ({len(tail) / self.sample_rate:.2f}s of {len(audio) / self.sample_rate:.2f}s left to decode)")
+        tail_text = self._transcriber.transcribe(tail, self.sample_rate) if len(tail) else None
+        text = "".join(self._committed + [" " + tail_text if tail_text else ""]).strip()
+        return text if text else None
@@ -1,94 +1,155 @@
 """
 Text-to-Speech module supporting both OpenAI TTS API and local Piper TTS
 """
-import subprocess
-from pathlib import Path
+import queue
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from openai import OpenAI
 import os
-from typing import Optional
+from typing import Iterator, Optional
+
+import numpy as np
 from .audio_device import get_audio_device
+from .audio_output import AudioOutput, decode_pcm16
+from .device_cache import DeviceCache
+from .piper_engine import PiperEngine
+from .tts_cache import TTSCache, cache_key
 
 
 PIPER_MODEL_PATH = os.path.expanduser("~/piper-voices/en_US-lessac-medium.onnx")
+OPENAI_TTS_MODEL = "tts-1"
+OPENAI_TTS_SAMPLE_RATE = 24000  # response_format="pcm" is 24 kHz 16-bit mono
+STREAM_CHUNK_BYTES = 4096  # ~85ms of 24 kHz PCM
+SYNTHESIS_WORKERS = 2  # Sentences synthesized ahead of playback at once
+MIN_CHUNK_CHARS = 20  # Shorter sentences are merged with the next one so prosody isn't choppy
+MAX_CHUNK_CHARS = 150  # Longer sentences are split at clause boundaries
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentence-sized chunks for pipelined synthesis."""
+    chunks = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if len(sentence) > MAX_CHUNK_CHARS:
+            chunks.extend(_CLAUSE_END.split(sentence))
+        elif sentence:
+            chunks.append(sentence)
+
+    merged = []
+    for chunk in chunks:
+        if merged and len(merged[-1]) < MIN_CHUNK_CHARS:
+            merged[-1] = f"{merged[-1]} {chunk}"
+        else:
+            merged.append(chunk)
+    return merged
 
 
 class TextToSpeech:
-    """Text-to-Speech service with pluggable backends"""
+    """
+    Text-to-Speech service with pluggable backends.
+
+    Text is split into sentences that are synthesized on a small worker
+    pool, while a playback thread plays them in order as one continuous
+    stream, so only the first sentence's synthesis delays the speech.
+    """
 
-    def __init__(self, backend: str = "piper", api_key: Optional[str] = None):
+    def __init__(self, backend: str = "piper", api_key: Optional[str] = None, client: Optional[OpenAI] = None, output: Optional[AudioOutput] = None, piper: Optional[PiperEngine] = None, cache: Optional[TTSCache] = None, device_cache: Optional[DeviceCache] = None):
         if backend not in ["piper", "openai"]:
             raise ValueError(f"Unknown TTS backend: {backend}. Choose 'piper' or 'openai'")
 
         self.backend = backend
-        self.audio_device = get_audio_device()
-        self._client = OpenAI(api_key=api_key) if backend == "openai" else None
+        self.audio_device = get_audio_device(device_cache)
+        self.output = output if output is not None else AudioOutput(self.audio_device)
+        self.cache = cache
+        self._piper = None
+        if backend == "piper":
+            self._piper = piper if piper is not None else PiperEngine(PIPER_MODEL_PATH)
+        self._client = None
+        if backend == "openai":
+            self._client = client if client is not None else OpenAI(api_key=api_key)
+
+        self._synthesis_pool = ThreadPoolExecutor(max_workers=SYNTHESIS_WORKERS, thread_name_prefix="tts-synthesis")
+        self._playback_jobs = queue.Queue()
+        self._playback_thread = threading.Thread(target=self._playback_worker, daemon=True)
+        self._playback_thread.start()
         print(f"🗣️  TTS initialized: {backend} backend, audio device {self.audio_device}")
 
-    def _speak_piper(self, text: str) -> None:
-        """Generate speech using local Piper TTS"""
-        from datetime import datetime
+    @property
+    def sample_rate(self) -> int:
+        return self._piper.sample_rate if self.backend == "piper" else OPENAI_TTS_SAMPLE_RATE
 
-        speech_file = Path("/tmp/robot_speech.wav")
+    def _cache_key(self, text: str, voice: str) -> str:
+        if self.backend == "piper":
+            return cache_key("piper", None, os.path.basename(self._piper.model_path), text)
+        return cache_key("openai", voice, OPENAI_TTS_MODEL, text)
 
+    def _backend_blocks(self, text: str, voice: str) -> Iterator[np.ndarray]:
+        """Float32 blocks for one chunk of text, as the backend produces them."""
+        if self.backend == "piper":
+            yield from self._piper.stream(text)
+            return
+        with self._client.audio.speech.with_streaming_response.create(
+            model=OPENAI_TTS_MODEL,
+            voice=voice,
+            input=text,
+            response_format="pcm"
+        ) as response:
+            yield from decode_pcm16(response.iter_bytes(STREAM_CHUNK_BYTES))
+
+    def _synthesize(self, text: str, voice: str, blocks: queue.Queue) -> None:
+        """Pool job: put one chunk's audio on `blocks` as it is synthesized, then None."""
         try:
-            # Generate speech with Piper
-            gen_start = datetime.now()
-            with open(speech_file, "wb") as f:
-                subprocess.run(
-                    ["piper", "--model", PIPER_MODEL_PATH, "--output_file", "-"],
-                    input=text.encode("utf-8"),
-                    stdout=f,
-                    check=True,
-                    stderr=subprocess.PIPE
-                )
-            gen_end = datetime.now()
-            gen_time = (gen_end - gen_start).total_seconds()
-            print(f"⏱️  Piper generation: {gen_time:.3f}s")
-
-            # Play audio
-            play_start = datetime.now()
-            subprocess.run(
-                ["aplay", "-D", f"plughw:{self.audio_device},0", str(speech_file)],
-                check=True,
-                capture_output=True
-            )
-            play_end = datetime.now()
-            play_time = (play_end - play_start).total_seconds()
-            total_time = (play_end - gen_start).total_seconds()
-            print(f"⏱️  Audio playback: {play_time:.3f}s")
-            print(f"⏱️  Total TTS time: {total_time:.3f}s")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Piper TTS error: {e}")
-            print(f"   stderr: {e.stderr.decode() if e.stderr else 'N/A'}")
-
-    def _speak_openai(self, text: str, voice: str = "alloy") -> None:
-        """Generate speech using OpenAI TTS API"""
-        try:
-            response = self._client.audio.speech.create(
-                model="tts-1",
-                voice=voice,
-                input=text,
-                response_format="wav"
-            )
-
-            speech_file = Path("/tmp/robot_speech.wav")
-            response.stream_to_file(speech_file)
-
-            # Play using aplay to specific device
-            subprocess.run(
-                ["aplay", "-D", f"plughw:{self.audio_device},0", str(speech_file)],
-                check=True,
-                capture_output=True
-            )
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Audio playback error: {e}")
-            print(f"   stderr: {e.stderr.decode() if e.stderr else 'N/A'}")
+            key = self._cache_key(text, voice) if self.cache is not None else None
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                print(f"💾 TTS cache hit ({self.cache.hits} hits, {self.cache.misses} misses): {text}")
+                blocks.put(cached[0])
+            else:
+                recorded = []
+                for block in self._backend_blocks(text, voice):
+                    recorded.append(block)
+                    blocks.put(block)
+                if self.cache is not None and recorded:
+                    self.cache.put(key, np.concatenate(recorded), self.sample_rate)
         except Exception as e:
-            print(f"❌ OpenAI TTS error: {e}")
+            blocks.put(e)
+            return
+        blocks.put(None)
+
+    def _in_order(self, chunk_queues: list[queue.Queue], start: datetime) -> Iterator[np.ndarray]:
+        """Yield every chunk's blocks in sentence order, raising the first synthesis error."""
+        first = True
+        for blocks in chunk_queues:
+            while (block := blocks.get()) is not None:
+                if isinstance(block, Exception):
+                    raise block
+                if first:
+                    print(f"⏱️  First audio: {(datetime.now() - start).total_seconds():.3f}s")
+                    first = False
+                yield block
+
+    def _playback_worker(self) -> None:
+        while True:
+            blocks, sample_rate, done = self._playback_jobs.get()
+            if not done.set_running_or_notify_cancel():
+                continue
+            try:
+                done.set_result(self.output.play(blocks, sample_rate))
+            except Exception as e:
+                done.set_exception(e)
+
+    def stop(self) -> None:
+        """Cut off any speech that is playing or queued."""
+        self.output.cancel()
 
     def speak(self, text: str, voice: str = "alloy") -> None:
         """
         Convert text to speech and play it through the speaker.
+        Returns once playback has finished.
 
         Args:
             text: Text to convert to speech
@@ -100,13 +161,18 @@ class TextToSpeech:
 
         print(f"🗣️  Speaking ({self.backend}): {text}")
 
+        start = datetime.now()
+        chunks = split_sentences(text)
+        chunk_queues = [queue.Queue() for _ in chunks]
+        jobs = [self._synthesis_pool.submit(self._synthesize, chunk, voice, blocks) for chunk, blocks in zip(chunks, chunk_queues)]
+        done = Future()
+        self._playback_jobs.put((self._in_order(chunk_queues, start), self.sample_rate, done))
         try:
-            if self.backend == "piper":
-                self._speak_piper(text)
-            elif self.backend == "openai":
-                self._speak_openai(text, voice)
-
+            done.result()
+            print(f"⏱️  Total TTS time: {(datetime.now() - start).total_seconds():.3f}s ({len(chunks)} chunk(s))")
             print("✅ Speech playback complete")
-
         except Exception as e:
             print(f"❌ TTS error: {e}")
+        finally:
+            for job in jobs:
+                job.cancel()  # Sentences not started yet after an error
@@ -0,0 +1,150 @@
+"""
+Content-addressed cache of synthesized speech.
+
+Clips are keyed on a hash of (backend, voice, model, text). Recently used
+clips stay in a byte-bounded in-memory LRU; every clip is also written as
+16-bit WAV to a size-capped directory, where the least recently used files
+are evicted first.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "junior" / "tts"
+DEFAULT_MEMORY_BYTES = 16 * 1024 * 1024  # ~3 minutes of 24 kHz float32 audio
+DEFAULT_DISK_BYTES = 200 * 1024 * 1024
+
+
+def cache_key(backend: str, voice: Optional[str], model: str, text: str) -> str:
+    """Stable key for one synthesized phrase."""
+    return hashlib.sha256(json.dumps([backend, voice, model, text]).encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """In-memory LRU of float32 clips, backed by a size-capped on-disk store."""
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, memory_bytes: int = DEFAULT_MEMORY_BYTES, disk_bytes: int = DEFAULT_DISK_BYTES):
+        self.directory = Path(directory)
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, tuple[np.ndarray, int]] = OrderedDict()
+        self._memory_used = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()  # Key -> file size, least recently used first
+        self._disk_used = 0
+        self._touched: set[str] = set()  # Keys whose file mtime was refreshed by this process
+        self._load_index()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.wav"
+
+    def _load_index(self) -> None:
+        """Index existing files, oldest modification time first."""
+        if self.disk_bytes <= 0 or not self.directory.is_dir():
+            return
+        files = sorted(self.directory.glob("*.wav"), key=lambda path: path.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._disk[path.stem] = size
+            self._disk_used += size
+
+    def get(self, key: str) -> Optional[tuple[np.ndarray, int]]:
+        """Return (audio, sample_rate) for a cached phrase, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._touch(key)
+                self.hits += 1
+                return self._memory[key]
+
+            if key in self._disk:
+                try:
+                    audio, sample_rate = sf.read(self._path(key), dtype="float32")
+                except (OSError, RuntimeError):  # Deleted or corrupt file: forget it
+                    self._disk_used -= self._disk.pop(key)
+                else:
+                    self._touch(key)
+                    self._remember(key, audio, sample_rate)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return audio, sample_rate
+
+            self.misses += 1
+            return None
+
+    def _touch(self, key: str) -> None:
+        """
+        Mark a phrase as used on disk too, so phrases only ever served from
+        memory aren't evicted first. The file's mtime carries the recency over
+        to the next run; it is refreshed once per key per process.
+        """
+        if key not in self._disk:
+            return
+        self._disk.move_to_end(key)
+        if key not in self._touched:
+            self._touched.add(key)
+            try:
+                os.utime(self._path(key))
+            except OSError:
+                pass
+
+    def put(self, key: str, audio: np.ndarray, sample_rate: int) -> None:
+        """Store a synthesized phrase in memory and on disk."""
+        audio = np.asarray(audio, dtype=np.float32)
+        with self._lock:
+            self._remember(key, audio, sample_rate)
+            if self.disk_bytes > 0 and key not in self._disk:
+                self._store(key, audio, sample_rate)
+
+    def _remember(self, key: str, audio: np.ndarray, sample_rate: int) -> None:
+        if audio.nbytes > self.memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_used -= self._memory.pop(key)[0].nbytes
+        self._memory[key] = (audio, sample_rate)
+        self._memory_used += audio.nbytes
+        while self._memory_used > self.memory_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_used -= evicted.nbytes
+
+    def _store(self, key: str, audio: np.ndarray, sample_rate: int) -> None:
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            sf.write(tmp_path, audio, sample_rate, format="WAV", subtype="PCM_16")
+            os.replace(tmp_path, path)  # Readers never see a half-written file
+            size = path.stat().st_size
+        except (OSError, RuntimeError) as e:
+            print(f"⚠️  Could not write TTS cache entry: {e}")
+            return
+        self._disk[key] = size
+        self._disk_used += size
+        while self._disk_used > self.disk_bytes and self._disk:
+            evicted, evicted_size = self._disk.popitem(last=False)
+            self._disk_used -= evicted_size
+            self._touched.discard(evicted)
+            self._path(evicted).unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_bytes": self._memory_used,
+            "disk_bytes": self._disk_used,
+        }
@@ -0,0 +1,239 @@
+"""
+Frame-level Voice Activity Detection.
+
+Audio is cut into fixed 10/20/30 ms frames regardless of how it arrives,
+scored by a pluggable scorer, and smoothed with attack/hangover counters
+so single clicks don't start an utterance and short pauses don't end it.
+Recent frames can be kept in a preallocated ring so the audio just before a
+speech onset (pre-roll) can be recovered.
+"""
+import math
+from typing import Optional
+
+import numpy as np
+
+
+VAD_THRESHOLD = 0.0035  # Energy threshold for voice activity detection (higher = more selective)
+FRAME_MS_CHOICES = (10, 20, 30)
+FRAME_MS = 20  # Frame size used for scoring
+ATTACK_MS = 40  # Consecutive voiced audio needed before speech starts
+HANGOVER_MS = 800  # Consecutive unvoiced audio needed before speech ends
+PREROLL_MS = 300  # Audio kept before the speech onset so word starts aren't clipped
+MAX_BLOCK_MS = 500  # Largest block process() is expected to receive at once
+
+
+class EnergyScorer:
+    """Mean absolute amplitude per frame."""
+
+    def __init__(self, threshold: float = VAD_THRESHOLD):
+        self.threshold = threshold
+
+    def score(self, frames: np.ndarray) -> np.ndarray:
+        return np.abs(frames).mean(axis=1)
+
+
+class SpectralFlatnessScorer:
+    """
+    1 - spectral flatness per frame (speech is tonal, background noise is flat).
+    Frames below an energy floor score 0 so quiet rooms aren't mistaken for speech.
+    """
+
+    def __init__(self, threshold: float = 0.6, energy_floor: float = VAD_THRESHOLD / 2):
+        self.threshold = threshold
+        self.energy_floor = energy_floor
+        self._window: Optional[np.ndarray] = None
+
+    def score(self, frames: np.ndarray) -> np.ndarray:
+        if self._window is None or len(self._window) != frames.shape[1]:
+            self._window = np.hanning(frames.shape[1]).astype(np.float32)
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2 + 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        scores = 1.0 - flatness
+        scores[np.abs(frames).mean(axis=1) < self.energy_floor] = 0.0
+        return scores
+
+
+class OnnxScorer:
+    """
+    Speech probability from an ONNX model.
+
+    The model must take a float32 (frames, samples) batch and return one
+    probability per frame. Requires onnxruntime (pip install onnxruntime).
+    """
+
+    def __init__(self, model_path: str, threshold: float = 0.5):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError("OnnxScorer requires onnxruntime (pip install onnxruntime)") from e
+
+        self.threshold = threshold
+        self._session = onnxruntime.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self._input_name = self._session.get_inputs()[0].name
+
+    def score(self, frames: np.ndarray) -> np.ndarray:
+        output = self._session.run(None, {self._input_name: np.ascontiguousarray(frames, dtype=np.float32)})[0]
+        return np.asarray(output, dtype=np.float32).reshape(len(frames))
+
+
+def create_scorer(name: str, threshold: Optional[float] = None, model_path: Optional[str] = None):
+    """Build a scorer by name: energy, spectral or onnx."""
+    kwargs = {} if threshold is None else {"threshold": threshold}
+    match name:
+        case "energy":
+            return EnergyScorer(**kwargs)
+        case "spectral":
+            return SpectralFlatnessScorer(**kwargs)
+        case "onnx":
+            if model_path is None:
+                raise ValueError("The onnx VAD scorer needs a model path")
+            return OnnxScorer(model_path, **kwargs)
+    raise ValueError(f"Unknown VAD scorer: {name}. Choose 'energy', 'spectral' or 'onnx'")
+
+
+class VoiceActivityDetector:
+    """
+    Streaming frame-level VAD.
+
+    Feed audio of any block size to process(); it returns one smoothed
+    decision per frame completed by that block. Leftover samples are carried
+    over to the next call, so decisions don't depend on how the audio was chunked.
+
+    With keep_audio=False the detector only scores: callers that already hold
+    the audio (e.g. in a RingBuffer) use onset_offset() to locate the pre-roll.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        scorer=None,
+        frame_ms: int = FRAME_MS,
+        attack_ms: int = ATTACK_MS,
+        hangover_ms: int = HANGOVER_MS,
+        preroll_ms: int = PREROLL_MS,
+        keep_audio: bool = True,
+    ):
+        if frame_ms not in FRAME_MS_CHOICES:
+            raise ValueError(f"Unsupported VAD frame size: {frame_ms}ms. Choose one of {FRAME_MS_CHOICES}")
+
+        self.sample_rate = sample_rate
+        self.scorer = scorer if scorer is not None else EnergyScorer()
+        self.frame_ms = frame_ms
+        self.frame_length = sample_rate * frame_ms // 1000
+        self._attack_frames = max(1, math.ceil(attack_ms / frame_ms))
+        self._hangover_frames = max(1, math.ceil(hangover_ms / frame_ms))
+        self._preroll_frames = math.ceil(preroll_ms / frame_ms)
+
+        self._ring_frames = self._preroll_frames + self._attack_frames + math.ceil(MAX_BLOCK_MS / frame_ms)
+        self._ring = np.zeros((self._ring_frames, self.frame_length), dtype=np.float32) if keep_audio else None
+        self._pending = np.zeros(self.frame_length, dtype=np.float32)
+        self._pending_len = 0
+
+        self.frames_processed = 0
+        self.triggered = False  # Smoothed speech state after the last processed frame
+        self.onset_frame: Optional[int] = None  # First voiced frame of the current speech run
+        self.last_score = 0.0
+        self._voiced_run = 0
+        self._unvoiced_run = 0
+
+    def reset(self) -> None:
+        """Forget all state (e.g. after capture was paused)."""
+        self._pending_len = 0
+        self.triggered = False
+        self.onset_frame = None
+        self._voiced_run = 0
+        self._unvoiced_run = 0
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Consume mono audio and return a bool decision for every frame it completed."""
+        audio = np.asarray(audio, dtype=np.float32)
+        frame_length = self.frame_length
+        scores = []
+
+        # Complete the frame left over from the previous call
+        if self._pending_len:
+            take = min(frame_length - self._pending_len, len(audio))
+            self._pending[self._pending_len:self._pending_len + take] = audio[:take]
+            self._pending_len += take
+            audio = audio[take:]
+            if self._pending_len < frame_length:
+                return np.zeros(0, dtype=bool)
+            head = self._pending[np.newaxis, :]
+            scores.append(self.scorer.score(head))
+            self._store(head)
+            self._pending_len = 0
+
+        # Score whole frames in place as a (frames, samples) view
+        count = len(audio) // frame_length
+        if count:
+            body = audio[:count * frame_length].reshape(count, frame_length)
+            scores.append(self.scorer.score(body))
+            self._store(body)
+
+        rest = audio[count * frame_length:]
+        self._pending[:len(rest)] = rest
+        self._pending_len = len(rest)
+
+        if not scores:
+            return np.zeros(0, dtype=bool)
+        scores = np.concatenate(scores) if len(scores) > 1 else scores[0]
+        self.last_score = float(scores[-1])
+        return self._smooth(scores > self.scorer.threshold)
+
+    def onset_offset(self) -> int:
+        """
+        Number of samples from PREROLL_MS before the current speech onset up to
+        the last sample processed (including any incomplete frame).
+        """
+        return self._onset_frames() * self.frame_length + self._pending_len
+
+    def onset_audio(self) -> np.ndarray:
+        """
+        Audio from PREROLL_MS before the current speech onset up to the last sample
+        processed (including any incomplete frame), oldest first.
+        """
+        if self._ring is None:
+            raise RuntimeError("onset_audio() needs a detector created with keep_audio=True")
+        end = self.frames_processed
+        rows = np.arange(end - self._onset_frames(), end) % self._ring_frames
+        return np.concatenate([self._ring[rows].reshape(-1), self._pending[:self._pending_len]])
+
+    def _onset_frames(self) -> int:
+        end = self.frames_processed
+        start = end if self.onset_frame is None else self.onset_frame - self._preroll_frames
+        return end - max(start, end - self._ring_frames, 0)
+
+    def _store(self, frames: np.ndarray) -> None:
+        """Copy frames into the ring (only the most recent ones fit)."""
+        if self._ring is None:
+            self.frames_processed += len(frames)
+            return
+        ring_frames = self._ring_frames
+        count = len(frames)
+        if count > ring_frames:
+            self.frames_processed += count - ring_frames
+            frames = frames[-ring_frames:]
+            count = ring_frames
+        rows = np.arange(self.frames_processed, self.frames_processed + count) % ring_frames
+        self._ring[rows] = frames
+        self.frames_processed += count
+
+    def _smooth(self, voiced: np.ndarray) -> np.ndarray:
+        """Apply attack/hangover smoothing to raw per-frame decisions."""
+        first_frame = self.frames_processed - len(voiced)
+        decisions = np.empty(len(voiced), dtype=bool)
+        for i, is_voiced in enumerate(voiced):
+            if is_voiced:
+                self._voiced_run += 1
+                self._unvoiced_run = 0
+            else:
+                self._unvoiced_run += 1
+                self._voiced_run = 0
+
+            if not self.triggered and self._voiced_run >= self._attack_frames:
+                self.triggered = True
+                self.onset_frame = first_frame + i - self._attack_frames + 1
+            elif self.triggered and self._unvoiced_run >= self._hangover_frames:
+                self.triggered = False
+            decisions[i] = self.triggered
+        return decisions
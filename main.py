@@ -5,11 +5,16 @@ import os
 from pathlib import Path
 
 from dotenv import load_dotenv
-from lib.firmware import Firmware
+from lib.debug_recorder import DebugRecorder, DEFAULT_MAX_FILES
+from lib.device_cache import DeviceCache
+from lib.firmware import Firmware, TIMING_MODES
 from lib.gpt import GPT
+from lib.openai_client import SharedOpenAIClient
 from lib.sources import MicrophoneSource, VAD_THRESHOLD
-from lib.sttt import SpeechToTextTranscriber
+from lib.vad import create_scorer
+from lib.sttt import SpeechToTextTranscriber, WHISPER_PROFILES, DEFAULT_WHISPER_PROFILE, COMPUTE_TYPES, get_whisper_profile
 from lib.tts import TextToSpeech
+from lib.tts_cache import TTSCache
 from lib.robot import Robot
 
 
@@ -24,8 +29,24 @@ def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Voice-controlled robot using STT and GPT")
     parser.add_argument("--language", default="en", help="Language code (e.g., en, es, fr)")
     parser.add_argument("--vad-threshold", type=float, default=VAD_THRESHOLD, help=f"Voice activity detection threshold (default: {VAD_THRESHOLD})")
+    parser.add_argument("--vad", choices=["energy", "spectral", "onnx"], default="energy", help="Voice activity detection scorer (default: energy)")
+    parser.add_argument("--vad-model", default=None, help="ONNX model path for --vad onnx")
     parser.add_argument("--stt", choices=["whisper", "openai"], default="openai", help="Speech-to-text backend: whisper (local) or openai (cloud GPT-4o Audio)")
+    parser.add_argument("--whisper-profile", choices=list(WHISPER_PROFILES), default=DEFAULT_WHISPER_PROFILE, help=f"Whisper model for --stt whisper (default: {DEFAULT_WHISPER_PROFILE})")
+    parser.add_argument("--whisper-compute", choices=COMPUTE_TYPES, default=None, help="Override the profile's compute type")
+    parser.add_argument("--whisper-threads", type=int, default=None, help="Override the profile's CPU thread count")
+    parser.add_argument("--stream-stt", action="store_true", help="Transcribe while the user is still speaking (whisper only)")
+    parser.add_argument("--stream-llm", action="store_true", help="Execute each command as soon as GPT has generated it")
+    parser.add_argument("--upload-format", choices=["wav", "mp3"], default="wav", help="Audio encoding sent to GPT-4o Audio (default: wav, 16-bit PCM)")
+    parser.add_argument("--no-trim", action="store_true", help="Upload utterances without trimming leading/trailing silence")
+    parser.add_argument("--motion-timing", choices=TIMING_MODES, default="software", help="Time moves on the command queue thread (software) or as lgpio hardware-timed waves (wave)")
+    parser.add_argument("--ramp-ms", type=int, default=0, help="With --motion-timing wave: accelerate from standstill over this many ms (default: 0)")
     parser.add_argument("--tts", choices=["piper", "openai"], default="openai", help="Text-to-speech backend: piper (local) or openai (cloud)")
+    parser.add_argument("--debug-audio", metavar="DIR", default=None, help="Save captured utterances as WAV files in DIR (off by default)")
+    parser.add_argument("--debug-audio-max-files", type=int, default=DEFAULT_MAX_FILES, help=f"Newest recordings kept in the debug directory (default: {DEFAULT_MAX_FILES})")
+    parser.add_argument("--debug-audio-sampling", type=float, default=1.0, help="Fraction of utterances to save (default: 1.0)")
+    parser.add_argument("--rescan-devices", action="store_true", help="Ignore the cached audio device profile and probe the hardware again")
+    parser.add_argument("--no-tts-cache", action="store_true", help="Synthesize every phrase instead of replaying cached audio")
     return parser.parse_args()
 
 
@@ -38,18 +59,37 @@ def main():
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set. Add it to your environment or .env file.")
 
-    tts = TextToSpeech(backend=args.tts, api_key=api_key)
+    openai_client = SharedOpenAIClient(api_key)
+    openai_client.warm_up()
+    openai_client.start_keepalive()
+
+    device_cache = DeviceCache()
+    if args.rescan_devices:
+        device_cache.clear()
+
+    tts_cache = None if args.no_tts_cache else TTSCache()
+    tts = TextToSpeech(backend=args.tts, api_key=api_key, client=openai_client.client, cache=tts_cache, device_cache=device_cache)
     system_prompt = load_system_prompt()
     print("🤖 Robot system loaded!")
 
-    transcriber = SpeechToTextTranscriber(args.language) if args.stt == "whisper" else None
-    source = MicrophoneSource(args.vad_threshold)
-    robot = Robot(tts, system_prompt, source, GPT(api_key), Firmware(), transcriber=transcriber, stt=args.stt)
+    transcriber = None
+    if args.stt == "whisper":
+        profile = get_whisper_profile(args.whisper_profile, args.whisper_compute, args.whisper_threads)
+        transcriber = SpeechToTextTranscriber(args.language, profile=profile)
+    vad_scorer = create_scorer(args.vad, args.vad_threshold if args.vad == "energy" else None, args.vad_model)
+    source = MicrophoneSource(args.vad_threshold, vad_scorer, device_cache)
+    gpt = GPT(api_key, upload_format=args.upload_format, trim_silence=not args.no_trim, client=openai_client.client)
+    debug_recorder = None
+    if args.debug_audio:
+        debug_recorder = DebugRecorder(args.debug_audio, max_files=args.debug_audio_max_files, sampling=args.debug_audio_sampling)
+    robot = Robot(tts, system_prompt, source, gpt, Firmware(timing=args.motion_timing, ramp_ms=args.ramp_ms), transcriber=transcriber, stt=args.stt, streaming=args.stream_stt, stream_llm=args.stream_llm, debug_recorder=debug_recorder)
 
     try:
         robot.run()
     except KeyboardInterrupt:
         print("\nStopped by user.")
+    finally:
+        openai_client.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark Whisper profiles on a corpus of recorded commands.
+
+Each profile runs in its own process (so peak RSS is per profile) and
+transcribes every file of the corpus. Reports load time, real-time factor,
+peak RSS and word error rate against the manifest transcripts, and picks
+the fastest profile whose WER is within --max-wer.
+
+    python -m scripts.bench_stt recordings/manifest.jsonl
+    python -m scripts.bench_stt recordings/manifest.jsonl --profiles tiny base small --compute-types int8 int8_float32 --threads 2 4
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import re
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.common import print_table
+from lib.sources import CorpusSource
+from lib.sttt import SpeechToTextTranscriber, WHISPER_PROFILES, COMPUTE_TYPES, get_whisper_profile
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercase words without punctuation, so WER only counts word differences."""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_errors(reference: str, hypothesis: str) -> tuple[int, int]:
+    """(word-level edit distance, reference word count)."""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1], len(ref)
+
+
+def run_worker(args: argparse.Namespace) -> None:
+    """Transcribe the corpus with one profile and print the results as JSON."""
+    profile = get_whisper_profile(args.worker, args.compute_type, args.cpu_threads)
+    with contextlib.redirect_stdout(sys.stderr):  # Keep stdout for the JSON result
+        corpus = CorpusSource(args.corpus, segment=False)
+        load_start = time.perf_counter()
+        transcriber = SpeechToTextTranscriber(args.language, profile=profile)
+        transcriber.model
+        load_s = time.perf_counter() - load_start
+
+        audio_s = decode_s = 0.0
+        hypotheses = {}
+        for path, (audio, sample_rate) in zip(corpus.paths, corpus):
+            start = time.perf_counter()
+            hypotheses[str(path)] = "".join(segment.text for segment in transcriber._decode(audio)).strip()
+            decode_s += time.perf_counter() - start
+            audio_s += len(audio) / sample_rate
+
+    print(json.dumps({
+        "load_s": load_s,
+        "audio_s": audio_s,
+        "decode_s": decode_s,
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,  # KiB on Linux
+        "hypotheses": hypotheses,
+    }))
+
+
+def run_profile(args: argparse.Namespace, name: str, compute_type: str, threads: int) -> dict:
+    command = [
+        sys.executable, "-m", "scripts.bench_stt", args.corpus,
+        "--worker", name, "--compute-type", compute_type, "--cpu-threads", str(threads), "--language", args.language,
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Profile {name}/{compute_type}/{threads} failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Whisper profiles: speed, memory and accuracy")
+    parser.add_argument("corpus", help="JSONL manifest with reference texts (or a directory, without WER)")
+    parser.add_argument("--profiles", nargs="+", choices=list(WHISPER_PROFILES), default=list(WHISPER_PROFILES), help="Profiles to compare (default: all)")
+    parser.add_argument("--compute-types", nargs="+", choices=COMPUTE_TYPES, default=["int8"], help="Compute types to compare (default: int8)")
+    parser.add_argument("--threads", nargs="+", type=int, default=[4], help="CPU thread counts to compare (default: 4)")
+    parser.add_argument("--language", default="en", help="Language code (e.g., en, es, fr)")
+    parser.add_argument("--max-wer", type=float, default=0.15, help="Accuracy floor for picking a profile (default: 0.15 = 15%% WER)")
+    # Internal: run a single profile and print JSON
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--compute-type", help=argparse.SUPPRESS)
+    parser.add_argument("--cpu-threads", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    if args.worker:
+        run_worker(args)
+        return
+
+    references = {str(path): text for path, text in CorpusSource(args.corpus, segment=False).transcripts.items()}
+    if not references:
+        print("⚠️  Corpus has no reference texts: WER is not reported and no profile is picked")
+
+    rows = []
+    candidates = []
+    for name, compute_type, threads in itertools.product(args.profiles, args.compute_types, args.threads):
+        label = f"{name}/{compute_type}/{threads}t"
+        print(f"Running {label}...", file=sys.stderr)
+        result = run_profile(args, name, compute_type, threads)
+        rtf = result["decode_s"] / result["audio_s"] if result["audio_s"] else 0.0
+        wer = None
+        if references:
+            errors, words = map(sum, zip(*(word_errors(text, result["hypotheses"].get(path, "")) for path, text in references.items())))
+            wer = errors / words if words else 0.0
+            if wer <= args.max_wer:
+                candidates.append((rtf, name, compute_type, threads))
+        rows.append([
+            label,
+            f"{result['load_s']:.1f}",
+            f"{rtf:.3f}",
+            f"{result['peak_rss_kib'] / 1024:.0f}",
+            f"{wer * 100:.1f}" if wer is not None else "-",
+        ])
+
+    print_table(["profile", "load s", "RTF", "peak RSS MiB", "WER %"], rows)
+
+    if references:
+        if not candidates:
+            print(f"\nNo profile reached WER <= {args.max_wer * 100:.0f}%")
+            sys.exit(1)
+        rtf, name, compute_type, threads = min(candidates)
+        print(f"\nFastest profile with WER <= {args.max_wer * 100:.0f}%: {name}/{compute_type}/{threads}t (RTF {rtf:.3f})")
+        print(f"  python main.py --stt whisper --whisper-profile {name} --whisper-compute {compute_type} --whisper-threads {threads}")
+
+
+if __name__ == "__main__":
+    main()
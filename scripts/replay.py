@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Replay recorded commands through the robot pipeline without a microphone.
+
+Runs a corpus (directory of WAV/FLAC files or JSONL manifest) through VAD,
+STT, GPT response parsing and the firmware driven by the lgpio mock, and
+reports end-to-end throughput and per-turn latency percentiles.
+
+    python -m scripts.replay recordings/ --stt whisper --gpt-response '[{"command": "forward", "ms": 500}]'
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from lib.firmware import Firmware, lgpio_mock
+from lib.gpt import GPT
+from lib.robot import Robot
+from lib.sources import CorpusSource, VAD_THRESHOLD
+
+
+class TimedSource:
+    """
+    Wraps a source and records how long the robot spends on each final segment
+    (from the segment being yielded until the robot asks for the next one).
+    """
+
+    def __init__(self, source):
+        self._source = source
+        self.turns: list[float] = []
+        self.audio_seconds = 0.0
+
+    def pause(self):
+        self._source.pause()
+
+    def resume(self):
+        self._source.resume()
+
+    def __iter__(self):
+        for audio, sr in self._source:
+            self.audio_seconds += len(audio) / sr
+            start = time.perf_counter()
+            yield audio, sr
+            self.turns.append(time.perf_counter() - start)
+
+    def stream(self):
+        for audio, sr, final in self._source.stream():
+            if not final:
+                yield audio, sr, final
+                continue
+            self.audio_seconds += len(audio) / sr
+            start = time.perf_counter()
+            yield audio, sr, final
+            self.turns.append(time.perf_counter() - start)
+
+
+class CannedGPT:
+    """Stands in for GPT with a fixed response, so replays need no network and cost nothing."""
+
+    STREAM_CHUNK_CHARS = 8  # Roughly one token per streamed chunk
+
+    def __init__(self, response: str):
+        self.response = response
+
+    def chat(self, system_prompt: str, user_message: str, model: str = "") -> str:
+        return self.response
+
+    def chat_with_audio(self, system_prompt: str, audio, sample_rate: int, model: str = "") -> str:
+        return self.response
+
+    def chat_stream(self, system_prompt: str, user_message: str, model: str = ""):
+        return self._chunks()
+
+    def chat_with_audio_stream(self, system_prompt: str, audio, sample_rate: int, model: str = ""):
+        return self._chunks()
+
+    def _chunks(self):
+        for i in range(0, len(self.response), self.STREAM_CHUNK_CHARS):
+            yield self.response[i:i + self.STREAM_CHUNK_CHARS]
+
+
+class SilentTTS:
+    """Skips speech so replays don't block on audio playback."""
+
+    def speak(self, text: str, voice: str = "alloy") -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(source: TimedSource, wall_seconds: float) -> None:
+    turns = source.turns
+    print(f"Turns: {len(turns)} in {wall_seconds:.2f}s ({len(turns) / wall_seconds:.2f} turns/s)")
+    print(f"Audio: {source.audio_seconds:.1f}s replayed ({source.audio_seconds / wall_seconds:.1f}x real time)")
+    if not turns:
+        return
+    ms = [t * 1000 for t in turns]
+    print(
+        f"Turn latency ms: mean {statistics.mean(ms):.1f}, p50 {percentile(ms, 50):.1f}, "
+        f"p90 {percentile(ms, 90):.1f}, p99 {percentile(ms, 99):.1f}, max {max(ms):.1f}"
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay recorded commands through the robot pipeline")
+    parser.add_argument("corpus", help="Directory of WAV/FLAC files or JSONL manifest")
+    parser.add_argument("--stt", choices=["whisper", "openai"], default="whisper", help="Speech-to-text backend (default: whisper)")
+    parser.add_argument("--stream-stt", action="store_true", help="Transcribe while audio is still arriving (whisper only)")
+    parser.add_argument("--stream-llm", action="store_true", help="Execute commands as the GPT response streams in")
+    parser.add_argument("--language", default="en", help="Language code (e.g., en, es, fr)")
+    parser.add_argument("--vad-threshold", type=float, default=VAD_THRESHOLD, help=f"Voice activity detection threshold (default: {VAD_THRESHOLD})")
+    parser.add_argument("--realtime", action="store_true", help="Pace audio like a live microphone instead of as fast as possible")
+    parser.add_argument("--whole-files", action="store_true", help="Treat each file as one utterance instead of segmenting with VAD")
+    parser.add_argument("--gpt-response", default=None, help="Fixed GPT response JSON (skips the OpenAI API)")
+    parser.add_argument("--quiet", action="store_true", help="Hide pipeline logging, only print the report")
+    return parser.parse_args()
+
+
+def main():
+    load_dotenv()
+    args = parse_arguments()
+
+    if args.gpt_response is not None:
+        gpt = CannedGPT(args.gpt_response)
+    else:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY is not set. Add it to your environment or .env file, or pass --gpt-response.")
+        gpt = GPT(api_key)
+
+    transcriber = None
+    if args.stt == "whisper":
+        from lib.sttt import SpeechToTextTranscriber
+        transcriber = SpeechToTextTranscriber(args.language)
+
+    system_prompt = Path("prompts/system.md").read_text(encoding="utf-8").strip()
+    source = TimedSource(CorpusSource(args.corpus, segment=not args.whole_files, realtime=args.realtime, vad_threshold=args.vad_threshold))
+    robot = Robot(SilentTTS(), system_prompt, source, gpt, Firmware(gpio=lgpio_mock), transcriber=transcriber, stt=args.stt, streaming=args.stream_stt, stream_llm=args.stream_llm)
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull if args.quiet else sys.stdout):
+        robot.run()
+    report(source, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from lib.audio_capture import AudioCapture, AudioStream, SAMPLE_RATE
+from lib.sources import MicrophoneSource
+
+
+def speech(seconds=3.5, amplitude=0.1):
+    """1s of silence, `seconds` of tone, 1.5s of silence at 16kHz."""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    tone = amplitude * np.sin(2 * np.pi * 220 * t)
+    return np.concatenate([np.zeros(SAMPLE_RATE), tone, np.zeros(int(SAMPLE_RATE * 1.5))]).astype(np.float32)
+
+
+def blocks(audio, block_ms=20):
+    size = SAMPLE_RATE * block_ms // 1000
+    return [audio[i:i + size] for i in range(0, len(audio), size)]
+
+
+def capture_with_partials(audio):
+    finals, partials = [], []
+    AudioCapture().capture_from(
+        blocks(audio),
+        SAMPLE_RATE,
+        lambda a, sr: finals.append(a),
+        lambda a, sr: partials.append((a, a.copy())),
+    )
+    return finals, partials
+
+
+class StubMicrophone:
+    """Stands in for sd.InputStream: feed() delivers blocks through the PortAudio callback."""
+
+    def __init__(self):
+        self.callback = None
+        self.opened = threading.Event()
+
+    def __call__(self, callback, **kwargs):
+        self.callback = callback
+        return self
+
+    def __enter__(self):
+        self.opened.set()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def feed(self, audio):
+        assert self.opened.wait(5)
+        for block in blocks(audio):
+            self.callback(block.reshape(-1, 1), len(block), None, None)
+
+
+@pytest.fixture
+def mic():
+    stub = StubMicrophone()
+    with patch("lib.audio_capture.sd") as sd:
+        sd.InputStream = stub
+        yield stub
+
+
+class Done(Exception):
+    pass
+
+
+def start_capture(capture, finals):
+    """Run capture() on a thread until the first final utterance."""
+    def audio_callback(audio, sr):
+        finals.append(audio)
+        raise Done
+
+    def run():
+        try:
+            capture.capture(audio_callback)
+        except Done:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestSpeechSegmenterPartials:
+    def test_partials_are_prefixes_of_the_final_utterance(self):
+        (final,), partials = capture_with_partials(speech())
+        assert len(partials) >= 2
+        for partial, _ in partials:
+            np.testing.assert_array_equal(final[:len(partial)], partial)
+
+    def test_partials_and_final_share_one_gain(self):
+        (final,), partials = capture_with_partials(speech())
+        assert np.isclose(np.abs(final).max(), 0.9, atol=1e-3)
+        first, _ = partials[0]
+        assert np.isclose(np.abs(first).max(), np.abs(final).max(), atol=1e-3)
+
+    def test_later_partials_extend_the_same_buffer(self):
+        (final,), partials = capture_with_partials(speech())
+        # Nothing delivered earlier is copied or rescaled again
+        assert all(np.shares_memory(partial, final) for partial, _ in partials)
+        assert all(np.array_equal(partial, snapshot) for partial, snapshot in partials)
+
+    def test_consecutive_utterances_get_separate_buffers(self):
+        finals, _ = capture_with_partials(np.concatenate([speech(), speech(amplitude=0.3)]))
+        assert len(finals) == 2
+        assert not np.shares_memory(finals[0], finals[1])
+
+
+class TestCaptureLoop:
+    def test_processes_blocks_as_the_callback_delivers_them(self, mic):
+        finals = []
+        thread = start_capture(AudioCapture(), finals)
+        mic.feed(speech())
+        thread.join(5)
+        assert not thread.is_alive()
+        assert len(finals) == 1
+        assert 3.5 <= len(finals[0]) / SAMPLE_RATE < 5
+
+    def test_drops_audio_recorded_while_paused(self, mic):
+        capture = AudioCapture()
+        capture.pause()
+        skipped = threading.Event()
+        skip = AudioStream.skip
+
+        def skip_and_signal(stream):
+            skip(stream)
+            skipped.set()
+
+        finals = []
+        with patch.object(AudioStream, "skip", skip_and_signal):
+            thread = start_capture(capture, finals)
+            mic.feed(speech(seconds=3.5))
+            assert not skipped.is_set()
+            capture.resume()
+            assert skipped.wait(5)
+            mic.feed(speech(seconds=1.0))
+            thread.join(5)
+        assert len(finals) == 1
+        assert len(finals[0]) / SAMPLE_RATE < 3
+
+
+class TestMicrophoneSource:
+    def test_iterates_segments(self, mic):
+        source = MicrophoneSource()
+        segments = iter(source)
+        threading.Thread(target=mic.feed, args=(speech(),), daemon=True).start()
+        audio, sr = next(segments)
+        assert sr == SAMPLE_RATE
+        assert 3.5 <= len(audio) / SAMPLE_RATE < 5
+
+    def test_async_iteration(self, mic):
+        async def first_segment():
+            segments = MicrophoneSource().__aiter__()
+            # Fed from another thread, as PortAudio would; items come back via call_soon_threadsafe
+            threading.Thread(target=mic.feed, args=(speech(),), daemon=True).start()
+            return await asyncio.wait_for(segments.__anext__(), timeout=5)
+
+        audio, sr = asyncio.run(first_segment())
+        assert sr == SAMPLE_RATE
+        assert 3.5 <= len(audio) / SAMPLE_RATE < 5
+
+    def test_astream_yields_partials_then_final(self, mic):
+        async def until_final():
+            items = []
+            async for audio, sr, final in MicrophoneSource().astream():
+                items.append(final)
+                if final:
+                    return items
+
+        threading.Thread(target=mic.feed, args=(speech(),), daemon=True).start()
+        items = asyncio.run(asyncio.wait_for(until_final(), timeout=5))
+        assert items[-1] is True
+
+    def test_resume_drops_partials_of_the_paused_utterance(self):
+        source = MicrophoneSource()
+        first, partial, second = np.zeros(10), np.ones(5), np.ones(10)
+        for item in [(first, SAMPLE_RATE, True), (partial, SAMPLE_RATE, False), (second, SAMPLE_RATE, True)]:
+            source._queue.put(item)
+        source.pause()
+        source.resume()
+        assert [item[0] for item in source._queue.queue] == [first, second]
+
+    def test_second_iteration_mode_is_rejected(self, mic):
+        source = MicrophoneSource()
+        segments = iter(source)
+        threading.Thread(target=mic.feed, args=(speech(),), daemon=True).start()
+        next(segments)
+
+        async def async_segment():
+            return await source.__aiter__().__anext__()
+
+        with pytest.raises(RuntimeError, match="another mode"):
+            asyncio.run(async_segment())
+        with pytest.raises(RuntimeError, match="another mode"):
+            next(source.stream())
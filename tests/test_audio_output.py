@@ -0,0 +1,155 @@
+import threading
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from lib.audio_output import AudioOutput, decode_pcm16, find_output_device
+
+
+def make_output(sample_rate=48000):
+    with patch("lib.audio_output.sd") as sd:
+        sd.query_devices.return_value = {"default_samplerate": float(sample_rate)}
+        sd.OutputStream.return_value.latency = 0.0
+        output = AudioOutput()
+    return output, sd.OutputStream
+
+
+def pull(output, frames):
+    """Run one PortAudio callback and return what it played."""
+    outdata = np.full((frames, 1), np.nan, dtype=np.float32)
+    output._callback(outdata, frames, None, None)
+    return outdata[:, 0]
+
+
+def clip(n, value=0.5):
+    return np.full(n, value, dtype=np.float32)
+
+
+class DeviceThread:
+    """Pulls audio like a running PortAudio stream would."""
+
+    def __init__(self, output, frames=480):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(output, frames), daemon=True)
+
+    def _run(self, output, frames):
+        while not self._stop.wait(0.001):
+            pull(output, frames)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class TestDecodePcm16:
+    def test_carries_split_samples_over(self):
+        samples = np.array([0, 16384, -32768, 32767], dtype="<i2").tobytes()
+        blocks = list(decode_pcm16([samples[:3], samples[3:5], samples[5:]]))
+        decoded = np.concatenate(blocks)
+        assert np.allclose(decoded, [0.0, 0.5, -1.0, 32767 / 32768])
+
+
+class TestFindOutputDevice:
+    @patch("lib.audio_output.sd")
+    def test_matches_alsa_card(self, sd):
+        sd.query_devices.return_value = [
+            {"name": "bcm2835 Headphones: - (hw:0,0)", "max_output_channels": 8},
+            {"name": "USB Audio Device: - (hw:1,0)", "max_output_channels": 2},
+        ]
+        assert find_output_device(1) == 1
+        assert find_output_device(3) is None
+
+
+class TestAudioOutput:
+    def test_stream_is_opened_and_started_once(self):
+        output, stream_class = make_output()
+        with DeviceThread(output):
+            output.play([clip(480)], 48000)
+            output.play([clip(480)], 48000)
+        stream_class.assert_called_once()
+        stream_class.return_value.start.assert_called_once()
+
+    def test_plays_silence_when_idle(self):
+        output, _ = make_output()
+        assert not pull(output, 480).any()
+
+    def test_queued_clips_play_back_to_back(self):
+        output, _ = make_output()
+        first = output.enqueue(clip(30, 0.25), 48000)
+        second = output.enqueue(clip(30, 0.5), 48000)
+        played = pull(output, 50)
+        assert np.array_equal(played, np.concatenate([clip(30, 0.25), clip(20, 0.5)]))
+        assert first.done and not second.done
+        pull(output, 50)
+        assert second.done
+
+    def test_waits_for_producer_without_finishing_clip(self):
+        output, _ = make_output()
+        streaming = output.open_clip(48000)
+        streaming.write(clip(10))
+        played = pull(output, 50)
+        assert played[:10].all() and not played[10:].any()
+        assert not streaming.done
+        streaming.write(clip(10))
+        streaming.close()
+        pull(output, 50)
+        assert streaming.done and streaming.samples_played == 20
+
+    def test_cancel_flushes_queue(self):
+        output, _ = make_output()
+        clips = [output.enqueue(clip(1000), 48000) for _ in range(3)]
+        pull(output, 100)
+        output.cancel()
+        assert not pull(output, 100).any()
+        assert all(c.done for c in clips)
+        assert clips[0].samples_played == 100
+
+    def test_records_start_latency(self):
+        output, _ = make_output()
+        queued = output.enqueue(clip(10), 48000)
+        pull(output, 50)
+        assert queued.start_latency is not None and queued.start_latency >= 0
+        assert output.latency_stats()["clips"] == 1
+
+    def test_resamples_to_output_rate(self):
+        output, _ = make_output(48000)
+        resampled = output.enqueue(clip(2400), 24000)
+        pull(output, 9600)
+        assert resampled.done and resampled.samples_played == 4800
+
+    def test_play_streams_blocks_and_returns_samples(self):
+        output, _ = make_output()
+        with DeviceThread(output):
+            assert output.play((clip(480) for _ in range(3)), 48000) == 1440
+
+    def test_play_cancels_clip_when_source_fails(self):
+        output, _ = make_output()
+
+        def blocks():
+            yield clip(480)
+            raise RuntimeError("connection lost")
+
+        with pytest.raises(RuntimeError):
+            output.play(blocks(), 48000)
+        assert not pull(output, 480).any()
+
+    @patch("lib.audio_output.PLAYBACK_TIMEOUT_MARGIN_S", 0.05)
+    def test_play_gives_up_when_device_stalls(self):
+        output, _ = make_output()
+        queued = output.enqueue(clip(480), 48000)
+        # No callbacks run: both clips would otherwise wait forever
+        assert output.play([clip(480)], 48000) == 0
+        assert queued.cancelled
+        assert not pull(output, 480).any()
+
+    @patch("lib.audio_output.PLAYBACK_TIMEOUT_MARGIN_S", 0.05)
+    def test_wait_gives_up_when_device_stalls(self):
+        output, _ = make_output()
+        queued = output.enqueue(clip(4800), 48000)
+        output.wait()
+        assert queued.cancelled and queued.done is False
@@ -0,0 +1,55 @@
+import threading
+
+from lib.clock import MonotonicClock, VirtualClock
+
+
+class TestMonotonicClock:
+    def test_wait_until_returns_at_deadline(self):
+        clock = MonotonicClock()
+        condition = threading.Condition()
+        deadline = clock.now() + 0.01
+        with condition:
+            clock.wait_until(condition, deadline)
+        assert clock.now() >= deadline
+
+
+class TestVirtualClock:
+    def test_auto_advance_sleep_takes_no_wall_time(self):
+        clock = VirtualClock()
+        clock.sleep(3600)
+        assert clock.now() == 3600
+
+    def test_auto_advance_wait_jumps_to_deadline(self):
+        clock = VirtualClock(start=10.0)
+        condition = threading.Condition()
+        with condition:
+            clock.wait_until(condition, 15.0)
+        assert clock.now() == 15.0
+
+    def test_manual_sleep_waits_for_advance(self):
+        clock = VirtualClock(auto_advance=False)
+        woke = threading.Event()
+        thread = threading.Thread(target=lambda: (clock.sleep(1.0), woke.set()))
+        thread.start()
+        clock.advance(0.5)
+        assert not woke.wait(0.05)
+        clock.advance(0.5)
+        assert woke.wait(1.0)
+        thread.join()
+
+    def test_advance_wakes_condition_waiters(self):
+        clock = VirtualClock(auto_advance=False)
+        condition = threading.Condition()
+        reached = threading.Event()
+
+        def waiter():
+            with condition:
+                while clock.now() < 2.0:
+                    clock.wait_until(condition, 2.0)
+            reached.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        clock.advance(2.0)
+        assert reached.wait(1.0)
+        thread.join()
@@ -1,5 +1,8 @@
 from unittest.mock import MagicMock
 
+import pytest
+
+from lib.clock import VirtualClock
 from lib.command_queue import CommandQueue
 
 
@@ -49,10 +52,69 @@ class TestCommandQueue:
         fn.assert_called_once()
 
     def test_delay_waits_before_executing(self):
+        clock = VirtualClock()
+        q = CommandQueue(clock=clock)
+        timestamps = []
+        q.enqueue(lambda: timestamps.append(clock.now()))
+        q.enqueue(lambda: timestamps.append(clock.now()), delay=0.1)
+        q.wait()
+        assert timestamps[1] - timestamps[0] == pytest.approx(0.1)
+
+    def test_waits_for_clock_to_reach_deadline(self):
+        clock = VirtualClock(auto_advance=False)
+        q = CommandQueue(clock=clock)
+        fn = MagicMock()
+        q.enqueue(fn, delay=5.0)
+        clock.advance(4.9)
+        q.enqueue(MagicMock())  # Wakes the worker without reaching the deadline
+        assert not fn.called
+        clock.advance(0.1)
+        q.wait()
+        fn.assert_called_once()
+
+    def test_clear_cancels_command_waiting_for_its_deadline(self):
+        clock = VirtualClock(auto_advance=False)
+        q = CommandQueue(clock=clock)
+        fn = MagicMock()
+        q.enqueue(fn, delay=5.0)
+        q.clear()
+        q.wait()
+        clock.advance(5.0)
+        fn.assert_not_called()
+
+    def test_commands_after_clear_still_run(self):
+        q = CommandQueue(clock=VirtualClock(auto_advance=False))
+        fn = MagicMock()
+        q.enqueue(MagicMock(), delay=5.0)
+        q.clear()
+        q.enqueue(fn)
+        q.wait()
+        fn.assert_called_once()
+
+    def test_delay_counts_from_previous_deadline(self):
+        clock = VirtualClock()
+        q = CommandQueue(clock=clock)
+        timestamps = []
+        q.enqueue(lambda: clock.sleep(0.05))  # Slow command must not push back the next deadline
+        q.enqueue(lambda: timestamps.append(clock.now()), delay=0.1)
+        q.wait()
+        assert timestamps == [pytest.approx(0.1)]
+
+    def test_records_jitter_per_command(self):
+        q = CommandQueue(clock=VirtualClock())
+        q.enqueue(MagicMock())
+        q.enqueue(MagicMock(), delay=0.01)
+        q.wait()
+        assert q.jitter_stats() == {"commands": 2, "mean_s": 0.0, "median_s": 0.0, "max_s": 0.0}
+
+    def test_real_clock_clear_is_immediate(self):
         import time
         q = CommandQueue()
-        timestamps = []
-        q.enqueue(lambda: timestamps.append(time.monotonic()))
-        q.enqueue(lambda: timestamps.append(time.monotonic()), delay=0.1)
+        fn = MagicMock()
+        q.enqueue(fn, delay=5.0)
+        time.sleep(0.05)  # Let the worker start waiting on the deadline
+        start = time.monotonic()
+        q.clear()
         q.wait()
-        assert timestamps[1] - timestamps[0] >= 0.1
+        assert time.monotonic() - start < 0.5
+        fn.assert_not_called()
@@ -0,0 +1,68 @@
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from lib.debug_recorder import DebugRecorder, QUEUE_SIZE
+
+
+def utterance(value=0.25):
+    return np.full(1600, value, dtype=np.float32)
+
+
+class TestDebugRecorder:
+    def test_writes_utterance_in_background(self, tmp_path):
+        recorder = DebugRecorder(tmp_path)
+        assert recorder.record(utterance(), 16000)
+        recorder.flush()
+        (path,) = tmp_path.glob("*.wav")
+        audio, sample_rate = sf.read(path, dtype="float32")
+        assert sample_rate == 16000
+        np.testing.assert_allclose(audio, utterance(), atol=1e-4)
+        assert recorder.recorded == 1
+
+    def test_keeps_newest_files(self, tmp_path):
+        recorder = DebugRecorder(tmp_path, max_files=2)
+        for value in (0.1, 0.2, 0.3):
+            recorder.record(utterance(value), 16000)
+            recorder.flush()
+        paths = sorted(tmp_path.glob("*.wav"))
+        assert len(paths) == 2
+        assert [round(float(sf.read(path)[0][0]), 2) for path in paths] == [0.2, 0.3]
+
+    def test_rotation_includes_files_from_previous_runs(self, tmp_path):
+        first = DebugRecorder(tmp_path, max_files=2)
+        first.record(utterance(), 16000)
+        first.record(utterance(), 16000)
+        first.flush()
+        oldest = sorted(tmp_path.glob("*.wav"))[0]
+        second = DebugRecorder(tmp_path, max_files=2)
+        second.record(utterance(), 16000)
+        second.flush()
+        assert len(list(tmp_path.glob("*.wav"))) == 2
+        assert not oldest.exists()
+
+    def test_sampling_skips_utterances(self, tmp_path):
+        recorder = DebugRecorder(tmp_path, sampling=0.0)
+        assert not recorder.record(utterance(), 16000)
+        recorder.flush()
+        assert list(tmp_path.glob("*.wav")) == []
+
+    def test_partial_sampling_is_seeded(self, tmp_path):
+        kept = [DebugRecorder(tmp_path / str(run), sampling=0.5, seed=1).record(utterance(), 16000) for run in range(2)]
+        assert kept[0] == kept[1]
+
+    def test_drops_when_writer_is_behind(self, tmp_path):
+        recorder = DebugRecorder(tmp_path)
+        release = threading.Event()
+        recorder._write = lambda *args: release.wait()
+        results = [recorder.record(utterance(), 16000) for _ in range(QUEUE_SIZE + 2)]
+        release.set()
+        recorder.flush()
+        assert not results[-1]
+        assert recorder.dropped >= 1
+
+    def test_rejects_invalid_sampling(self, tmp_path):
+        with pytest.raises(ValueError):
+            DebugRecorder(tmp_path, sampling=1.5)
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from lib.audio_capture import AudioCapture
+from lib.audio_device import get_audio_device
+from lib.device_cache import DeviceCache, sound_card_identity
+
+
+class TestDeviceCache:
+    def test_profile_survives_restart(self, tmp_path):
+        DeviceCache(tmp_path / "devices.json", identity="usb-a").update(output_card=1)
+        assert DeviceCache(tmp_path / "devices.json", identity="usb-a").get("output_card") == 1
+
+    def test_changed_hardware_ignores_profile(self, tmp_path):
+        DeviceCache(tmp_path / "devices.json", identity="usb-a").update(output_card=1)
+        assert DeviceCache(tmp_path / "devices.json", identity="usb-b").get("output_card") is None
+
+    def test_clear_forgets_profile(self, tmp_path):
+        cache = DeviceCache(tmp_path / "devices.json", identity="usb-a")
+        cache.update(output_card=1)
+        cache.clear()
+        assert DeviceCache(tmp_path / "devices.json", identity="usb-a").get("output_card") is None
+
+    def test_identity_comes_from_asound_cards(self, tmp_path):
+        cards = tmp_path / "cards"
+        cards.write_text(" 1 [UACDemoV10 ]: USB-Audio - UACDemoV1.0\n")
+        assert sound_card_identity(cards) == sound_card_identity(cards)
+        assert sound_card_identity(tmp_path / "missing") is None
+
+
+class TestGetAudioDevice:
+    @patch("lib.audio_device.detect_usb_audio_device", return_value=2)
+    def test_detects_once_then_uses_cache(self, mock_detect, tmp_path):
+        assert get_audio_device(DeviceCache(tmp_path / "devices.json", identity="usb-a")) == 2
+        assert get_audio_device(DeviceCache(tmp_path / "devices.json", identity="usb-a")) == 2
+        mock_detect.assert_called_once()
+
+
+@patch("lib.audio_capture.sd.check_input_settings")
+class TestWorkingSampleRate:
+    def test_cached_rate_needs_one_check(self, mock_check, tmp_path):
+        cache = DeviceCache(tmp_path / "devices.json", identity="usb-a")
+        cache.update(input_device=0, input_sample_rate=48000)
+        assert AudioCapture(device_cache=cache)._get_working_sample_rate(0) == 48000
+        mock_check.assert_called_once()
+
+    def test_probes_and_caches_on_miss(self, mock_check, tmp_path):
+        cache = DeviceCache(tmp_path / "devices.json", identity="usb-a")
+        assert AudioCapture(device_cache=cache)._get_working_sample_rate(0) == 16000
+        assert cache.get("input_sample_rate") == 16000
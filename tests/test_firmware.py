@@ -0,0 +1,159 @@
+import atexit
+import time
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from lib.clock import VirtualClock
+from lib.firmware import WAVE_REFILL_S, Firmware, lgpio_mock
+from lib.models import MovementCommand
+from lib.motion_plan import compile_plan
+
+
+def make_firmware(clock=None):
+    gpio = MagicMock()
+    clock = clock if clock is not None else VirtualClock()
+    events = []
+    gpio.tx_pwm.side_effect = lambda h, pin, freq, duty: events.append((clock.now(), pin, duty))
+    return Firmware(gpio=gpio, clock=clock), gpio, events
+
+
+class TestFirmware:
+    def test_move_stops_after_duration_in_simulated_time(self):
+        firmware, gpio, events = make_firmware()
+        firmware.forward(5.0)
+        firmware._queue.wait()
+        assert [(t, duty) for t, pin, duty in events if pin == 12] == [(0.0, 100), (5.0, 0)]
+
+    def test_moves_run_back_to_back(self):
+        firmware, gpio, events = make_firmware()
+        firmware.forward(1.0)
+        firmware.left_turn(0.5, 60)
+        firmware._queue.wait()
+        assert [(t, duty) for t, pin, duty in events if pin == 12] == [(0.0, 100), (1.0, 0), (1.0, 60), (1.5, 0)]
+
+    def test_clear_stops_before_pending_stop(self):
+        clock = VirtualClock(auto_advance=False)
+        firmware, gpio, events = make_firmware(clock)
+        firmware.forward(5.0)
+        while not events:  # Motors started; the stop is waiting for its deadline
+            time.sleep(0.001)
+        clock.advance(1.0)
+        firmware.clear()
+        firmware._queue.wait()
+        clock.advance(10.0)
+        assert [(t, duty) for t, pin, duty in events if pin == 12] == [(0.0, 100), (1.0, 0)]
+
+    def test_run_plan_follows_timeline(self):
+        firmware, gpio, events = make_firmware()
+        firmware.run_plan(compile_plan([MovementCommand(command="forward", ms=1000), MovementCommand(command="left", ms=500)]))
+        firmware._queue.wait()
+        assert [(t, duty) for t, pin, duty in events if pin == 12] == [(0.0, 100), (1.5, 0)]
+        h = gpio.gpiochip_open.return_value
+        # Group bit i is MOTOR_DIR_PINS[i]: forward 0101 (pins 22, 24), left 0110 (22, 23), then stopped
+        assert gpio.group_write.call_args_list == [call(h, 17, 0b1010, 0b1010), call(h, 17, 0b0110, 0b1100), call(h, 17, 0, 0b0110)]
+
+
+class TestGroupWrites:
+    def setup_method(self):
+        self.firmware = Firmware(gpio=lgpio_mock, clock=VirtualClock())
+        lgpio_mock.reset_calls()
+
+    def teardown_method(self):
+        atexit.unregister(self.firmware._cleanup)
+
+    def test_move_is_one_group_write_and_two_pwm_writes_each_way(self):
+        self.firmware.forward(1.0)
+        self.firmware._queue.wait()
+        assert lgpio_mock.calls == {"group_write": 2, "tx_pwm": 4}
+
+    def test_stopping_when_stopped_writes_nothing(self):
+        self.firmware.clear()
+        self.firmware.stop()
+        assert sum(lgpio_mock.calls.values()) == 0
+
+    def test_direction_pins_are_never_written_one_by_one(self):
+        self.firmware.forward(0.5)
+        self.firmware.left_turn(0.5, 60)
+        self.firmware._queue.wait()
+        assert lgpio_mock.calls["gpio_write"] == 0
+
+    def test_unchanged_duty_is_not_rewritten(self):
+        self.firmware.run_plan(compile_plan([MovementCommand(command="forward", ms=500), MovementCommand(command="right", ms=500)]))
+        self.firmware._queue.wait()
+        assert lgpio_mock.calls["tx_pwm"] == 4  # On and off, not again for the turn
+
+
+class TestWaveTiming:
+    def setup_method(self):
+        lgpio_mock.reset_calls()
+        self.firmware = Firmware(gpio=lgpio_mock, clock=VirtualClock(), timing="wave")
+
+    def teardown_method(self):
+        atexit.unregister(self.firmware._cleanup)
+        lgpio_mock.wave_entries = 4096
+        lgpio_mock.free_stops_waves = True
+
+    def test_claims_direction_and_pwm_pins_as_one_group(self):
+        assert lgpio_mock.calls["group_claim_output"] == 1
+        assert lgpio_mock.calls["gpio_claim_output"] == 0
+
+    def test_move_is_submitted_as_one_wave(self):
+        self.firmware.forward(2.0)
+        self.firmware._queue.wait()
+        assert lgpio_mock.waves == [(17, [lgpio_mock.pulse(0b111010, 0b111111, 2_000_000), lgpio_mock.pulse(0, 0b111111, 0)])]
+        assert lgpio_mock.calls["tx_pwm"] == 0
+
+    def test_plan_is_submitted_as_one_wave(self):
+        self.firmware.run_plan(compile_plan([MovementCommand(command="forward", ms=1000), MovementCommand(command="left", ms=500)]))
+        self.firmware._queue.wait()
+        (leader, pulses), = lgpio_mock.waves
+        assert [p.pulse_delay for p in pulses] == [1_000_000, 500_000, 0]
+
+    def test_clear_stops_wave_and_reclaims_group(self):
+        self.firmware.forward(2.0)
+        self.firmware._queue.wait()
+        self.firmware.clear()
+        assert lgpio_mock.calls["group_free"] == 1
+        assert lgpio_mock.calls["group_claim_output"] == 2
+
+    def test_whole_wave_takes_one_queue_entry(self):
+        lgpio_mock.wave_entries = 1
+        self.firmware.forward(0.05, pw=50)
+        self.firmware._queue.wait()
+        (leader, pulses), = lgpio_mock.waves
+        assert len(pulses) == 11
+        assert sum(p.pulse_delay for p in pulses) == 50_000
+
+    def test_wave_waits_for_a_free_queue_entry(self):
+        lgpio_mock.wave_entries = 1
+        self.firmware.clock.auto_advance = False
+        self.firmware._submit_wave(compile_plan([MovementCommand(command="forward", ms=1000)]))
+        self.firmware._submit_wave(compile_plan([MovementCommand(command="left", ms=500)]))
+        assert len(lgpio_mock.waves) == 1
+        lgpio_mock.finish_waves()
+        self.firmware.clock.advance(WAVE_REFILL_S)
+        self.firmware._queue.wait()
+        assert [[p.pulse_delay for p in pulses] for _, pulses in lgpio_mock.waves] == [[1_000_000, 0], [500_000, 0]]
+
+    def test_stop_after_wave_finished_writes_nothing(self):
+        self.firmware.forward(2.0)
+        self.firmware._queue.wait()
+        lgpio_mock.finish_waves()
+        (_, pulses), = lgpio_mock.waves
+        assert pulses[-1].group_bits == 0  # Hardware is stopped, as the cache says
+        self.firmware.stop()
+        assert lgpio_mock.calls["group_free"] == 0
+        assert lgpio_mock.calls["group_claim_output"] == 1
+        assert lgpio_mock.calls["group_write"] == 0
+
+    def test_clear_reports_wave_that_keeps_playing(self, capsys):
+        lgpio_mock.free_stops_waves = False
+        self.firmware.forward(2.0)
+        self.firmware._queue.wait()
+        self.firmware.clear()
+        assert "Wave still playing" in capsys.readouterr().out
+
+    def test_rejects_unknown_timing(self):
+        with pytest.raises(ValueError):
+            Firmware(gpio=lgpio_mock, timing="dma")
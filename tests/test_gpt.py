@@ -0,0 +1,89 @@
+import base64
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from lib.audio_encoding import encode_audio, encode_wav, prepare_upload, trim_silence
+from lib.gpt import GPT
+
+SR = 16000
+
+
+def tone(seconds, amplitude=0.5):
+    t = np.arange(int(SR * seconds)) / SR
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def make_gpt(**kwargs):
+    with patch("lib.gpt.OpenAI"):
+        gpt = GPT("test-key", **kwargs)
+    gpt._client.chat.completions.create.return_value.choices[0].message.content = "[]"
+    return gpt
+
+
+class TestEncodeWav:
+    def test_round_trips_through_soundfile(self):
+        audio = (0.5 * np.sin(np.linspace(0, 100, 16000))).astype(np.float32)
+        decoded, sample_rate = sf.read(io.BytesIO(encode_wav(audio, 16000)), dtype="float32")
+        assert sample_rate == 16000
+        assert np.allclose(decoded, audio, atol=1e-4)
+
+    def test_mp3_is_smaller_than_wav(self):
+        audio = tone(2.0)
+        assert len(encode_audio(audio, SR, "mp3")) < len(encode_wav(audio, SR)) / 4
+
+    def test_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            encode_audio(tone(0.1), SR, "aac")
+
+
+class TestTrimSilence:
+    def test_keeps_margin_around_speech(self):
+        audio = np.concatenate([np.zeros(SR), tone(1.0), np.zeros(SR)])
+        trimmed = trim_silence(audio, SR, margin_ms=100)
+        assert len(trimmed) == int(SR * 1.2)
+
+    def test_silent_audio_is_left_alone(self):
+        audio = np.zeros(SR, dtype=np.float32)
+        assert len(trim_silence(audio, SR)) == SR
+
+    def test_prepare_upload_downmixes(self):
+        stereo = np.stack([tone(0.5), tone(0.5)], axis=1)
+        decoded, _ = sf.read(io.BytesIO(prepare_upload(stereo, SR, trim=False)))
+        assert decoded.ndim == 1
+
+
+class TestChatWithAudio:
+    def test_uploads_audio_encoded_in_memory(self):
+        gpt = make_gpt()
+        audio = np.zeros(1600, dtype=np.float32)
+        assert gpt.chat_with_audio("prompt", audio, 16000) == "[]"
+        messages = gpt._client.chat.completions.create.call_args.kwargs["messages"]
+        uploaded = messages[1]["content"][0]["input_audio"]
+        assert uploaded["format"] == "wav"
+        assert base64.b64decode(uploaded["data"]) == encode_wav(audio, 16000)
+
+    def test_uploads_configured_format(self):
+        gpt = make_gpt(upload_format="mp3")
+        gpt.chat_with_audio("prompt", tone(1.0), SR)
+        messages = gpt._client.chat.completions.create.call_args.kwargs["messages"]
+        assert messages[1]["content"][0]["input_audio"]["format"] == "mp3"
+
+    def test_rejects_formats_the_api_does_not_accept(self):
+        with pytest.raises(ValueError):
+            make_gpt(upload_format="opus")
+
+
+class TestStreaming:
+    def test_chat_stream_yields_content_deltas(self):
+        gpt = make_gpt()
+        deltas = ["[", None, '{"ms": 1}', "]"]
+        gpt._client.chat.completions.create.return_value = iter(
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))]) for delta in deltas
+        )
+        assert list(gpt.chat_stream("prompt", "hello")) == ["[", '{"ms": 1}', "]"]
+        assert gpt._client.chat.completions.create.call_args.kwargs["stream"] is True
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from lib.json_stream import JsonArrayParser
+
+RESPONSE = json.dumps([
+    {"command": "speak", "body": 'Braces {like} these, [and] "quotes" \\ too'},
+    {"command": "forward", "ms": 500},
+])
+
+
+def parse_in_chunks(text, size):
+    parser = JsonArrayParser()
+    elements = []
+    for i in range(0, len(text), size):
+        elements += parser.feed(text[i:i + size])
+    parser.finish()
+    return elements
+
+
+class TestJsonArrayParser:
+    @pytest.mark.parametrize("size", [1, 2, 7, len(RESPONSE)])
+    def test_matches_json_loads_for_any_chunking(self, size):
+        assert parse_in_chunks(RESPONSE, size) == json.loads(RESPONSE)
+
+    def test_emits_object_as_soon_as_it_closes(self):
+        parser = JsonArrayParser()
+        assert parser.feed('[{"command": "forward", "ms": 500}') == [{"command": "forward", "ms": 500}]
+        assert parser.feed(', {"command": "left"') == []
+
+    def test_scalars_and_nested_arrays(self):
+        assert parse_in_chunks('[1, "a,b", [2, [3]], null]', 3) == [1, "a,b", [2, [3]], None]
+
+    def test_ignores_code_fence(self):
+        assert parse_in_chunks('```json\n[{"ms": 1}]\n```', 4) == [{"ms": 1}]
+
+    def test_empty_array(self):
+        assert parse_in_chunks("[ ]", 1) == []
+
+    def test_unterminated_array_raises(self):
+        parser = JsonArrayParser()
+        parser.feed('[{"ms": 1}')
+        with pytest.raises(json.JSONDecodeError):
+            parser.finish()
+
+    def test_non_array_raises(self):
+        parser = JsonArrayParser()
+        parser.feed("not json")
+        with pytest.raises(json.JSONDecodeError):
+            parser.finish()
@@ -0,0 +1,43 @@
+from lib.models import MovementCommand
+from lib.motion_plan import Move, TimelineEvent, compile_plan, merge_moves
+
+
+def moves(*items):
+    return [MovementCommand(command=command, ms=ms) for command, ms in items]
+
+
+class TestMergeMoves:
+    def test_merges_consecutive_same_direction(self):
+        assert merge_moves(moves(("forward", 1000), ("forward", 500), ("left", 200))) == [Move("forward", 1500), Move("left", 200)]
+
+    def test_drops_zero_ms_moves(self):
+        assert merge_moves(moves(("forward", 0), ("left", 200), ("right", 0))) == [Move("left", 200)]
+
+    def test_merges_across_dropped_moves(self):
+        assert merge_moves(moves(("forward", 100), ("left", 0), ("forward", 100))) == [Move("forward", 200)]
+
+
+class TestCompilePlan:
+    def test_single_move_starts_and_stops(self):
+        plan = compile_plan(moves(("forward", 500)))
+        assert plan.events == (
+            TimelineEvent(0, ((1, 1), (3, 1)), 100),
+            TimelineEvent(500, ((1, 0), (3, 0)), 0),
+        )
+        assert plan.duration_ms == 500
+
+    def test_no_stop_between_moves(self):
+        plan = compile_plan(moves(("forward", 1000), ("left", 500)))
+        # forward (0,1,0,1) -> left (0,1,1,0): only pins 23 and 24 change, power stays on
+        assert plan.events[1] == TimelineEvent(1000, ((2, 1), (3, 0)), None)
+        assert plan.events[-1] == TimelineEvent(1500, ((1, 0), (2, 0)), 0)
+
+    def test_fewer_gpio_calls_than_per_command_execution(self):
+        plan = compile_plan(moves(("forward", 1000), ("forward", 1000)))
+        assert len(plan.events) == 2
+        assert plan.gpio_calls == 6  # Start and stop: one group write + two tx_pwm each
+        assert plan.duration_ms == 2000
+
+    def test_empty_plan(self):
+        plan = compile_plan(moves(("forward", 0)))
+        assert plan.events == () and plan.duration_ms == 0
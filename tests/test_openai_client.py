@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lib.gpt import GPT
+from lib.openai_client import SharedOpenAIClient
+
+COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "[]"}, "finish_reason": "stop"}],
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI API stand-in that records connections and requests."""
+
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_HEAD(self):
+        self.server.requests.append(("HEAD", self.path))
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append(("POST", self.path))
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.connections = 0
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, **kwargs):
+    return SharedOpenAIClient("test-key", base_url=f"http://127.0.0.1:{server.server_port}/v1", **kwargs)
+
+
+class TestSharedOpenAIClient:
+    def test_warm_up_connection_is_reused_by_requests(self, server):
+        shared = make_client(server)
+        shared.warm_up()
+        assert server.connections == 1
+        gpt = GPT("test-key", client=shared.client)
+        assert gpt.chat("prompt", "hello") == "[]"
+        assert gpt.chat("prompt", "again") == "[]"
+        assert server.connections == 1
+        assert [method for method, _ in server.requests] == ["HEAD", "POST", "POST"]
+        shared.close()
+
+    def test_keepalive_pings_while_idle(self, server):
+        shared = make_client(server, keepalive_interval=0.05)
+        shared.start_keepalive()
+        time.sleep(0.3)
+        shared.close()
+        assert shared.pings >= 2
+        assert server.connections == 1
+
+    def test_requests_postpone_keepalive_pings(self, server):
+        shared = make_client(server, keepalive_interval=0.2)
+        gpt = GPT("test-key", client=shared.client)
+        shared.start_keepalive()
+        for _ in range(5):
+            gpt.chat("prompt", "hello")
+            time.sleep(0.05)
+        shared.close()
+        assert shared.pings == 0
+
+    def test_ping_failure_does_not_raise(self):
+        shared = SharedOpenAIClient("test-key", base_url="http://127.0.0.1:9/v1")
+        assert not shared.ping()
+        shared.close()
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from lib.piper_engine import PiperEngine
+
+
+def make_voice(sentences):
+    voice = MagicMock(config=SimpleNamespace(sample_rate=22050))
+    voice.synthesize.side_effect = lambda text: iter(
+        SimpleNamespace(audio_float_array=np.full(n, 0.5)) for n in sentences
+    )
+    return voice
+
+
+class TestPiperEngine:
+    def test_voice_is_loaded_once(self):
+        voice = make_voice([10])
+        engine = PiperEngine("voice.onnx", voice=voice)
+        engine.synthesize("one")
+        engine.synthesize("two")
+        assert voice.synthesize.call_count == 2
+        assert engine.sample_rate == 22050
+        engine.close()
+
+    def test_stream_yields_one_buffer_per_sentence(self):
+        engine = PiperEngine("voice.onnx", voice=make_voice([100, 200]))
+        buffers = list(engine.stream("Hello. World."))
+        assert [len(b) for b in buffers] == [100, 200]
+        assert buffers[0].dtype == np.float32
+        engine.close()
+
+    def test_synthesis_errors_are_raised_to_the_caller(self):
+        voice = make_voice([])
+        voice.synthesize.side_effect = [RuntimeError("bad phonemes"), iter([])]
+        engine = PiperEngine("voice.onnx", voice=voice)
+        with pytest.raises(RuntimeError):
+            engine.synthesize("Hello")
+        assert len(engine.synthesize("Still working")) == 0  # The worker survives the error
+        engine.close()
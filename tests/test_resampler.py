@@ -0,0 +1,46 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from lib.resampler import StreamingResampler
+
+
+def resample_whole(audio, orig, target):
+    ratio = Fraction(target, orig)
+    return signal.resample_poly(audio, ratio.numerator, ratio.denominator)
+
+
+class TestStreamingResampler:
+    @pytest.mark.parametrize("orig", [44100, 48000, 8000, 22050])
+    def test_matches_whole_signal_resampling(self, orig):
+        rng = np.random.default_rng(0)
+        audio = rng.standard_normal(orig).astype(np.float32)
+        resampler = StreamingResampler(orig, 16000)
+        blocks, i = [], 0
+        while i < len(audio):
+            size = int(rng.integers(1, 1500))
+            blocks.append(resampler.process(audio[i:i + size]))
+            i += size
+        blocks.append(resampler.flush())
+        streamed = np.concatenate(blocks)
+        expected = resample_whole(audio, orig, 16000)
+        assert len(streamed) == len(expected)
+        assert np.allclose(streamed, expected, atol=1e-5)
+
+    def test_output_keeps_up_with_input(self):
+        resampler = StreamingResampler(48000, 16000)
+        produced = sum(len(resampler.process(np.zeros(960, dtype=np.float32))) for _ in range(50))
+        # Only the filter delay (a few samples) is held back
+        assert 16000 - 20 <= produced <= 16000
+
+    def test_reset_forgets_history(self):
+        resampler = StreamingResampler(48000, 16000)
+        resampler.process(np.ones(4800, dtype=np.float32))
+        resampler.reset()
+        out = resampler.process(np.zeros(4800, dtype=np.float32))
+        assert not out.any()
+
+    def test_output_is_float32(self):
+        assert StreamingResampler(44100, 16000).process(np.zeros(441, dtype=np.float32)).dtype == np.float32
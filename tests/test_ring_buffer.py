@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from lib.ring_buffer import RingBuffer
+
+
+def samples(start, count):
+    return np.arange(start, start + count, dtype=np.float32)
+
+
+class TestRingBuffer:
+    def test_view_returns_written_samples(self):
+        ring = RingBuffer(8)
+        ring.write(samples(0, 5))
+        assert np.array_equal(ring.view(1, 4), samples(1, 3))
+        assert ring.written == 5
+
+    def test_view_is_contiguous_across_wrap_around(self):
+        ring = RingBuffer(8)
+        ring.write(samples(0, 6))
+        ring.write(samples(6, 6))
+        view = ring.view(4, 12)
+        assert np.array_equal(view, samples(4, 8))
+        assert view.base is not None  # A view, not a copy
+
+    def test_view_is_read_only(self):
+        ring = RingBuffer(8)
+        ring.write(samples(0, 4))
+        with pytest.raises(ValueError):
+            ring.view(0, 4)[0] = 1.0
+
+    def test_overwritten_samples_are_unavailable(self):
+        ring = RingBuffer(8)
+        ring.write(samples(0, 12))
+        assert ring.oldest() == 4
+        with pytest.raises(ValueError):
+            ring.view(3, 6)
+
+    def test_unwritten_samples_are_unavailable(self):
+        ring = RingBuffer(8)
+        ring.write(samples(0, 4))
+        with pytest.raises(ValueError):
+            ring.view(2, 5)
+
+    def test_block_larger_than_capacity_keeps_the_tail(self):
+        ring = RingBuffer(4)
+        ring.write(samples(0, 10))
+        assert ring.written == 10
+        assert np.array_equal(ring.view(6, 10), samples(6, 4))
+
+    def test_many_small_writes(self):
+        ring = RingBuffer(16)
+        for start in range(0, 100, 3):
+            ring.write(samples(start, 3))
+        assert np.array_equal(ring.view(ring.oldest(), ring.written), samples(ring.oldest(), 16))
+
+    def test_rejects_non_positive_capacity(self):
+        with pytest.raises(ValueError):
+            RingBuffer(0)
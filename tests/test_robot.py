@@ -1,8 +1,11 @@
 import json
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import MagicMock, call
 
 import numpy as np
+import pytest
 
+from lib.models import MovementCommand
+from lib.motion_plan import compile_plan
 from lib.robot import Robot
 
 FAKE_AUDIO = (np.zeros(16000), 16000)
@@ -15,6 +18,13 @@ def make_gpt(response=None):
     )
 
 
+def make_streaming_gpt(chunks):
+    return MagicMock(
+        chat_with_audio_stream=MagicMock(side_effect=lambda *args: iter(chunks)),
+        chat_stream=MagicMock(side_effect=lambda *args: iter(chunks)),
+    )
+
+
 def make_source(audio_items=None):
     return MagicMock(
         __iter__=MagicMock(return_value=iter(audio_items or [FAKE_AUDIO]))
@@ -25,7 +35,29 @@ def make_transcriber(text=None):
     return MagicMock(transcribe=MagicMock(return_value=text))
 
 
-def make_robot(gpt=None, source=None, tts=None, firmware=None, transcriber=None, stt="openai"):
+def make_streaming_source(items):
+    return MagicMock(stream=MagicMock(return_value=iter(items)))
+
+
+def plan(*moves):
+    return compile_plan([MovementCommand(command=command, ms=ms) for command, ms in moves])
+
+
+class FakeTTS:
+    """Plain stand-in for TextToSpeech: a TTS method Robot needs but this lacks fails loudly."""
+
+    def __init__(self):
+        self.spoken = []
+        self.stopped = False
+
+    def speak(self, text: str, voice: str = "alloy") -> None:
+        self.spoken.append(text)
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+def make_robot(gpt=None, source=None, tts=None, firmware=None, transcriber=None, stt="openai", streaming=False, stream_llm=False, debug_recorder=None):
     return Robot(
         tts=tts if tts is not None else MagicMock(),
         system_prompt="test prompt",
@@ -34,32 +66,34 @@ def make_robot(gpt=None, source=None, tts=None, firmware=None, transcriber=None,
         firmware=firmware if firmware is not None else MagicMock(),
         transcriber=transcriber if transcriber is not None else make_transcriber(),
         stt=stt,
+        streaming=streaming,
+        stream_llm=stream_llm,
+        debug_recorder=debug_recorder,
     )
 
 
-@patch("lib.robot.soundfile.write")
 class TestRun:
-    def test_forward(self, mock_write):
+    def test_forward(self):
         robot = make_robot(gpt=make_gpt(json.dumps([{"command": "forward", "ms": 500}])))
         robot.run()
-        robot.firmware.forward.assert_called_once_with(0.5)
+        robot.firmware.run_plan.assert_called_once_with(plan(("forward", 500)))
 
-    def test_backward(self, mock_write):
+    def test_backward(self):
         robot = make_robot(gpt=make_gpt(json.dumps([{"command": "backward", "ms": 1000}])))
         robot.run()
-        robot.firmware.reverse.assert_called_once_with(1.0)
+        robot.firmware.run_plan.assert_called_once_with(plan(("backward", 1000)))
 
-    def test_left(self, mock_write):
+    def test_left(self):
         robot = make_robot(gpt=make_gpt(json.dumps([{"command": "left", "ms": 300}])))
         robot.run()
-        robot.firmware.left_turn.assert_called_once_with(0.3)
+        robot.firmware.run_plan.assert_called_once_with(plan(("left", 300)))
 
-    def test_right(self, mock_write):
+    def test_right(self):
         robot = make_robot(gpt=make_gpt(json.dumps([{"command": "right", "ms": 200}])))
         robot.run()
-        robot.firmware.right_turn.assert_called_once_with(0.2)
+        robot.firmware.run_plan.assert_called_once_with(plan(("right", 200)))
 
-    def test_speak_pauses_and_resumes_source(self, mock_write):
+    def test_speak_pauses_and_resumes_source(self):
         tts = MagicMock()
         source = make_source()
         robot = make_robot(gpt=make_gpt(json.dumps([{"command": "speak", "body": "Hello"}])), tts=tts, source=source)
@@ -68,20 +102,34 @@ class TestRun:
         tts.speak.assert_called_once_with("Hello")
         source.resume.assert_called_once()
 
-    def test_speak_resumes_even_if_tts_raises(self, mock_write):
+    def test_speak_resumes_even_if_tts_raises(self):
         tts = MagicMock(speak=MagicMock(side_effect=RuntimeError("TTS failed")))
         source = make_source()
         robot = make_robot(gpt=make_gpt(json.dumps([{"command": "speak", "body": "Hello"}])), tts=tts, source=source)
         robot.run()
         source.resume.assert_called_once()
 
-    def test_clears_firmware_before_executing(self, mock_write):
+    def test_runs_with_tts_implementing_only_the_interface(self):
+        tts = FakeTTS()
+        robot = make_robot(gpt=make_gpt(json.dumps([{"command": "speak", "body": "Hello"}])), tts=tts)
+        robot.run()
+        assert tts.spoken == ["Hello"]
+        assert tts.stopped
+
+    def test_interrupt_mid_speech_stops_playback(self):
+        tts = MagicMock(speak=MagicMock(side_effect=KeyboardInterrupt))
+        robot = make_robot(gpt=make_gpt(json.dumps([{"command": "speak", "body": "Hello"}])), tts=tts)
+        with pytest.raises(KeyboardInterrupt):
+            robot.run()
+        tts.stop.assert_called_once()
+
+    def test_clears_firmware_before_executing(self):
         firmware = MagicMock()
         robot = make_robot(gpt=make_gpt(json.dumps([{"command": "forward", "ms": 100}])), firmware=firmware)
         robot.run()
         assert firmware.mock_calls[0] == call.clear()
 
-    def test_multiple_commands_in_order(self, mock_write):
+    def test_multiple_commands_in_order(self):
         tts = MagicMock()
         firmware = MagicMock()
         robot = make_robot(
@@ -90,39 +138,132 @@ class TestRun:
             firmware=firmware,
         )
         robot.run()
-        firmware.forward.assert_called_once_with(0.5)
+        firmware.run_plan.assert_called_once_with(plan(("forward", 500)))
         tts.speak.assert_called_once_with("Done")
 
-    def test_invalid_json_does_not_raise(self, mock_write):
-        robot = make_robot(gpt=make_gpt("not json"))
+    def test_moves_are_compiled_into_one_plan(self):
+        firmware = MagicMock()
+        response = [{"command": "forward", "ms": 1000}, {"command": "forward", "ms": 1000}, {"command": "left", "ms": 0}, {"command": "right", "ms": 300}]
+        robot = make_robot(gpt=make_gpt(json.dumps(response)), firmware=firmware)
         robot.run()
+        firmware.run_plan.assert_called_once_with(plan(("forward", 2000), ("right", 300)))
 
-    def test_invalid_command_does_not_raise(self, mock_write):
-        robot = make_robot(gpt=make_gpt(json.dumps([{"command": "fly", "ms": 100}])))
+    def test_speak_splits_motion_plans(self):
+        manager = MagicMock()
+        response = [{"command": "forward", "ms": 500}, {"command": "speak", "body": "Turning"}, {"command": "left", "ms": 300}]
+        robot = make_robot(gpt=make_gpt(json.dumps(response)), firmware=manager.firmware, tts=manager.tts)
         robot.run()
+        assert [c for c in manager.mock_calls if c[0] in ("firmware.run_plan", "tts.speak")] == [
+            call.firmware.run_plan(plan(("forward", 500))),
+            call.tts.speak("Turning"),
+            call.firmware.run_plan(plan(("left", 300))),
+        ]
 
-    def test_audio_written_to_tmp_file(self, mock_write):
-        robot = make_robot(gpt=make_gpt(json.dumps([])))
+    def test_invalid_json_does_not_raise(self):
+        robot = make_robot(gpt=make_gpt("not json"))
         robot.run()
-        mock_write.assert_called_once()
-        assert mock_write.call_args[0][0] == "/tmp/robot_command.wav"
 
-    def test_gpt_called_with_system_prompt(self, mock_write):
+    def test_invalid_command_does_not_raise(self):
+        robot = make_robot(gpt=make_gpt(json.dumps([{"command": "fly", "ms": 100}])))
+        robot.run()
+
+    def test_gpt_called_with_system_prompt_and_audio(self):
         gpt = make_gpt(json.dumps([]))
         robot = make_robot(gpt=gpt)
         robot.run()
-        gpt.chat_with_audio.assert_called_once_with("test prompt", "/tmp/robot_command.wav")
+        gpt.chat_with_audio.assert_called_once_with("test prompt", FAKE_AUDIO[0], FAKE_AUDIO[1])
 
-    def test_whisper_transcribes_and_executes(self, mock_write):
+    def test_whisper_transcribes_and_executes(self):
         gpt = make_gpt(json.dumps([{"command": "forward", "ms": 500}]))
         firmware = MagicMock()
         robot = make_robot(gpt=gpt, firmware=firmware, transcriber=make_transcriber("move forward"), stt="whisper")
         robot.run()
         gpt.chat.assert_called_once_with("test prompt", "move forward")
-        firmware.forward.assert_called_once_with(0.5)
+        firmware.run_plan.assert_called_once_with(plan(("forward", 500)))
 
-    def test_whisper_skips_empty_transcription(self, mock_write):
+    def test_whisper_skips_empty_transcription(self):
         gpt = make_gpt()
         robot = make_robot(gpt=gpt, transcriber=make_transcriber(None), stt="whisper")
         robot.run()
         gpt.chat.assert_not_called()
+
+    def test_whisper_streaming_feeds_partials_then_finishes(self):
+        gpt = make_gpt(json.dumps([{"command": "forward", "ms": 500}]))
+        stream = MagicMock(finish=MagicMock(return_value="move forward"))
+        transcriber = MagicMock(start_stream=MagicMock(return_value=stream))
+        partial, final = np.zeros(16000), np.zeros(32000)
+        source = make_streaming_source([(partial, 16000, False), (final, 16000, True)])
+        robot = make_robot(gpt=gpt, source=source, transcriber=transcriber, stt="whisper", streaming=True)
+        robot.run()
+        transcriber.start_stream.assert_called_once_with(16000)
+        stream.feed.assert_called_once_with(partial)
+        stream.finish.assert_called_once_with(final)
+        gpt.chat.assert_called_once_with("test prompt", "move forward")
+
+    def test_whisper_streaming_starts_new_stream_per_utterance(self):
+        gpt = make_gpt(json.dumps([]))
+        transcriber = MagicMock(start_stream=MagicMock(return_value=MagicMock(finish=MagicMock(return_value=None))))
+        source = make_streaming_source([(np.zeros(16000), 16000, True), (np.zeros(16000), 16000, True)])
+        robot = make_robot(gpt=gpt, source=source, transcriber=transcriber, stt="whisper", streaming=True)
+        robot.run()
+        assert transcriber.start_stream.call_count == 2
+        gpt.chat.assert_not_called()
+
+    def test_whisper_streaming_drops_stream_of_abandoned_utterance(self):
+        gpt = make_gpt(json.dumps([]))
+        stale, fresh = MagicMock(), MagicMock(finish=MagicMock(return_value=None))
+        transcriber = MagicMock(start_stream=MagicMock(side_effect=[stale, fresh]))
+        partial_a, final_b = np.ones(16000), np.zeros(32000)
+        source = make_streaming_source([(partial_a, 16000, False), (final_b, 16000, True)])
+        robot = make_robot(gpt=gpt, source=source, transcriber=transcriber, stt="whisper", streaming=True)
+        robot.run()
+        stale.finish.assert_not_called()
+        fresh.feed.assert_not_called()
+        fresh.finish.assert_called_once_with(final_b)
+
+    def test_debug_recorder_gets_final_utterances_only(self):
+        recorder = MagicMock()
+        transcriber = MagicMock(start_stream=MagicMock(return_value=MagicMock(finish=MagicMock(return_value=None))))
+        partial, final = np.zeros(16000), np.zeros(32000)
+        source = make_streaming_source([(partial, 16000, False), (final, 16000, True)])
+        robot = make_robot(source=source, transcriber=transcriber, stt="whisper", streaming=True, debug_recorder=recorder)
+        robot.run()
+        recorder.record.assert_called_once_with(final, 16000)
+
+
+class TestStreamingResponse:
+    def test_executes_commands_before_response_completes(self):
+        firmware = MagicMock()
+
+        def chunks():
+            yield '[{"command": "forward", '
+            yield '"ms": 500}, {"command": "le'
+            firmware.forward.assert_called_once_with(0.5)
+            yield 'ft", "ms": 300}]'
+
+        gpt = MagicMock(chat_with_audio_stream=MagicMock(return_value=chunks()))
+        robot = make_robot(gpt=gpt, firmware=firmware, stream_llm=True)
+        robot.run()
+        gpt.chat_with_audio_stream.assert_called_once_with("test prompt", FAKE_AUDIO[0], FAKE_AUDIO[1])
+        firmware.left_turn.assert_called_once_with(0.3)
+        assert firmware.mock_calls[0] == call.clear()
+
+    def test_whisper_uses_chat_stream(self):
+        gpt = make_streaming_gpt(['[{"command": "speak", ', '"body": "Hi"}]'])
+        tts = MagicMock()
+        robot = make_robot(gpt=gpt, tts=tts, transcriber=make_transcriber("hello"), stt="whisper", stream_llm=True)
+        robot.run()
+        gpt.chat_stream.assert_called_once_with("test prompt", "hello")
+        tts.speak.assert_called_once_with("Hi")
+
+    def test_invalid_command_stops_execution(self):
+        firmware = MagicMock()
+        gpt = make_streaming_gpt(['[{"command": "forward", "ms": 100}, ', '{"command": "fly", "ms": 1}, ', '{"command": "left", "ms": 100}]'])
+        robot = make_robot(gpt=gpt, firmware=firmware, stream_llm=True)
+        robot.run()
+        firmware.forward.assert_called_once_with(0.1)
+        firmware.left_turn.assert_not_called()
+
+    def test_truncated_response_does_not_raise(self):
+        robot = make_robot(gpt=make_streaming_gpt(['[{"command": "forward", "ms": 100}']), stream_llm=True)
+        robot.run()
@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from lib.clock import VirtualClock
+from lib.sources import FileSource, CorpusSource
+
+
+def speech_file(path, sample_rate=16000, pattern=(0, 1, 0, 1, 1, 0)):
+    """Write a file alternating 1s of silence (0) and 1s of tone (1)."""
+    t = np.arange(sample_rate) / sample_rate
+    tone = 0.1 * np.sin(2 * np.pi * 220 * t)
+    silence = np.zeros(sample_rate)
+    sf.write(path, np.concatenate([tone if p else silence for p in pattern]), sample_rate)
+    return path
+
+
+class TestFileSource:
+    def test_yields_one_segment_per_utterance(self, tmp_path):
+        segments = list(FileSource(speech_file(tmp_path / "a.wav")))
+        assert len(segments) == 2
+        assert all(sr == 16000 for _, sr in segments)
+
+    def test_resamples_to_16k(self, tmp_path):
+        segments = list(FileSource(speech_file(tmp_path / "a.wav", sample_rate=44100)))
+        assert len(segments) == 2
+        assert all(sr == 16000 for _, sr in segments)
+        # 1s of tone + pre-roll + hangover
+        assert 1.9 < len(segments[0][0]) / 16000 < 2.3
+
+    def test_delivers_speech_still_in_progress_at_end_of_file(self, tmp_path):
+        segments = list(FileSource(speech_file(tmp_path / "a.wav", pattern=(0, 1, 1))))
+        assert len(segments) == 1
+
+    def test_realtime_paces_on_clock(self, tmp_path):
+        clock = VirtualClock()
+        segments = list(FileSource(speech_file(tmp_path / "a.wav"), realtime=True, clock=clock))
+        assert len(segments) == 2
+        assert clock.now() == pytest.approx(6.0, abs=0.05)
+
+    def test_whole_files(self, tmp_path):
+        paths = [speech_file(tmp_path / "a.wav"), speech_file(tmp_path / "b.wav", sample_rate=48000)]
+        segments = list(FileSource(paths, segment=False))
+        assert [len(audio) for audio, _ in segments] == [6 * 16000, 6 * 16000]
+
+    def test_stream_yields_partials_before_final(self, tmp_path):
+        items = list(FileSource(speech_file(tmp_path / "a.wav", pattern=(0, 1, 1, 1, 0))).stream())
+        finals = [final for _, _, final in items]
+        assert finals[-1] is True
+        assert finals.count(True) == 1
+        assert finals.count(False) >= 2
+
+
+class TestCorpusSource:
+    def test_directory(self, tmp_path):
+        speech_file(tmp_path / "b.wav")
+        (tmp_path / "sub").mkdir()
+        speech_file(tmp_path / "sub" / "a.flac")
+        (tmp_path / "notes.txt").write_text("ignored")
+        source = CorpusSource(tmp_path)
+        assert [p.name for p in source.paths] == ["b.wav", "a.flac"]
+        assert len(list(source)) == 4
+
+    def test_manifest(self, tmp_path):
+        speech_file(tmp_path / "a.wav")
+        speech_file(tmp_path / "b.wav")
+        manifest = tmp_path / "manifest.jsonl"
+        manifest.write_text(
+            json.dumps({"path": "a.wav", "text": "go forward"}) + "\n" + json.dumps({"path": "b.wav"}) + "\n"
+        )
+        source = CorpusSource(manifest, segment=False)
+        assert source.paths == [tmp_path / "a.wav", tmp_path / "b.wav"]
+        assert source.transcripts == {tmp_path / "a.wav": "go forward"}
+        assert len(list(source)) == 2
+
+    def test_empty_corpus_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            CorpusSource(tmp_path)
@@ -0,0 +1,103 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from lib.sttt import SpeechToTextTranscriber, get_whisper_profile
+
+
+def segment(text, start, end):
+    return SimpleNamespace(text=text, start=start, end=end)
+
+
+def make_transcriber(*decodes):
+    with patch("lib.sttt.WhisperModel"):
+        transcriber = SpeechToTextTranscriber("en", warm_up=False)
+        transcriber.model  # Wait for the background load while WhisperModel is patched
+    transcriber.model.transcribe.side_effect = [(iter(segments), None) for segments in decodes]
+    return transcriber
+
+
+class TestTranscriptionStream:
+    def test_commits_segments_away_from_window_edge(self):
+        transcriber = make_transcriber(
+            [segment(" Go forward.", 0.0, 1.0), segment(" Then", 1.2, 2.8)],
+            [segment("then turn left.", 0.0, 1.5)],
+        )
+        stream = transcriber.start_stream(16000)
+        stream.feed(np.zeros(3 * 16000))
+        final = np.zeros(4 * 16000)
+        assert stream.finish(final) == "Go forward. then turn left."
+        # Only the audio after the committed segment is decoded again
+        tail = transcriber.model.transcribe.call_args_list[1][0][0]
+        assert len(tail) == 3 * 16000
+
+    def test_does_not_commit_last_segment(self):
+        transcriber = make_transcriber(
+            [segment(" Hello", 0.0, 0.5)],
+            [segment(" Hello there.", 0.0, 2.0)],
+        )
+        stream = transcriber.start_stream(16000)
+        stream.feed(np.zeros(3 * 16000))
+        assert stream.finish(np.zeros(4 * 16000)) == "Hello there."
+
+    def test_skips_short_windows(self):
+        transcriber = make_transcriber([segment(" Hi", 0.0, 0.5)])
+        stream = transcriber.start_stream(16000)
+        stream.feed(np.zeros(8000))
+        transcriber.model.transcribe.assert_not_called()
+        assert stream.finish(np.zeros(8000)) == "Hi"
+
+    def test_empty_transcription_returns_none(self):
+        transcriber = make_transcriber([])
+        stream = transcriber.start_stream(16000)
+        assert stream.finish(np.zeros(16000)) is None
+
+
+class TestBackgroundLoad:
+    def test_constructor_does_not_wait_for_model(self):
+        loaded = threading.Event()
+        with patch("lib.sttt.WhisperModel", side_effect=lambda *args, **kwargs: loaded.wait(1.0) and MagicMock()):
+            transcriber = SpeechToTextTranscriber("en", warm_up=False)
+            assert not transcriber.ready
+            loaded.set()
+            assert transcriber.model is not None
+            assert transcriber.ready
+
+    def test_warm_up_decodes_silence(self):
+        with patch("lib.sttt.WhisperModel") as whisper_model:
+            whisper_model.return_value.transcribe.return_value = (iter([]), None)
+            transcriber = SpeechToTextTranscriber("en")
+            model = transcriber.model
+        audio = model.transcribe.call_args[0][0]
+        assert not audio.any() and len(audio) == 16000
+
+    def test_load_failure_makes_transcribe_return_none(self):
+        with patch("lib.sttt.WhisperModel", side_effect=RuntimeError("model missing")):
+            transcriber = SpeechToTextTranscriber("en")
+            assert transcriber.transcribe(np.zeros(16000), 16000) is None
+
+
+class TestWhisperProfiles:
+    def test_default_profile_matches_previous_settings(self):
+        profile = get_whisper_profile()
+        assert (profile.model, profile.compute_type, profile.cpu_threads, profile.num_workers) == ("small", "int8", 4, 1)
+
+    def test_overrides(self):
+        profile = get_whisper_profile("tiny", compute_type="int8_float32", cpu_threads=2)
+        assert (profile.model, profile.compute_type, profile.cpu_threads) == ("tiny", "int8_float32", 2)
+
+    def test_rejects_unknown_profile_and_compute_type(self):
+        with pytest.raises(ValueError):
+            get_whisper_profile("huge")
+        with pytest.raises(ValueError):
+            get_whisper_profile("tiny", compute_type="float16")
+
+    def test_profile_is_passed_to_whisper(self):
+        with patch("lib.sttt.WhisperModel") as whisper_model:
+            transcriber = SpeechToTextTranscriber("en", warm_up=False, profile=get_whisper_profile("distil", cpu_threads=2))
+            transcriber.model
+        assert whisper_model.call_args[0][0] == "distil-small.en"
+        assert whisper_model.call_args.kwargs["cpu_threads"] == 2
@@ -0,0 +1,119 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from lib.tts import TextToSpeech, OPENAI_TTS_SAMPLE_RATE, split_sentences
+from lib.tts_cache import TTSCache
+
+
+def make_tts(backend="openai", piper=None, cache=None):
+    output = MagicMock(played=[])
+    output.play.side_effect = lambda blocks, sample_rate: output.played.extend(blocks)
+    with patch("lib.tts.get_audio_device", return_value=1):
+        tts = TextToSpeech(backend=backend, client=MagicMock(), output=output, piper=piper, cache=cache)
+    return tts, output
+
+
+class TestSplitSentences:
+    def test_splits_on_sentence_ends(self):
+        assert split_sentences("I moved forward two meters. Now turning left! Ready?") == [
+            "I moved forward two meters.",
+            "Now turning left! Ready?",
+        ]
+
+    def test_merges_short_sentences(self):
+        assert split_sentences("Okay. Moving forward now.") == ["Okay. Moving forward now."]
+
+    def test_splits_long_sentences_at_clauses(self):
+        text = ", ".join(["this clause is about thirty chars"] * 6) + "."
+        chunks = split_sentences(text)
+        assert len(chunks) == 6
+        assert " ".join(chunks) == text
+
+
+class TestPipeline:
+    def test_next_sentence_is_synthesized_while_first_plays(self):
+        second_started = threading.Event()
+
+        def stream(text):
+            if text.startswith("Second"):
+                second_started.set()
+            return iter([np.zeros(10, dtype=np.float32)])
+
+        piper = MagicMock(sample_rate=22050, stream=MagicMock(side_effect=stream))
+        tts, output = make_tts("piper", piper=piper)
+
+        def play(blocks, sample_rate):
+            blocks = iter(blocks)
+            output.played.append(next(blocks))
+            assert second_started.wait(1.0)  # Still playing the first sentence
+            output.played.extend(blocks)
+
+        output.play.side_effect = play
+        tts.speak("First sentence is here. Second sentence follows.")
+        assert [c.args[0] for c in piper.stream.call_args_list] == ["First sentence is here.", "Second sentence follows."]
+        assert len(output.played) == 2
+        output.play.assert_called_once()
+
+    def test_plays_sentences_in_order(self):
+        def stream(text):
+            value = 0.1 if text.startswith("First") else 0.2
+            return iter([np.full(10, value, dtype=np.float32)])
+
+        piper = MagicMock(sample_rate=22050, stream=MagicMock(side_effect=stream))
+        tts, output = make_tts("piper", piper=piper)
+        tts.speak("First sentence is here. Second sentence follows.")
+        assert [block[0] for block in output.played] == [np.float32(0.1), np.float32(0.2)]
+
+    def test_synthesis_error_stops_playback(self):
+        piper = MagicMock(sample_rate=22050, stream=MagicMock(side_effect=RuntimeError("voice crashed")))
+        tts, output = make_tts("piper", piper=piper)
+        tts.speak("Hello there, robot friend.")
+        assert output.played == []
+
+
+class TestOpenAI:
+    def test_streams_pcm_into_output(self):
+        tts, output = make_tts()
+        response = tts._client.audio.speech.with_streaming_response.create.return_value.__enter__.return_value
+        response.iter_bytes.return_value = iter([b"\x00\x00\x00", b"\x40\x00\x00"])
+        tts.speak("Hello")
+        kwargs = tts._client.audio.speech.with_streaming_response.create.call_args.kwargs
+        assert kwargs["response_format"] == "pcm"
+        assert output.play.call_args[0][1] == OPENAI_TTS_SAMPLE_RATE
+        assert np.allclose(np.concatenate(output.played), [0.0, 0.5, 0.0])
+
+    def test_skips_empty_text(self):
+        tts, output = make_tts()
+        tts.speak("  ")
+        output.play.assert_not_called()
+
+
+class TestPiper:
+    def test_plays_resident_engine_output(self):
+        piper = MagicMock(sample_rate=22050, stream=MagicMock(return_value=iter([np.zeros(100), np.zeros(50)])))
+        tts, output = make_tts("piper", piper=piper)
+        tts.speak("Hello")
+        piper.stream.assert_called_once_with("Hello")
+        assert output.play.call_args[0][1] == 22050
+        assert len(np.concatenate(output.played)) == 150
+
+
+class TestCache:
+    def test_repeated_phrase_is_synthesized_once(self, tmp_path):
+        piper = MagicMock(sample_rate=22050, model_path="voice.onnx")
+        piper.stream.side_effect = lambda text: iter([np.full(100, 0.25, dtype=np.float32)])
+        tts, output = make_tts("piper", piper=piper, cache=TTSCache(tmp_path))
+        tts.speak("Hello")
+        tts.speak("Hello")
+        piper.stream.assert_called_once_with("Hello")
+        assert output.play.call_count == 2
+        assert output.play.call_args[0][1] == 22050
+        assert (tts.cache.hits, tts.cache.misses) == (1, 1)
+
+    def test_failed_synthesis_is_not_cached(self, tmp_path):
+        tts, output = make_tts(cache=TTSCache(tmp_path))
+        tts._client.audio.speech.with_streaming_response.create.side_effect = RuntimeError("offline")
+        tts.speak("Hello")
+        assert tts.cache.stats()["disk_bytes"] == 0
@@ -0,0 +1,69 @@
+import numpy as np
+
+from lib.tts_cache import TTSCache, cache_key
+
+
+def clip(seconds, value=0.5):
+    return np.full(int(24000 * seconds), value, dtype=np.float32)
+
+
+class TestCacheKey:
+    def test_depends_on_every_field(self):
+        key = cache_key("openai", "alloy", "tts-1", "Hello")
+        assert key == cache_key("openai", "alloy", "tts-1", "Hello")
+        assert key != cache_key("openai", "echo", "tts-1", "Hello")
+        assert key != cache_key("piper", "alloy", "tts-1", "Hello")
+        assert key != cache_key("openai", "alloy", "tts-1", "Hello!")
+
+
+class TestTTSCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = TTSCache(tmp_path)
+        assert cache.get("a") is None
+        cache.put("a", clip(0.1), 24000)
+        audio, sample_rate = cache.get("a")
+        assert sample_rate == 24000 and len(audio) == 2400
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_memory_evicts_least_recently_used(self, tmp_path):
+        cache = TTSCache(tmp_path, memory_bytes=2 * clip(0.1).nbytes, disk_bytes=0)
+        cache.put("a", clip(0.1), 24000)
+        cache.put("b", clip(0.1), 24000)
+        cache.get("a")
+        cache.put("c", clip(0.1), 24000)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+
+    def test_disk_survives_restart(self, tmp_path):
+        TTSCache(tmp_path).put("a", clip(0.1), 24000)
+        cache = TTSCache(tmp_path)
+        audio, sample_rate = cache.get("a")
+        assert sample_rate == 24000
+        assert np.allclose(audio, 0.5, atol=1e-4)
+        assert cache.disk_hits == 1
+
+    def test_disk_is_size_capped(self, tmp_path):
+        one_clip = 44 + 2 * 2400  # WAV header + 16-bit samples
+        cache = TTSCache(tmp_path, memory_bytes=0, disk_bytes=2 * one_clip)
+        for key in "abc":
+            cache.put(key, clip(0.1), 24000)
+        assert sorted(path.stem for path in tmp_path.glob("*.wav")) == ["b", "c"]
+        assert cache.stats()["disk_bytes"] <= 2 * one_clip
+
+    def test_memory_hits_keep_phrase_on_disk(self, tmp_path):
+        one_clip = 44 + 2 * 2400
+        cache = TTSCache(tmp_path, disk_bytes=2 * one_clip)
+        cache.put("a", clip(0.1), 24000)
+        cache.put("b", clip(0.1), 24000)
+        for _ in range(100):
+            cache.get("a")
+        cache.put("c", clip(0.1), 24000)
+        assert sorted(path.stem for path in tmp_path.glob("*.wav")) == ["a", "c"]
+        assert TTSCache(tmp_path).get("a") is not None
+
+    def test_deleted_file_is_a_miss(self, tmp_path):
+        TTSCache(tmp_path).put("a", clip(0.1), 24000)
+        cache = TTSCache(tmp_path)
+        (tmp_path / "a.wav").unlink()
+        assert cache.get("a") is None
+        assert cache.stats()["disk_bytes"] == 0
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from lib.vad import VoiceActivityDetector, EnergyScorer, SpectralFlatnessScorer, create_scorer
+
+SR = 16000
+FRAME = SR * 20 // 1000
+
+
+def tone(ms, amplitude=0.1):
+    t = np.arange(SR * ms // 1000) / SR
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(ms):
+    return np.zeros(SR * ms // 1000, dtype=np.float32)
+
+
+def make_vad(**kwargs):
+    return VoiceActivityDetector(SR, EnergyScorer(0.01), **kwargs)
+
+
+class TestVoiceActivityDetector:
+    def test_one_decision_per_complete_frame(self):
+        vad = make_vad()
+        assert len(vad.process(silence(50))) == 2
+        assert len(vad.process(silence(30))) == 2  # 10ms carried over from the previous call
+        assert vad.frames_processed == 4
+
+    def test_decisions_do_not_depend_on_block_size(self):
+        audio = np.concatenate([silence(200), tone(400), silence(1000)])
+        whole = make_vad().process(audio)
+        vad = make_vad()
+        chunked = np.concatenate([vad.process(audio[i:i + 137]) for i in range(0, len(audio), 137)])
+        assert np.array_equal(whole, chunked)
+
+    def test_attack_rejects_short_clicks(self):
+        vad = make_vad(attack_ms=60)
+        decisions = vad.process(np.concatenate([silence(100), tone(40), silence(100)]))
+        assert not decisions.any()
+
+    def test_hangover_keeps_speech_through_short_pauses(self):
+        vad = make_vad(hangover_ms=200)
+        decisions = vad.process(np.concatenate([tone(200), silence(100), tone(200)]))
+        assert decisions[3:].all()
+
+    def test_speech_ends_after_hangover(self):
+        vad = make_vad(hangover_ms=200)
+        vad.process(tone(200))
+        assert vad.triggered
+        decisions = vad.process(silence(200))
+        assert decisions[:-1].all() and not decisions[-1]
+        assert not vad.triggered
+
+    def test_onset_audio_includes_preroll(self):
+        vad = make_vad(attack_ms=40, preroll_ms=100)
+        vad.process(silence(300))
+        vad.process(tone(100))
+        onset = vad.onset_audio()
+        # 100ms of pre-roll before the onset plus the 100ms of tone
+        assert len(onset) == SR * 200 // 1000
+        assert not onset[:5 * FRAME].any()
+
+    def test_onset_audio_includes_incomplete_frame(self):
+        vad = make_vad(preroll_ms=0)
+        vad.process(tone(105))
+        assert len(vad.onset_audio()) == SR * 105 // 1000
+
+    def test_reset_clears_speech_state(self):
+        vad = make_vad()
+        vad.process(tone(100))
+        vad.reset()
+        assert not vad.triggered
+
+    def test_rejects_unsupported_frame_size(self):
+        with pytest.raises(ValueError):
+            make_vad(frame_ms=25)
+
+    def test_onset_offset_without_keeping_audio(self):
+        vad = make_vad(attack_ms=40, preroll_ms=100, keep_audio=False)
+        vad.process(silence(300))
+        vad.process(tone(105))
+        assert vad.onset_offset() == SR * 205 // 1000
+        with pytest.raises(RuntimeError):
+            vad.onset_audio()
+
+
+class TestScorers:
+    def test_energy_is_mean_absolute_amplitude(self):
+        frames = np.array([[0.1, -0.1], [0.0, 0.2]], dtype=np.float32)
+        assert np.allclose(EnergyScorer().score(frames), [0.1, 0.1])
+
+    def test_spectral_flatness_prefers_tones_over_noise(self):
+        rng = np.random.default_rng(0)
+        scorer = SpectralFlatnessScorer()
+        frames = np.stack([tone(20), (0.1 * rng.standard_normal(FRAME)).astype(np.float32)])
+        tonal, noisy = scorer.score(frames)
+        assert tonal > scorer.threshold > noisy
+
+    def test_spectral_flatness_ignores_quiet_frames(self):
+        assert SpectralFlatnessScorer().score(tone(20, amplitude=1e-4)[np.newaxis, :])[0] == 0.0
+
+    def test_create_scorer(self):
+        assert isinstance(create_scorer("energy", 0.02), EnergyScorer)
+        assert create_scorer("energy", 0.02).threshold == 0.02
+        assert isinstance(create_scorer("spectral"), SpectralFlatnessScorer)
+        with pytest.raises(ValueError):
+            create_scorer("onnx")
+        with pytest.raises(ValueError):
+            create_scorer("magic")
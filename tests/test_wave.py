@@ -0,0 +1,42 @@
+from lib.firmware.wave import ALL_BITS, ENABLE_BITS, build_wave
+from lib.motion_plan import Move, plan_moves
+
+FORWARD = 0b1010  # Pins 22 and 24
+LEFT = 0b0110  # Pins 22 and 23
+
+
+class TestBuildWave:
+    def test_full_power_move_is_one_pulse_then_stop(self):
+        assert build_wave(plan_moves([Move("forward", 2000)])) == [
+            (FORWARD | ENABLE_BITS, ALL_BITS, 2_000_000),
+            (0, ALL_BITS, 0),
+        ]
+
+    def test_consecutive_moves_switch_direction_without_stopping(self):
+        assert build_wave(plan_moves([Move("forward", 1000), Move("left", 500)])) == [
+            (FORWARD | ENABLE_BITS, ALL_BITS, 1_000_000),
+            (LEFT | ENABLE_BITS, ALL_BITS, 500_000),
+            (0, ALL_BITS, 0),
+        ]
+
+    def test_partial_duty_is_software_pwm(self):
+        assert build_wave(plan_moves([Move("forward", 20, duty=25)])) == [
+            (FORWARD | ENABLE_BITS, ALL_BITS, 2500),
+            (FORWARD, ALL_BITS, 7500),
+            (FORWARD | ENABLE_BITS, ALL_BITS, 2500),
+            (FORWARD, ALL_BITS, 7500),
+            (0, ALL_BITS, 0),
+        ]
+
+    def test_ramp_accelerates_from_standstill(self):
+        assert build_wave(plan_moves([Move("forward", 40)]), ramp_ms=20) == [
+            (FORWARD, ALL_BITS, 10_000),  # 0% power
+            (FORWARD | ENABLE_BITS, ALL_BITS, 5000),  # 50%
+            (FORWARD, ALL_BITS, 5000),
+            (FORWARD | ENABLE_BITS, ALL_BITS, 20_000),  # Ramp done: full power
+            (0, ALL_BITS, 0),
+        ]
+
+    def test_pulse_delays_add_up_to_plan_duration(self):
+        plan = plan_moves([Move("forward", 730, duty=60), Move("right", 415, duty=60), Move("backward", 1000)])
+        assert sum(delay for _, _, delay in build_wave(plan, ramp_ms=300)) == plan.duration_ms * 1000